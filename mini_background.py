@@ -0,0 +1,120 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_background.py
+# edit : 2026-10-19
+# desc : Background (dark) spectrum kept in memory for the 'b' command and the automatic
+#        background removal of measured spectra. The file is read only when its path,
+#        modification time or size has changed. Subtraction is done by channel index with
+#        map(operator.sub) over the intensities, the rows of the spectrum are changed in place.
+#        If the integration time of the background is known, the background is scaled to the
+#        integration time of the spectrum (dark signal grows linearly with the integration time).
+#        Scaled backgrounds are cached too, a new scaling is made only when the time changes.
+
+import os
+import operator
+import mini_file_operations as fop
+
+class mini_background:
+
+    # edit : 2026-10-19
+    def __init__(self):
+        self.key = None             # (absolute path, mtime ns, size) of the loaded file
+        self.file_name = ''
+        self.data = []              # background rows as read from the file
+        self.values = ()            # intensities of the background
+        self.scaled = {}            # (itime, bg_itime) -> scaled intensities
+        self.load_count = 0
+        self.hit_count = 0
+
+    # edit : 2026-10-19
+    # desc : Background of the file, read again only if the file has changed.
+    #        Returns True if the background is available.
+    def Load(self, file_name):
+        try:
+            stat = os.stat(file_name)
+        except OSError:
+            print(f' ERROR: background file {file_name} not found!')
+            return False
+        key = (os.path.abspath(file_name), stat.st_mtime_ns, stat.st_size)
+        if key == self.key:
+            self.hit_count = self.hit_count + 1
+            return True
+
+        data, unit = fop.read_file(file_name)
+        if data == -1 or len(data) == 0:
+            print(' Error in background data!')
+            self.key = None
+            return False
+        self.key = key
+        self.file_name = file_name
+        self.data = data
+        self.values = tuple(x[1] for x in data)
+        self.scaled = {}
+        self.load_count = self.load_count + 1
+        return True
+
+    # edit : 2026-10-19
+    # desc : Intensities of the background for a spectrum measured with itime (ms), scaled from
+    #        the background integration time bg_itime. No scaling if either is not known (0 or None).
+    #        Integer backgrounds stay integers, so the spectrum stays in bits.
+    def GetValues(self, itime=None, bg_itime=None):
+        if not itime or not bg_itime or itime == bg_itime:
+            return self.values
+        values = self.scaled.get((itime, bg_itime))
+        if values is None:
+            factor = itime / bg_itime
+            if all(isinstance(x, int) for x in self.values):
+                values = tuple(int(x * factor + 0.5) for x in self.values)
+            else:
+                values = tuple(x * factor for x in self.values)
+            self.scaled[(itime, bg_itime)] = values
+        return values
+
+    # edit : 2026-10-19
+    # desc : Subtract the background from the spectrum rows [wavelength, intensity] in place.
+    #        Returns True if subtracted.
+    def Subtract(self, data, itime=None, bg_itime=None):
+        values = self.GetValues(itime, bg_itime)
+        if len(data) != len(values):
+            print(' ERROR : length of the background data is incorrect!')
+            return False
+        for row, value in zip(data, map(operator.sub, map(operator.itemgetter(1), data), values)):
+            row[1] = value
+        return True
+
+    # edit : 2026-10-19
+    def PrintStats(self):
+        if self.key is None:
+            print(' No background loaded.')
+            return
+        print(f' Background {self.file_name}: {len(self.values)} channels, read {self.load_count} times,'
+              f' {self.hit_count} times from memory, {len(self.scaled)} scaled versions')
+
+
+# unit test main
+# edit : 2026-10-19
+#
+if __name__ == '__main__':
+    import sys
+    import time
+    import random
+    import tempfile
+
+    file_name = os.path.join(tempfile.gettempdir(), 'mini_background_test.txt')
+    fop.write_file([[320 + 2 * i, random.randint(20, 40)] for i in range(288)], file_name, 'background')
+    myBackground = mini_background()
+
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')      # read_file prints
+    count = 1000
+    start = time.perf_counter()
+    for n in range(count):
+        data = [[320 + 2 * i, 500] for i in range(288)]
+        myBackground.Load(file_name)
+        myBackground.Subtract(data, 54, 27)
+    elapsed = time.perf_counter() - start
+    sys.stdout.close()
+    sys.stdout = stdout
+    print(f' Load + Subtract {elapsed / count * 1e6:.1f} us per spectrum (including making the test spectrum)')
+    print(f' First channel {data[0][1]} = 500 - 2 * {myBackground.values[0]}')
+    myBackground.PrintStats()
@@ -0,0 +1,404 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_benchmark.py
+# edit : 2026-10-19
+# desc : Benchmarks for the acquisition and processing hot paths of the Mini Spec app.
+#        'python mini_benchmark.py' runs the suite and prints seconds per operation.
+#        --save FILE writes the results as JSON, --compare FILE compares them to saved results
+#        and flags every case that got slower than the tolerance (exit code 1 if any did).
+#        Times are the best of several repeats, that is the least disturbed by other processes.
+#        A folder of saved spectra can be given for read_file, otherwise files are generated
+#        into temp. --formats runs the older comparison of the text and compressed formats.
+#        getSpectrum is run against a simulated port and without its fixed sleeps (0.3 s),
+#        so the time is the parsing of the reply.
+#        --memory adds the memory allocated by one operation, traced with tracemalloc: the
+#        peak of the temporary memory and the memory still kept after the operation.
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import contextlib
+import tracemalloc
+from datetime import datetime
+import mini_file_operations as fop
+
+BASELINE_FILE = 'mini_benchmark_baseline.json'
+TOLERANCE = 0.2             # 20 % slower than the baseline is a regression
+CALIB = {'a0' : 310.6, 'b1' : 2.69, 'b2' : -0.0012, 'b3' : 0.0, 'b4' : 0.0, 'b5' : 0.0}
+
+# edit : 2026-10-19
+# desc : Create a folder of spectrum files in the same format write_file produces.
+#        Every fourth file has float intensities like absorption or calibration files.
+def generate_spectrum_folder(folder, file_count=2000, channel_count=288):
+    fop.create_spectra_folder(folder)
+    for n in range(file_count):
+        wl = [int(310.6 + ch * 2.69 - ch**2 * 0.0012 + 0.5) for ch in range(1, channel_count + 1)]
+        if n % 4 == 3:
+            data = [[w, random.uniform(0.0, 100.0)] for w in wl]
+            unit = '[%]'
+        else:
+            data = [[w, random.randint(0, 1023)] for w in wl]
+            unit = '[bits]'
+        fop.write_file(data, os.path.join(folder, 'bench %05i.txt' %n), 'benchmark', unit)
+    return folder
+
+# edit : 2026-10-19
+# desc : Load every .txt spectrum of the folder the same way the 'l' command does:
+#        read_file_header first, then read_file. Returns (file count, seconds, bytes).
+def bench_read_file(folder):
+    names = [os.path.join(folder, x) for x in sorted(os.listdir(folder)) if x.endswith('.txt')]
+    size = sum(os.path.getsize(x) for x in names)
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')      # read_file prints a line per file
+    try:
+        start = time.perf_counter()
+        for name in names:
+            fop.read_file_header(name)
+            fop.read_file(name)
+        elapsed = time.perf_counter() - start
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    return len(names), elapsed, size
+
+# edit : 2026-10-19
+# desc : Compare the compressed format to the text format. Every spectrum of the folder is
+#        written and read in both formats in a temp folder, and a long Time Domain series
+#        of series_rows rows is written and read once in both formats.
+#        Returns a dict of {case : (bytes, write seconds, read seconds)}.
+def bench_compressed(folder, series_rows=100000):
+    names = [os.path.join(folder, x) for x in sorted(os.listdir(folder)) if x.endswith('.txt')]
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    results = {}
+    try:
+        spectra = [fop.read_file(name) for name in names]
+        with tempfile.TemporaryDirectory() as temp_folder:
+            for extension in ('.txt', fop.COMPRESSED_EXTENSION):
+                out_names = [os.path.join(temp_folder, 'spectrum %05i%s' %(n, extension)) for n in range(len(spectra))]
+                start = time.perf_counter()
+                for (data, unit), out_name in zip(spectra, out_names):
+                    fop.write_file(data, out_name, 'benchmark', '[%s]' %unit, CALIB)
+                write_time = time.perf_counter() - start
+                start = time.perf_counter()
+                for out_name in out_names:
+                    fop.read_file(out_name)
+                read_time = time.perf_counter() - start
+                results['spectra' + extension] = (sum(os.path.getsize(x) for x in out_names), write_time, read_time)
+
+            series = []
+            t = 0.0
+            for n in range(series_rows):
+                t = round(t + random.uniform(0.09, 0.11), 3)
+                series.append([random.randint(400, 1023), random.randint(400, 1023), random.randint(400, 1023), t])
+            for extension in ('.txt', fop.COMPRESSED_EXTENSION):
+                out_name = os.path.join(temp_folder, 'series' + extension)
+                start = time.perf_counter()
+                fop.WriteTimedFile(series, out_name, 'benchmark')
+                write_time = time.perf_counter() - start
+                start = time.perf_counter()
+                fop.read_timed_file(out_name)
+                read_time = time.perf_counter() - start
+                results['series' + extension] = (os.path.getsize(out_name), write_time, read_time)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    return results
+
+# edit : 2026-10-19
+# desc : Serial port of an instrument with firmware 1.0.5.1 or later: the reply to 'A' is the
+#        echo, the channel count and a 'channel intensity' line for each channel.
+class simulated_port:
+
+    def __init__(self, channel_count=288):
+        self.is_open = True
+        self.in_waiting = 0
+        self.reply = [b'A\r\n', b'%04i\r\n' %channel_count] + \
+                     [b'%i %i\r\n' %(ch, random.randint(0, 1023)) for ch in range(1, channel_count + 1)]
+        self.position = len(self.reply)
+
+    def write(self, data):
+        if data == b'A':
+            self.position = 0
+        return len(data)
+
+    def readline(self):
+        if self.position >= len(self.reply):
+            return b''          # timeout
+        self.position = self.position + 1
+        return self.reply[self.position - 1]
+
+    def reset_input_buffer(self):
+        self.position = len(self.reply)
+
+
+# edit : 2026-10-19
+# desc : time module of mini_instrument while benchmarking, sleep returns at once.
+class no_sleep_time:
+
+    def sleep(self, seconds):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+# edit : 2026-10-19
+# desc : Run op(setup()) number times and time only op. Setup makes fresh input for an op
+#        that changes its input. Returns (best, median) of the mean op times of the repeats.
+def time_op(op, setup=None, number=100, repeat=5):
+    means = []
+    for r in range(repeat):
+        total = 0.0
+        for n in range(number):
+            args = setup() if setup else ()
+            start = time.perf_counter()
+            op(*args)
+            total = total + time.perf_counter() - start
+        means.append(total / number)
+    means.sort()
+    return means[0], means[len(means) // 2]
+
+# edit : 2026-10-19
+# desc : Memory allocated by op(setup()), setup is not traced. Returns the means of
+#        (peak bytes over the start of the op, bytes kept after the op).
+def trace_op(op, setup=None, number=10):
+    peak_total = 0
+    kept_total = 0
+    tracemalloc.start()
+    try:
+        for n in range(number):
+            args = setup() if setup else ()
+            tracemalloc.reset_peak()
+            start = tracemalloc.get_traced_memory()[0]
+            op(*args)
+            current, peak = tracemalloc.get_traced_memory()
+            peak_total = peak_total + peak - start
+            kept_total = kept_total + current - start
+    finally:
+        tracemalloc.stop()
+    return peak_total / number, kept_total / number
+
+# edit : 2026-10-19
+# desc : Spectrum of channel numbers and intensities like getSpectrum returns.
+def generate_spectrum(channel_count=288):
+    return [[ch, random.randint(0, 1023)] for ch in range(1, channel_count + 1)]
+
+# edit : 2026-10-19
+# desc : Time Domain rows [ch1, ch2, ch3, time] about 0.1 s apart.
+def generate_series(row_count):
+    series = []
+    t = 0.0
+    for n in range(row_count):
+        t = round(t + random.uniform(0.09, 0.11), 3)
+        series.append([random.randint(400, 1023), random.randint(400, 1023), random.randint(400, 1023), t])
+    return series
+
+# edit : 2026-10-19
+# desc : Cases of the suite as {name : (op, setup, number, repeat, unit)}, files are made in
+#        temp_folder. spectra_folder has the spectrum files for read_file.
+def make_cases(temp_folder, spectra_folder, series_rows=100000):
+    import mini_data
+    import mini_temp
+    import mini_instrument
+
+    random.seed(1)
+    cases = {}
+    channels = generate_spectrum()
+
+    myInstrument = mini_instrument.mini_instrument()
+    myInstrument.myPort = simulated_port()
+    myInstrument.fw_version = '1.0.5.3'
+    def get_spectrum():
+        myInstrument.getSpectrum(myInstrument.spectrum_data)
+    cases['get_spectrum'] = (get_spectrum, None, 50, 5, 'spectrum')
+
+    myData = mini_data.mini_data()
+    myData.CALIB = dict(CALIB)
+    def new_channels():
+        myData.data = [x[:] for x in channels]
+        return ()
+    cases['channel_to_wavelength'] = (myData.channelToWavelength, new_channels, 200, 5, 'spectrum')
+
+    wavelengths = iter(range(10**9))
+    cases['wavelength_to_channel'] = (myData.waveLengthToChannel,
+                                      lambda: (320 + next(wavelengths) % 560,), 50, 5, 'wavelength')
+
+    names = [os.path.join(spectra_folder, x) for x in sorted(os.listdir(spectra_folder)) if x.endswith('.txt')]
+    files = iter(range(10**9))
+    def read_file(name):
+        fop.read_file_header(name)
+        fop.read_file(name)
+    cases['read_file'] = (read_file, lambda: (names[next(files) % len(names)],), min(len(names), 200), 3, 'file')
+
+    series_name = os.path.join(temp_folder, 'series.txt')
+    series = generate_series(series_rows)
+    fop.WriteTimedFile(series, series_name, 'benchmark')
+    cases['read_timed_file'] = (fop.read_timed_file, lambda: (series_name,), 1, 3, f'{series_rows} rows')
+
+    new_channels()
+    myData.channelToWavelength()
+    spectrum = myData.data
+    reference_name = os.path.join(temp_folder, 'reference.txt')
+    fop.write_file([[w, min(int(x * 1.2) + 100, 1023)] for w, x in spectrum], reference_name, 'reference', '[bits]', CALIB)
+    def new_spectrum():
+        myData.data = [x[:] for x in spectrum]
+        return (reference_name,)
+    cases['get_rel_abs_from_file'] = (myData.get_rel_abs_from_file, new_spectrum, 100, 5, 'spectrum')
+
+    cases['lowpass_filter'] = (mini_temp.lowpass_filter, lambda: ([x[:] for x in spectrum],), 200, 5, 'spectrum')
+
+    averageData = mini_data.mini_data()
+    averageData.data = [x[:] for x in spectrum]
+    def add_to_average():
+        averageData.ave_size = 0
+        for n in range(10):
+            averageData.addSpectrumToAverage()
+    cases['add_to_average'] = (add_to_average, None, 100, 5, '10 spectra')
+
+    cases['settings_read'] = (fop.read_settings_file, lambda: ('device', 'hw_channel_count'), 200, 5, 'read')
+
+    try:
+        import mini_renderer
+        import mini_timed_multi_data
+        mini_renderer.get_renderer().UseAgg(True)
+        myTimedData = mini_timed_multi_data.mini_timed_multi_data(3)
+        myTimedData.ImportLoadData(series)
+        def add_rows():
+            t = myTimedData.GetLatestTimestamp()
+            for n in range(10):
+                t = t + 0.1
+                for ch_i in range(3):
+                    myTimedData.AddDataPoint(ch_i, random.randint(400, 1023), t + myTimedData.startTime)
+            return ()
+        def draw_timed_graph():
+            myTimedData.DrawTimedGraph(True)
+            myTimedData.live_view.figure.canvas.draw()      # agg renderer does not draw by itself
+        cases['draw_timed_graph'] = (draw_timed_graph, add_rows, 10, 3, f'redraw of {series_rows} rows')
+    except ImportError as e:
+        print(f' draw_timed_graph skipped, {e}')
+    return cases
+
+# edit : 2026-10-19
+# desc : Run the cases and return the results in the form of the JSON file. Only names are
+#        run if given. Prints of the app are hidden. memory traces the allocations of the ops.
+def run_suite(spectra_folder=None, names=None, series_rows=100000, memory=False):
+    results = {}
+    time_module = None
+    with tempfile.TemporaryDirectory() as temp_folder:
+        if spectra_folder is None:
+            spectra_folder = generate_spectrum_folder(os.path.join(temp_folder, 'spectra'), 200)
+        with contextlib.redirect_stdout(io.StringIO()):
+            cases = make_cases(temp_folder, spectra_folder, series_rows)
+        import mini_instrument
+        time_module = mini_instrument.time
+        mini_instrument.time = no_sleep_time()
+        try:
+            for name, (op, setup, number, repeat, unit) in cases.items():
+                if names and name not in names:
+                    continue
+                with contextlib.redirect_stdout(io.StringIO()):
+                    best, median = time_op(op, setup, number, repeat)
+                results[name] = {'seconds' : best, 'median' : median, 'unit' : unit, 'number' : number, 'repeat' : repeat}
+                memory_text = ''
+                if memory:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        peak, kept = trace_op(op, setup, min(number, 10))
+                    results[name]['peak_bytes'] = peak
+                    results[name]['kept_bytes'] = kept
+                    memory_text = f', peak {peak / 1e3:.1f} kB, kept {kept / 1e3:.1f} kB'
+                print(f' {name:24}{best * 1e6:12.1f} us / {unit}   (median {median * 1e6:.1f} us{memory_text})')
+        finally:
+            mini_instrument.time = time_module
+    return {'date' : datetime.now().isoformat(timespec='seconds'),
+            'python' : platform.python_version(),
+            'platform' : platform.platform(),
+            'results' : results}
+
+# edit : 2026-10-19
+# desc : Compare results to a baseline. Returns the names of the cases that are slower than
+#        baseline * (1 + tolerance). Cases missing from either are not flagged.
+def compare_results(baseline, results, tolerance=TOLERANCE):
+    regressions = []
+    print(f' Compared to the baseline of {baseline.get("date", "?")} (Python {baseline.get("python", "?")}),'
+          f' tolerance {tolerance * 100:.0f} %')
+    print(f' {"case":24}{"baseline us":>14}{"now us":>12}{"change":>9}{"peak kB":>18}')
+    for name in results['results']:
+        if name not in baseline['results']:
+            print(f' {name:24}  not in the baseline')
+            continue
+        base = baseline['results'][name]['seconds']
+        now = results['results'][name]['seconds']
+        change = now / base - 1.0 if base > 0 else 0.0
+        flag = ''
+        if change > tolerance:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif change < -tolerance:
+            flag = '  faster'
+        memory_text = ''
+        if 'peak_bytes' in baseline['results'][name] and 'peak_bytes' in results['results'][name]:
+            memory_text = f'{baseline["results"][name]["peak_bytes"] / 1e3:9.1f} ->{results["results"][name]["peak_bytes"] / 1e3:7.1f}'
+        print(f' {name:24}{base * 1e6:14.1f}{now * 1e6:12.1f}{change * 100:+8.0f}%{memory_text:>18}{flag}')
+    not_run = [x for x in baseline['results'] if x not in results['results']]
+    if not_run:
+        print(f' Not run: {", ".join(not_run)}')
+    if regressions:
+        print(f' {len(regressions)} regressions: {", ".join(regressions)}')
+    return regressions
+
+
+# unit test main
+# edit : 2026-10-19
+#
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Benchmarks of the Mini Spec app hot paths')
+    parser.add_argument('folder', nargs='?', help='folder of spectrum files for read_file')
+    parser.add_argument('--save', nargs='?', const=BASELINE_FILE, help=f'write the results as JSON (default {BASELINE_FILE})')
+    parser.add_argument('--compare', nargs='?', const=BASELINE_FILE, help=f'compare to saved results (default {BASELINE_FILE})')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help='slowdown flagged as a regression, 0.2 = 20 %%')
+    parser.add_argument('--cases', help='comma separated names of the cases to run')
+    parser.add_argument('--rows', type=int, default=100000, help='rows of the Time Domain series')
+    parser.add_argument('--memory', action='store_true', help='trace the memory allocated by each case')
+    parser.add_argument('--formats', action='store_true', help='compare the text and compressed file formats')
+    args = parser.parse_args()
+
+    # the app and its settings file are used from the folder of the app
+    save_name = os.path.abspath(args.save) if args.save else None
+    compare_name = os.path.abspath(args.compare) if args.compare else None
+    bench_folder = os.path.abspath(args.folder) if args.folder else None
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    if args.formats:
+        if bench_folder is None:
+            bench_folder = generate_spectrum_folder(os.path.join(tempfile.gettempdir(), 'mini_bench_spectra'))
+        count, seconds, size = bench_read_file(bench_folder)
+        print(f' read_file : {count} files, {size / 1e6:.1f} MB in {seconds:.3f} s'
+              f' --> {count / seconds:.0f} files/s, {size / 1e6 / seconds:.1f} MB/s')
+        for case, (size, write_time, read_time) in bench_compressed(bench_folder, args.rows).items():
+            print(f' {case:12}: {size / 1e6:7.2f} MB, write {write_time:.3f} s, read {read_time:.3f} s')
+        sys.exit(0)
+
+    results = run_suite(bench_folder, args.cases.split(',') if args.cases else None, args.rows, args.memory)
+
+    if save_name:
+        with open(save_name, 'w') as f:
+            json.dump(results, f, indent=1)
+        print(f' Results saved in {save_name}')
+
+    if compare_name:
+        try:
+            with open(compare_name) as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f' ERROR in reading the baseline {compare_name}: {e}')
+            sys.exit(2)
+        if compare_results(baseline, results, args.tolerance):
+            sys.exit(1)
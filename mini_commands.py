@@ -0,0 +1,214 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_commands.py
+# edit : 2026-10-19
+# desc : Command table of the application. Each command has a handler and a schema of its
+#        keyword arguments {name: type}. Arguments are checked and converted before the
+#        handler is called, so terminal arguments (strings) and GUI arguments (ints, floats)
+#        reach the handler as the same types. Commands are found with one dict lookup.
+#        Sync handlers run on the calling thread and return their value. Async handlers
+#        (also 'async def' coroutines) run on a worker thread, the call returns None at once.
+#        Call count, errors and latency of every command are collected for 'stats'.
+
+import time
+import inspect
+import threading
+
+class mini_commands:
+
+    # edit : 2026-10-19
+    def __init__(self):
+        self.table = {}             # name -> (handler, args, required, is_async)
+        self.running = set()        # async commands running now
+        self.lock = threading.Lock()
+        self.ResetStats()
+
+    # edit : 2026-10-19
+    def ResetStats(self):
+        with self.lock:
+            self.stats = {}         # name -> [calls, errors, total sec, max sec, latest sec]
+
+    # edit : 2026-10-19
+    # desc : args is {argument name: type}, type converts a value (int, float, str).
+    #        Arguments in required must be given. is_async runs the handler on a worker thread.
+    def Register(self, name, handler, args=None, required=(), is_async=False):
+        if name in self.table:
+            print(f' WARNING: command {name} registered again!')
+        args = dict(args) if args else {}
+        for key in required:
+            if key not in args:
+                args[key] = str
+        self.table[name] = (handler, args, tuple(required), is_async or inspect.iscoroutinefunction(handler))
+
+    # edit : 2026-10-19
+    def Exists(self, name):
+        return name in self.table
+
+    # edit : 2026-10-19
+    # desc : Returns the converted arguments, None if they are not valid.
+    def CheckArgs(self, name, args, required, kwargs):
+        checked = {}
+        for key, value in kwargs.items():
+            if key not in args:
+                accepted = ' '.join(f'{x}=' for x in args) if args else 'no arguments'
+                print(f' ERROR: unknown argument {key} for command {name}, accepted: {accepted}')
+                return None
+            try:
+                checked[key] = args[key](value)
+            except (TypeError, ValueError):
+                print(f' ERROR: incorrect value {value} of {key} for command {name}, {args[key].__name__} expected!')
+                return None
+        for key in required:
+            if key not in checked:
+                print(f' ERROR: missing argument {key}= for command {name}!')
+                return None
+        return checked
+
+    # edit : 2026-10-19
+    def IsAsync(self, name):
+        return name in self.table and self.table[name][3]
+
+    # edit : 2026-10-19
+    # desc : Run a command. Returns the value of a sync handler, None for an unknown command,
+    #        invalid arguments or an async handler. name is positional only, so a command
+    #        can have an argument called name.
+    def Call(self, name, /, **kwargs):
+        return self.Run(name, kwargs, False)
+
+    # edit : 2026-10-19
+    # desc : Run a command and wait until it is finished, also an async one. An async handler
+    #        runs on the calling thread and its value is returned. For scripts and server clients
+    #        that need the result before the next command.
+    def CallWait(self, name, /, **kwargs):
+        return self.Run(name, kwargs, True)
+
+    # edit : 2026-10-19
+    def Run(self, name, kwargs, wait):
+        try:
+            handler, args, required, is_async = self.table[name]
+        except KeyError:
+            print('Unknown command!')
+            return None
+
+        kwargs = self.CheckArgs(name, args, required, kwargs)
+        if kwargs is None:
+            self.Record(name, 0.0, True)
+            return None
+
+        if is_async and wait:
+            with self.lock:
+                if name in self.running:
+                    print(f' ERROR: {name} is still running!')
+                    return None
+                self.running.add(name)
+            start = time.perf_counter()
+            error = True
+            try:
+                if inspect.iscoroutinefunction(handler):
+                    import asyncio
+                    ret_val = asyncio.run(handler(**kwargs))
+                else:
+                    ret_val = handler(**kwargs)
+                error = False
+                return ret_val
+            finally:
+                self.Record(name, time.perf_counter() - start, error)
+                with self.lock:
+                    self.running.discard(name)
+
+        if is_async:
+            with self.lock:
+                if name in self.running:
+                    print(f' ERROR: {name} is still running!')
+                    return None
+                self.running.add(name)
+            threading.Thread(target=self.RunAsync, args=(name, handler, kwargs), daemon=True).start()
+            return None
+
+        start = time.perf_counter()
+        error = True
+        try:
+            ret_val = handler(**kwargs)
+            error = False
+            return ret_val
+        finally:
+            self.Record(name, time.perf_counter() - start, error)
+
+    # edit : 2026-10-19
+    # desc : Worker thread of an async command.
+    def RunAsync(self, name, handler, kwargs):
+        start = time.perf_counter()
+        error = False
+        try:
+            if inspect.iscoroutinefunction(handler):
+                import asyncio      # slow to import, only coroutine commands need it
+                asyncio.run(handler(**kwargs))
+            else:
+                handler(**kwargs)
+        except Exception as e:
+            error = True
+            print(f' ERROR in command {name}: {e}')
+        finally:
+            self.Record(name, time.perf_counter() - start, error)
+            with self.lock:
+                self.running.discard(name)
+
+    # edit : 2026-10-19
+    def Record(self, name, seconds, error=False):
+        with self.lock:
+            entry = self.stats.get(name)
+            if entry is None:
+                entry = self.stats[name] = [0, 0, 0.0, 0.0, 0.0]
+            entry[0] = entry[0] + 1
+            if error:
+                entry[1] = entry[1] + 1
+            entry[2] = entry[2] + seconds
+            entry[3] = max(entry[3], seconds)
+            entry[4] = seconds
+
+    # edit : 2026-10-19
+    # desc : Returns {name: (calls, errors, mean, max, latest)}, times in seconds.
+    def GetStats(self):
+        with self.lock:
+            return {name: (calls, errors, total / calls, longest, latest)
+                    for name, (calls, errors, total, longest, latest) in self.stats.items()}
+
+    # edit : 2026-10-19
+    # desc : Commands in the order of total time used.
+    def PrintStats(self):
+        stats = self.GetStats()
+        if not stats:
+            print(' No commands called yet.')
+            return
+        print(f' {"command":<26}{"calls":>8}{"errors":>8}{"mean ms":>10}{"max ms":>10}{"total ms":>11}')
+        for name, (calls, errors, mean, longest, latest) in sorted(stats.items(), key=lambda x: -x[1][0] * x[1][2]):
+            async_mark = '*' if self.table.get(name, (0, 0, 0, False))[3] else ''
+            print(f' {name + async_mark:<26}{calls:>8}{errors:>8}{mean * 1000:>10.2f}{longest * 1000:>10.2f}{calls * mean * 1000:>11.1f}')
+        if any(self.table[name][3] for name in stats if name in self.table):
+            print(' * run on a worker thread, time is until the command is finished')
+
+
+# unit test main
+# edit : 2026-10-19
+#
+if __name__ == '__main__':
+    import asyncio
+
+    def add(a, b=1):
+        return a + b
+
+    async def wait(seconds):
+        await asyncio.sleep(seconds)
+
+    myCommands = mini_commands()
+    myCommands.Register('add', add, {'a': int, 'b': int}, required=('a',))
+    myCommands.Register('wait', wait, {'seconds': float}, required=('seconds',))
+    print(myCommands.Call('add', a='2', b=3))
+    myCommands.Call('add', b='x')
+    myCommands.Call('add', c=1)
+    myCommands.Call('wait', seconds='0.2')
+    for i in range(10000):
+        myCommands.Call('add', a=i)
+    time.sleep(0.3)
+    myCommands.CallWait('wait', seconds='0.1')
+    myCommands.PrintStats()
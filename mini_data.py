@@ -6,12 +6,12 @@
 #		 
 # TODO : * Complete drawPointValue method 
 
-import matplotlib.pyplot as plt
 #import mini_settings
 import mini_file_operations as fop
-import copy
 import mini_temp
 import mini_defaults
+from mini_renderer import get_renderer
+from mini_background import mini_background
 
 class mini_data:
         
@@ -19,6 +19,7 @@ class mini_data:
     def __init__ (self):
         self.data = []              # Warning! data array can contain modified data, ch numbers or wavelengths.
         self.background = []        # Refrence background signal that can be subtracted from measurement. 
+        self.background_cache = mini_background()   # background file kept in memory for removeBackground
         self.average = []
         self.ave_size = 0		    # this many spectras have been accumulated into average
         self.int_calib = []
@@ -28,6 +29,7 @@ class mini_data:
         self.data_file_name = ""    # measured spectrum file to include in plots
         self.rel_abs_file_name = "" # calculated absorption file to include in plots
         self.added_to_average = False   # result already added to average spectrum
+        self.live_view = None       # mini_live_spectrum when the live mode is on
         self.CALIB = {              # wavelength calibration coefficients
             "a0" : None,
             "b1" : None,
@@ -184,6 +186,30 @@ class mini_data:
             print(" Wrong data type found during dc-level estimate!")
             return 0 								
 
+    # method : get_corrected_intensities
+    # edit : 2026-10-19
+    # desc : Intensities of any spectrum with the DC level removed and low-pass filtered, like
+    #        remove_any_dc and lowpass_filter do in place. Returns a new list, the spectrum is not changed.
+    #        Returns None if the spectrum is not valid (-1 of a failed file read).
+    def get_corrected_intensities(self, any_spectrum, filtered=True):
+        try:
+            values = [x[1] for x in any_spectrum]
+        except TypeError:
+            print(" Wrong data type in spectrum, no intensities!")
+            return None
+        dc = self.estimate_any_dc(any_spectrum)
+        if(dc > 0):
+            try:
+                values = [x - dc for x in values]
+                print(f' {dc} bit DC level removed.')
+            except TypeError:
+                print(" No valid data to be used in DC remove!")
+        else:
+            print(" Incorrect DC value. Can not be removed from the signal.")
+        if filtered:
+            return mini_temp.lowpass_values(values)
+        return values
+
 	# method : loadBackground
 	# ver : 26.5.2022
 	# desc : Load background data from the background file, -1 if error.
@@ -206,50 +232,65 @@ class mini_data:
         self.zero_reference, unit = fop.read_file(file_name)
 	
 	# method : removeBackground
-	# ver : 19.8.2022
+	# edit : 2026-10-19
 	# desc : Remove background from a measured spectrum. Subtract by channel index, not by wavelength data.
-	#
-    def removeBackground(self, file_name):
-        self.loadBackground(file_name)
-        if(self.background == -1):
+	#        Background file is read again only when it has changed (mini_background).
+	#        Background measured with bg_itime is scaled to itime (ms) when both are given.
+	#        Returns 1 if removed, None if not.
+    def removeBackground(self, file_name, itime=None, bg_itime=None):
+        if not self.background_cache.Load(file_name):
             print(" Error in background data! Background was not removed.")
             return None
+        self.background = self.background_cache.data
 
-        lenSpectrum = len(self.data)
-        lenBackground  = len(self.background)
-        if (lenSpectrum == lenBackground):
-            for i in range(0, lenSpectrum):
-                data_point = self.data[i]
-                bck_point = self.background[i]
-                self.data[i] = [data_point[0], data_point[1] - bck_point[1]]
+        if self.background_cache.Subtract(self.data, itime, bg_itime):
             print(" Background removed.")
-        else:
-            print(" ERROR : length of the background data is incorrect!")
+            return 1
+        return None
 
 	# method : drawBarSpectrum
 	# ver : 2.2.2019
 	# desc : Simple bar graph
 	#
     def drawBarSpectrum(self):
+        if not get_renderer().drawing:
+            return
         int_data = [x[1] for x in self.data]
         ch_data = [x[0] for x in self.data]
-        #plt.plot(ch_data, int_data)
-        plt.bar(ch_data, int_data, width=2.67)
-        plt.show()
+        figure, ax = self.GetGraph("ABSOLUTE GRAPH")
+        ax.bar(ch_data, int_data, width=2.67)
+        self.ShowGraph(figure)
+
+    # edit : 2026-10-19
+    # desc : Figure and axes of a graph, created by the renderer if the graph is not open.
+    def GetGraph(self, name):
+        figure = get_renderer().Figure(name)
+        return figure, figure.gca()
+
+    # edit : 2026-10-19
+    # desc : Show a graph and ask the renderer to redraw it.
+    def ShowGraph(self, figure):
+        renderer = get_renderer()
+        renderer.Show(figure)
+        renderer.Draw(figure)
 
 	# method : drawLineSpectrum
 	# ver : 2026-05-12
 	# desc : Simple line spectrum
 	#        Draw absolute spectrums into figure "ABSOLUTE GRAPH"
     #        This name identifies the graph instead of ID number.   
+    #        In the live mode the line is only updated, see SetLiveMode.
     def drawLineSpectrum(self):
-        plt.figure("ABSOLUTE GRAPH")
+        if not get_renderer().drawing:
+            return
+        if self.live_view is not None:
+            self.live_view.AddSpectrum(self.data, self.cut_long_filename(self.data_file_name))
+            return
+        figure, ax = self.GetGraph("ABSOLUTE GRAPH")
         int_data = [x[1] for x in self.data]
         ch_data = [x[0] for x in self.data]
-        plt.ion()   # interactive mode on
-        plt.plot(ch_data, int_data)
+        ax.plot(ch_data, int_data)
 
-        ax = plt.gca() # get axis object
         ymin, ymax = ax.get_ylim()
         xmin, xmax = ax.get_xlim()
 
@@ -265,11 +306,11 @@ class mini_data:
         except ValueError:
             print(" Error: Scaling of the plot failed!")
 
-        plt.suptitle("" + self.cut_long_filename(self.data_file_name))
-        plt.xlabel("wavelength [nm]")
-        plt.ylabel("intensity [bit]")
-        plt.grid(True)
-        plt.show()
+        figure.suptitle("" + self.cut_long_filename(self.data_file_name))
+        ax.set_xlabel("wavelength [nm]")
+        ax.set_ylabel("intensity [bit]")
+        ax.grid(True)
+        self.ShowGraph(figure)
 
     # edit : 2025-2-15
     # desc : Returns true if the plot is currently zoomed.
@@ -279,14 +320,37 @@ class mini_data:
             print(' Zoomed Y')
 
 
+    # edit : 2026-10-19
+    # desc : Live mode of the ABSOLUTE GRAPH for fast repeated measurements. Spectrum line is
+    #        created once and only its data is replaced, history_count previous spectra are
+    #        shown as fading lines. Zoom of the user is kept. Graph is redrawn at most
+    #        max_fps times per second. Old lines of the graph are cleared when the mode is changed.
+    def SetLiveMode(self, on, history_count=0, max_fps=20):
+        if on:
+            if self.live_view is None:
+                from mini_live_spectrum import mini_live_spectrum     # numpy, loaded only when needed
+                get_renderer().Close('ABSOLUTE GRAPH')
+                self.live_view = mini_live_spectrum('ABSOLUTE GRAPH', history_count, max_fps)
+            else:
+                self.live_view.min_interval = 1.0 / max_fps
+                self.live_view.SetHistory(history_count)
+        elif self.live_view is not None:
+            self.live_view.Close()
+            self.live_view = None
+
     # method : ClearLineSpectrum
-    # edit : 2023-12-15
+    # edit : 2026-10-19
     def ClearLineSpectrum(self):
-        if plt.fignum_exists('ABSOLUTE GRAPH'):
-            plt.clf() 
-            plt.xlabel("wavelength [nm]")
-            plt.ylabel("intensity [bit]")
-            plt.grid(True)
+        if self.live_view is not None:
+            self.live_view.ClearHistory()
+        elif get_renderer().Exists('ABSOLUTE GRAPH'):
+            figure, ax = self.GetGraph("ABSOLUTE GRAPH")
+            figure.clear()
+            ax = figure.gca()
+            ax.set_xlabel("wavelength [nm]")
+            ax.set_ylabel("intensity [bit]")
+            ax.grid(True)
+            get_renderer().Draw(figure)
             #plt.close('ABSOLUTE GRAPH')
             #print(' Absolute graph closed!')
         else:
@@ -296,15 +360,15 @@ class mini_data:
     # ver 2.6.2022
     # desc : Add a single point value to graph
     def drawPointValue(self, point_wl, point_int):
-        plt.figure("ABSOLUTE GRAPH")
-        plt.ion()
-        plt.plot(point_wl, point_int)
-        plt.ylim(0, 4100)
-        plt.xlabel("wavelength [nm]")
-        plt.ylabel("intensity [bit]")
-        plt.grid(True)
-        #plt.draw()
-        plt.show()             
+        if not get_renderer().drawing:
+            return
+        figure, ax = self.GetGraph("ABSOLUTE GRAPH")
+        ax.plot(point_wl, point_int)
+        ax.set_ylim(0, 4100)
+        ax.set_xlabel("wavelength [nm]")
+        ax.set_ylabel("intensity [bit]")
+        ax.grid(True)
+        self.ShowGraph(figure)
 
 	# method : addToAverage
 	# ver : 2023-12-15
@@ -318,7 +382,7 @@ class mini_data:
             self.ave_size = self.ave_size + 1
         
             if self.ave_size == 1:
-                self.average = copy.deepcopy(self.data)
+                self.average = [x[:] for x in self.data]    # rows hold numbers only, row copies are enough
 
             elif self.ave_size > 1:
                 for i in range(0, len(self.data)):
@@ -330,25 +394,25 @@ class mini_data:
 	# desc : Draw average spectrum.
 	#        Draw absolute spectrums into figure "ABSOLUTE GRAPH"
     def drawLineAverage(self):
-        plt.figure("ABSOLUTE GRAPH")
+        if not get_renderer().drawing:
+            return
+        figure, ax = self.GetGraph("ABSOLUTE GRAPH")
         int_ave = [x[1] for x in self.average]
         ch_ave = [x[0] for x in self.average]
-        plt.ion()
-        plt.plot(ch_ave, int_ave)
+        ax.plot(ch_ave, int_ave)
 
-        xmin, xmax, ymin, ymax = plt.axis() # get current axis values
+        xmin, xmax, ymin, ymax = ax.axis() # get current axis values
         try:
             if(ymax < max(int_ave)*1.1):    
-                plt.ylim(0, max(int_ave)*1.1)
+                ax.set_ylim(0, max(int_ave)*1.1)
         except ValueError:
             print(' Error: No average to draw!')
-            plt.ylim(0, 1000)
+            ax.set_ylim(0, 1000)
 
-        plt.xlabel("wavelength [nm]")
-        plt.ylabel("intensity [bit]")
-        plt.grid(True)
-        #plt.draw()
-        plt.show()
+        ax.set_xlabel("wavelength [nm]")
+        ax.set_ylabel("intensity [bit]")
+        ax.grid(True)
+        self.ShowGraph(figure)
 
     # method : get_ch_intensity
     # ver : 10.5.2022
@@ -426,7 +490,7 @@ class mini_data:
             self.absorption.append([self.data[i][0], self.zero_reference[i][1] - self.data[i][1]])
 
     # method : get_rel_abs
-    # edit : 2023-9-22
+    # edit : 2026-10-19
     # desc : Calculates relative absorption spectrum using zero_reference file (mini_settings).
     #        Automatic DC-removal and filtration.
     # todo : Combine with method get_rel_abs_from_file.
@@ -434,20 +498,15 @@ class mini_data:
 
         MIN_LEVEL = 20 # limits calculation to meaningfull areas to avoid abs noise peaks
         
-        # copies of reference & data to work with 
         self.loadZeroReference(mini_settings.my_spectra_folder + mini_settings.zero_reference_file)
-        data_local_copy = copy.deepcopy(self.data)
 
         if(self.zero_reference == -1):
             print(" Error: No default reference file found!")
             return -1
         
-        self.remove_any_dc(self.zero_reference, self.estimate_any_dc(self.zero_reference))
-        self.remove_any_dc(data_local_copy, self.estimate_any_dc(data_local_copy))
-
-        #filter, no effect to original spectrum
-        f_reference = mini_temp.lowpass_filter(self.zero_reference)
-        f_data = mini_temp.lowpass_filter(data_local_copy)
+        # dc removed & filtered intensities, no effect to reference or original spectrum
+        f_reference = self.get_corrected_intensities(self.zero_reference)
+        f_data = self.get_corrected_intensities(self.data)
 
         if False:
             print("i=10...13")
@@ -461,8 +520,8 @@ class mini_data:
             self.rel_absorption = []    # delete previous content
 
             for i in range(len(f_data)):
-                ref_int = f_reference[i][1]
-                data_int = f_data[i][1]
+                ref_int = f_reference[i]
+                data_int = f_data[i]
                                                
                 if ref_int < MIN_LEVEL: 
                     ref_int = MIN_LEVEL
@@ -477,18 +536,18 @@ class mini_data:
                 
                 temp = temp / ref_int * 100
               
-                self.rel_absorption.append([f_data[i][0], temp])
+                self.rel_absorption.append([self.data[i][0], temp])
         except Exception as x:
             print(x)
         
         return 1
 
     # method : get_rel_abs_from_file
-    # edit : 2026-05-13
+    # edit : 2026-10-19
     # desc : Calculates relative absorption spectrum using given reference file.
     #        Automatic DC-removal and filtration. Return 0 if no data, return 1 if successful
-    # todo : Verify that this method does not alter the original spectrum data.
-    #        Combine with get_rel_abs method.
+    #        Original spectrum data is not altered.
+    # todo : Combine with get_rel_abs method.
     def get_rel_abs_from_file(self, zero_ref_file):
     
         if len(self.data) < 1:
@@ -498,20 +557,16 @@ class mini_data:
         MIN_LEVEL = 100 # limits calculation to meaningfull areas to avoid abs noise peaks
         print(f' Absorption Signal Threshold: {MIN_LEVEL} bits')
         
-        # copies of reference & data to work with 
         self.loadZeroReference(zero_ref_file)       # load reference data to self.zero_reference
-        data_local_copy = copy.deepcopy(self.data)
 
-        self.remove_any_dc(self.zero_reference, self.estimate_any_dc(self.zero_reference))
-        self.remove_any_dc(data_local_copy, self.estimate_any_dc(data_local_copy))
-                
-        #filter or not?, no effect to original spectrum
-        if True:
-            f_reference = mini_temp.lowpass_filter(self.zero_reference)
-            f_data = mini_temp.lowpass_filter(data_local_copy)
-        else:
-            f_reference = self.zero_reference
-            f_data = data_local_copy
+        if(self.zero_reference == -1):
+            print(f" Error: reference file {zero_ref_file} not found!")
+            return 0 #error
+
+        # dc removed intensities, filter or not?, no effect to reference or original spectrum
+        FILTERED = True
+        f_reference = self.get_corrected_intensities(self.zero_reference, FILTERED)
+        f_data = self.get_corrected_intensities(self.data, FILTERED)
 
         if False:
             print("i=10...13")
@@ -526,8 +581,8 @@ class mini_data:
             self.rel_abs_file_name = ''
 
             for i in range(len(f_data)):
-                ref_int = f_reference[i][1]
-                data_int = f_data[i][1]
+                ref_int = f_reference[i]
+                data_int = f_data[i]
                                                
                 if ref_int < MIN_LEVEL: 
                     ref_int = MIN_LEVEL
@@ -542,7 +597,7 @@ class mini_data:
                 
                 temp = temp / ref_int * 100
               
-                self.rel_absorption.append([f_data[i][0], temp])
+                self.rel_absorption.append([self.data[i][0], temp])
         except Exception as x:
             print(x)  
         return 1 # OK
@@ -552,71 +607,71 @@ class mini_data:
 	# desc : Draw absorption spectrum.
 	#
     def drawLineAbsorption(self):
-        plt.figure("ABSOLUTE GRAPH")
+        if not get_renderer().drawing:
+            return
+        figure, ax = self.GetGraph("ABSOLUTE GRAPH")
         int_abs = [x[1] for x in self.absorption]
         ch_abs = [x[0] for x in self.absorption]
-        plt.clf()
-        plt.ion()
-        plt.plot(ch_abs, int_abs)
+        figure.clear()
+        ax = figure.gca()
+        ax.plot(ch_abs, int_abs)
 
-        xmin, xmax, ymin, ymax = plt.axis() # get current axis values
+        xmin, xmax, ymin, ymax = ax.axis() # get current axis values
         if(ymax < max(int_abs)*1.1):    
-            plt.ylim(0, max(int_abs)*1.1)
-
-        #plt.ylim(0, max(int_abs)*1.1)
-        plt.grid(True)
-        plt.xlabel("wavelength [nm]")
-        plt.ylabel("intensity [bit]")
-        #plt.draw()
-        plt.show()    
+            ax.set_ylim(0, max(int_abs)*1.1)
+
+        ax.grid(True)
+        ax.set_xlabel("wavelength [nm]")
+        ax.set_ylabel("intensity [bit]")
+        self.ShowGraph(figure)
         
     # method : draw_rel_absorption
     # edit : 2026-05-12
     # desc : draw relative values with %-unit into "RELATIVE GRAPH"
     def draw_rel_absorption(self, any_spectrum):
-        plt.figure("RELATIVE GRAPH")
+        if not get_renderer().drawing:
+            return
+        figure, ax = self.GetGraph("RELATIVE GRAPH")
         int_abs = [x[1] for x in any_spectrum]
         ch_abs = [x[0] for x in any_spectrum]
-        plt.ion()
-        plt.plot(ch_abs, int_abs)
+        ax.plot(ch_abs, int_abs)
         try:
-            xmin, xmax, ymin, ymax = plt.axis() # get current axis values
+            xmin, xmax, ymin, ymax = ax.axis() # get current axis values
             if(ymax < max(int_abs)*1.1):    
-                plt.ylim(0, max(int_abs)*1.1)
-            #plt.ylim(0, max(int_abs)*1.1)
+                ax.set_ylim(0, max(int_abs)*1.1)
         except ValueError:
             print(" Wrong data type in draw!")
-            plt.ylim(0, 100)
-        plt.grid(True)
-        plt.suptitle("" + self.cut_long_filename(self.rel_abs_file_name))
-        plt.xlabel("wavelength [nm]")
-        plt.ylabel("relative absorption [%]")
-        plt.show()
+            ax.set_ylim(0, 100)
+        ax.grid(True)
+        figure.suptitle("" + self.cut_long_filename(self.rel_abs_file_name))
+        ax.set_xlabel("wavelength [nm]")
+        ax.set_ylabel("relative absorption [%]")
+        self.ShowGraph(figure)
 
     # Check if graph is open in case changes (like file name)
     # edit : 2026-05-13
     def is_rel_abs_graph_open(self):
-        return plt.fignum_exists("RELATIVE GRAPH")
+        return get_renderer().Exists("RELATIVE GRAPH")
 
     # method : init_rel_graph
     # edit : 2023-8-27
     # desc : Init empty relative graph. Selected x-axis stays unchanged. Y-axis may be enlarged
     #        if high datavalues are drawn. 
     def init_rel_graph(self):
-        plt.figure("RELATIVE GRAPH")
-        plt.xlim(285, 910)
-        plt.ylim(0, 50)
-        plt.xlabel("wavelength [nm]")
-        plt.ylabel("relative absorption [%]")
-        plt.grid(True)
-        plt.show()
+        figure, ax = self.GetGraph("RELATIVE GRAPH")
+        ax.set_xlim(285, 910)
+        ax.set_ylim(0, 50)
+        ax.set_xlabel("wavelength [nm]")
+        ax.set_ylabel("relative absorption [%]")
+        ax.grid(True)
+        self.ShowGraph(figure)
 
     # method : ClearRelAbsSpectrum
     # edit : 2026-05-14
     # desc : Clears the abs spectrum and erases the abs data from memory
     def ClearRelAbsSpectrum(self):
-        if plt.fignum_exists('RELATIVE GRAPH'):
-            plt.close('RELATIVE GRAPH')
+        if get_renderer().Exists('RELATIVE GRAPH'):
+            get_renderer().Close('RELATIVE GRAPH')
             self.rel_absorption = []
             print('Done!')
         else:
@@ -641,14 +696,14 @@ class mini_data:
         for i in range(0, len(self.data)):
             self.data[i][1] = self.data[i][1] * gain
 
-    # edit : 2024-1-19
+    # edit : 2026-10-19
     def CloseGraphs(self):
 
-        if plt.fignum_exists('RELATIVE GRAPH'):
-            plt.close('RELATIVE GRAPH')
+        if self.live_view is not None:
+            self.live_view.Close()
 
-        if plt.fignum_exists('ABSOLUTE GRAPH'):
-            plt.close('ABSOLUTE GRAPH')
+        get_renderer().Close('RELATIVE GRAPH')
+        get_renderer().Close('ABSOLUTE GRAPH')
 
     # CHECK IF THERE IS MEASUREMENT DATA
     # edit : 2026-05-11
@@ -0,0 +1,154 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_decimate.py
+# edit : 2026-10-19
+# desc : Decimation of long series for display. A series is reduced to about two points per
+#        pixel column: the min and the max of each bucket, so peaks are never lost. Optionally
+#        the min/max points are reduced further with largest-triangle-three-buckets (LTTB).
+#        mini_pyramid keeps min/max buckets of a series on several resolutions, so the points of
+#        any visible range are found without going through the raw data. Pyramid of a growing
+#        series is extended with the new points only.
+#        Used only for drawing, numpy is available with matplotlib.
+
+import math
+import numpy as np
+
+PYRAMID_FACTOR = 4      # bucket size grows by this factor from one level to the next
+
+# edit : 2026-10-19
+# desc : Indexes of the min and max points of y[first:last] in about bucket_count buckets,
+#        in increasing order. All indexes are returned if there are only a few points.
+def minmax_indexes(y, first, last, bucket_count):
+    n = last - first
+    if n <= 2 * bucket_count:
+        return np.arange(first, last)
+
+    size = math.ceil(n / bucket_count)
+    count = n // size
+    starts = first + np.arange(count) * size
+    block = y[first:first + count * size].reshape(count, size)
+    indexes = np.stack((starts + block.argmin(axis=1), starts + block.argmax(axis=1)), axis=1)
+    indexes = np.sort(indexes, axis=1).ravel()
+
+    rest = first + count * size
+    if rest < last:
+        tail = y[rest:last]
+        indexes = np.append(indexes, np.sort([rest + tail.argmin(), rest + tail.argmax()]))
+    return indexes
+
+# edit : 2026-10-19
+# desc : Largest-triangle-three-buckets. Choose 'threshold' points of the candidate points
+#        (indexes into x and y) so that the shape of the line is kept. First and last are kept.
+def lttb_indexes(x, y, indexes, threshold):
+    n = len(indexes)
+    if threshold >= n or threshold < 3:
+        return indexes
+
+    xs = x[indexes].astype(float)
+    ys = y[indexes].astype(float)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    bucket = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket) + 1
+        end = int((i + 1) * bucket) + 1
+        next_end = min(int((i + 2) * bucket) + 1, n)
+        if end < next_end:
+            avg_x = xs[end:next_end].mean()
+            avg_y = ys[end:next_end].mean()
+        else:
+            avg_x = xs[-1]
+            avg_y = ys[-1]
+        area = np.abs((xs[a] - avg_x) * (ys[start:end] - ys[a]) - (xs[a] - xs[start:end]) * (avg_y - ys[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    selected[-1] = n - 1
+    return indexes[selected]
+
+
+class mini_pyramid:
+
+    # edit : 2026-10-19
+    def __init__(self):
+        self.Reset()
+
+    # edit : 2026-10-19
+    # desc : Forget the series, next Update builds the pyramid from the beginning.
+    def Reset(self):
+        self.levels = []        # level k has (min indexes, max indexes) of buckets of PYRAMID_FACTOR**(k+1) points
+        self.count = 0          # number of points in the pyramid
+        self.first_x = None     # x of the first point, changes if old points are dropped
+        self.monotonic = True   # x is increasing, visible range can be searched
+
+    # edit : 2026-10-19
+    # desc : Add new points of the series. x and y are numpy arrays of the whole series.
+    #        If the series is shorter or starts from another point, pyramid is built again.
+    def Update(self, x, y):
+        n = len(y)
+        if n == 0:
+            self.Reset()
+            return
+        if n < self.count or x[0] != self.first_x:
+            self.Reset()
+            self.first_x = x[0]
+        if n == self.count:
+            return
+
+        if self.monotonic:
+            new_x = x[max(self.count - 1, 0):n]
+            self.monotonic = bool(np.all(new_x[1:] >= new_x[:-1]))
+
+        # level 0 from the points, higher levels from the level below
+        size = PYRAMID_FACTOR
+        level = 0
+        while n // size > 0:
+            bucket_count = n // size
+            if level < len(self.levels):
+                mins, maxs = self.levels[level]
+            else:
+                mins = np.empty(0, dtype=np.int64)
+                maxs = np.empty(0, dtype=np.int64)
+                self.levels.append((mins, maxs))
+            old_count = len(mins)
+            if bucket_count > old_count:
+                if level == 0:
+                    starts = np.arange(old_count, bucket_count) * size
+                    block = y[old_count * size:bucket_count * size].reshape(-1, size)
+                    new_mins = starts + block.argmin(axis=1)
+                    new_maxs = starts + block.argmax(axis=1)
+                else:
+                    below_mins, below_maxs = self.levels[level - 1]
+                    candidates = below_mins[old_count * PYRAMID_FACTOR:bucket_count * PYRAMID_FACTOR].reshape(-1, PYRAMID_FACTOR)
+                    rows = np.arange(len(candidates))
+                    new_mins = candidates[rows, y[candidates].argmin(axis=1)]
+                    candidates = below_maxs[old_count * PYRAMID_FACTOR:bucket_count * PYRAMID_FACTOR].reshape(-1, PYRAMID_FACTOR)
+                    new_maxs = candidates[rows, y[candidates].argmax(axis=1)]
+                self.levels[level] = (np.append(mins, new_mins), np.append(maxs, new_maxs))
+            size = size * PYRAMID_FACTOR
+            level = level + 1
+        self.count = n
+
+    # edit : 2026-10-19
+    # desc : Indexes of the points to draw from range first...last-1, about 2 * width points.
+    #        Buckets of the pyramid level closest to width buckets are used, the rest of the
+    #        range after the last complete bucket is decimated directly.
+    def GetIndexes(self, y, first, last, width):
+        n = last - first
+        if n <= 2 * width:
+            return np.arange(first, last)
+
+        level = min(math.ceil(math.log(n / width, PYRAMID_FACTOR)), len(self.levels)) - 1
+        if level < 0:
+            return minmax_indexes(y, first, last, width)
+        size = PYRAMID_FACTOR ** (level + 1)
+        mins, maxs = self.levels[level]
+        first_bucket = first // size
+        last_bucket = min(math.ceil(last / size), len(mins))
+        indexes = np.sort(np.stack((mins[first_bucket:last_bucket], maxs[first_bucket:last_bucket]), axis=1), axis=1).ravel()
+
+        rest = max(last_bucket * size, first)
+        if rest < last:
+            indexes = np.append(indexes, minmax_indexes(y, rest, last, max((last - rest) // size, 1)))
+        # line is drawn to the edges of the range
+        return np.unique(np.concatenate(([first], indexes, [last - 1])))
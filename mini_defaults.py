@@ -1,7 +1,7 @@
 # Copyright (c) 2025 Coded Devices Oy
 #
 # file : mini_defaults.py
-# ver  : 2025-5-23
+# ver  : 2026-10-19
 # desc : Default structure and values for the settings file. This file is not used actively,
 #        but only when recreating or fixing the actual settings file.
 #
@@ -25,14 +25,73 @@ DEFAULT_SETTINGS = {
     "device" : {
         "comport_name" : "COM3",            # Windows style
         #"comport_name" : "/dev/ttyUSB0"    # Linux style
-        "hw_delay" : 660,                   # Hardware delay in sending one reading
+        "hw_delay" : 660,                   # Hardware delay in sending one reading (not used, continuous mode runs on fixed deadlines)
         "hw_channel_count" : 288
     },
 
     # Measurement settings
     "measurement" : {
         "hw_source_intensity" : 5,         # LED intensity (1...31)
-        "hw_integration_time" : 25         # Sensor integration time (ms)
+        "hw_integration_time" : 25,        # Sensor integration time (ms)
+        "journal_flush_interval" : 5,      # Time Domain rows are on disk at least this often (sec), 0 = no journal
+        "timed_memory_rows" : 100000,      # Time Domain rows kept in memory, older are only in the journal, 0 = all
+        "stats_windows" : "100, 60s"       # rolling statistics of Time Domain channels, samples or seconds (60s)
+    },
+
+    # External trigger from the input pin
+    "trigger" : {
+        "poll_interval" : 10,              # input pin is polled at this interval (ms)
+        "edge" : "rising",                 # rising, falling or both
+        "queue_size" : 10                  # triggers waiting for acquisition, more are counted as missed
+    },
+
+    # Graph settings
+    "display" : {
+        "renderer" : "tk",                 # graphs in tabs of the window (tk) or in separate windows (pyplot)
+        "decimation" : "minmax",           # long series in graphs: minmax, lttb or off
+        "live_history" : 5,                # previous spectra shown as fading lines in the live mode
+        "live_max_fps" : 20,               # highest redraw rate of the live mode
+        "live_interval" : 0.5              # interval of the live measurement (sec), one spectrum takes about 0.5 s
+    },
+
+    # Local server for other processes (loopback TCP, JSON lines)
+    "server" : {
+        "port" : 50555,
+        "queue_size" : 100,                # stream messages waiting for one client, oldest are dropped
+        "autostart" : 0                    # 1 = server is started with the app
+    },
+
+    # Latest spectrum in shared memory for other processes (mini_shm_reader)
+    "shm" : {
+        "name" : "mini_spec_latest",       # name of the shared memory block
+        "autostart" : 0                    # 1 = block is created with the app
+    },
+
+    # Background removal ('b' and automatic)
+    "background" : {
+        "itime" : 0,                       # integration time (ms) of the background file, 0 = not scaled
+        "auto" : 0                         # 1 = background removed from every measured spectrum
+    },
+
+    # Automatic exposure ('ae')
+    "exposure" : {
+        "target" : 800,                    # peak level (bits)
+        "tolerance" : 5,                   # accepted difference from the target (% of the target)
+        "saturation" : 1023,               # highest reading of the sensor (bits)
+        "min_itime" : 10,                  # integration time limits (ms)
+        "max_itime" : 500,
+        "max_acquisitions" : 8             # acquisitions for one exposure at most
+    },
+
+    # Results of the automatic exposure per sample type, sample = itime, LED, peak channel, dark level
+    "exposure_cache" : {
+    },
+
+    # Metrics in the Prometheus text format (mini_metrics)
+    "metrics" : {
+        "file" : "",                       # file written every interval, empty = no file
+        "interval" : 15,                   # seconds between the writes of the file
+        "port" : 0                         # http://127.0.0.1:port/metrics, 0 = not served
     },
 
     # Special file names
@@ -0,0 +1,264 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_exposure.py
+# edit : 2026-10-19
+# desc : Automatic exposure. Integration time and LED intensity are changed until the peak of
+#        the spectrum is at the target level, using as few acquisitions as possible.
+#        The first acquisition is a full spectrum to find the peak channel and the dark level,
+#        after that only the peak channel is measured (GetFirstChannel, a fast partial read).
+#        Model of the peak : counts = dark + slope * integration time. With one point the dark
+#        level of the spectrum is used as the offset, with more points the line is fitted.
+#        The next integration time is solved from the model. If it is outside the limits,
+#        the LED intensity is changed assuming the signal is proportional to it.
+#        A saturated reading is not used in the model, the time is halved instead.
+#        Results are cached per sample type in [exposure_cache] of the settings file,
+#        a cached sample needs usually only one acquisition to check the level.
+
+import math
+import operator
+import mini_file_operations as fop
+from mini_metrics import get_metrics
+
+MIN_LED = 1             # 0 switches the light source off
+MAX_LED = 31
+
+class mini_exposure:
+
+    # edit : 2026-10-19
+    def __init__(self):
+        self.target = 800           # peak level (bits)
+        self.tolerance = 5          # accepted difference from the target (% of the target)
+        self.saturation = 1023      # highest reading of the sensor
+        self.min_itime = 10         # limits of the integration time (ms)
+        self.max_itime = 500
+        self.max_acquisitions = 8
+        self.cache = {}             # sample -> (itime, led, channel, dark)
+        self.acquisitions = 0
+
+    # edit : 2026-10-19
+    # desc : Parameters from [exposure] and the cached samples from [exposure_cache].
+    def LoadSettings(self, settings):
+        try:
+            self.target = int(settings.get('exposure', 'target'))
+            self.tolerance = float(settings.get('exposure', 'tolerance'))
+            self.saturation = int(settings.get('exposure', 'saturation'))
+            self.min_itime = int(settings.get('exposure', 'min_itime'))
+            self.max_itime = int(settings.get('exposure', 'max_itime'))
+            self.max_acquisitions = int(settings.get('exposure', 'max_acquisitions'))
+        except ValueError as e:
+            print(f' ERROR in [exposure] settings, defaults used: {e}')
+        self.cache = {}
+        if settings.has_section('exposure_cache'):
+            for sample, value in settings.items('exposure_cache'):
+                try:
+                    itime, led, channel, dark = (int(x) for x in value.split(','))
+                    self.cache[sample] = (itime, led, channel, dark)
+                except ValueError:
+                    print(f' ERROR in cached exposure of {sample}: {value}')
+
+    # edit : 2026-10-19
+    # desc : Sample names are keys of the settings file, lower case without separators.
+    def SampleKey(self, sample):
+        sample = sample.strip().lower()
+        if any(x in sample for x in '=:[]#;'):
+            print(f' ERROR: sample name {sample} can not contain = : [ ] # ;')
+            return None
+        return sample
+
+    # edit : 2026-10-19
+    # desc : Save the result of Run for the sample into the cache and the settings file.
+    def Store(self, sample, result):
+        key = self.SampleKey(sample)
+        if not key or result is None:
+            return None
+        self.cache[key] = (result['itime'], result['led'], result['channel'], result['dark'])
+        return fop.update_settings_file('exposure_cache', key, ', '.join(str(x) for x in self.cache[key]))
+
+    # edit : 2026-10-19
+    # desc : Remove the sample from the cache and the settings file.
+    def Forget(self, sample):
+        key = self.SampleKey(sample)
+        if key in self.cache:
+            del self.cache[key]
+            fop.remove_settings_option('exposure_cache', key)
+            print(f' Cached exposure of {key} removed.')
+
+    # edit : 2026-10-19
+    def PrintCache(self):
+        if not self.cache:
+            print(' No cached exposures.')
+            return
+        print(f' {"sample":<20}{"itime ms":>9}{"LED":>5}{"channel":>9}{"dark":>6}')
+        for sample, (itime, led, channel, dark) in sorted(self.cache.items()):
+            print(f' {sample:<20}{itime:>9}{led:>5}{channel:>9}{dark:>6}')
+
+    # edit : 2026-10-19
+    # desc : Find the integration time and LED intensity for the peak at the target level.
+    #        itime and led are the current settings, used if the sample is not cached.
+    #        Returns {itime, led, channel, peak, dark, acquisitions, converged}, None on errors.
+    def Run(self, instrument, itime, led, sample='', target=None):
+        target = self.target if target is None else target
+        tolerance = target * self.tolerance / 100
+        if not 0 < target < self.saturation:
+            print(f' ERROR: target {target} must be between 0 and the saturation level {self.saturation}!')
+            return None
+
+        self.acquisitions = 0
+        cached = self.cache.get(self.SampleKey(sample)) if sample else None
+        if cached is not None:
+            itime, led, channel, dark = cached
+        itime = min(max(int(itime), self.min_itime), self.max_itime)
+        led = min(max(int(led), MIN_LED), MAX_LED)
+        if not self.SetItime(instrument, itime) or not self.SetLed(instrument, led):
+            return None
+
+        if cached is not None:
+            print(f' Cached exposure of {sample}: {itime} ms, LED {led}')
+            counts = self.ReadPeak(instrument, channel)
+        else:
+            data = []
+            if instrument.getSpectrum(data) != 1 or len(data) == 0:
+                print(' ERROR: no spectrum for the exposure!')
+                return None
+            self.acquisitions = 1
+            channel, counts = max(data, key=operator.itemgetter(1))
+            dark = min(x[1] for x in data)
+
+        points = []                 # (itime, counts) of unsaturated readings with the current LED
+        while counts is not None:
+            print(f' Exposure {self.acquisitions}: {itime} ms, LED {led}, peak {counts} (ch {channel})')
+            if abs(counts - target) <= tolerance:
+                break
+            if self.acquisitions >= self.max_acquisitions:
+                print(f' WARNING: target {target} not reached in {self.acquisitions} acquisitions.')
+                break
+
+            if counts < self.saturation:
+                points.append((itime, counts))
+            new_itime, new_led = self.NextSetting(points, itime, led, dark, target)
+            if (new_itime, new_led) == (itime, led):
+                print(f' WARNING: target {target} can not be reached within the limits.')
+                break
+            if new_led != led:
+                # signal per ms changes with the LED, offset of the fitted line is kept as the dark level
+                if len(points) > 1:
+                    dark = int(self.Fit(points, dark)[1])
+                points = []
+                if not self.SetLed(instrument, new_led):
+                    return None
+                led = new_led
+            if new_itime != itime:
+                if not self.SetItime(instrument, new_itime):
+                    return None
+                itime = new_itime
+            counts = self.ReadPeak(instrument, channel)
+
+        if counts is None:
+            return None
+        get_metrics().Observe('mini_spec_exposure_acquisitions', self.acquisitions, source='cache' if cached else 'search')
+        return {'itime': itime, 'led': led, 'channel': channel, 'peak': counts, 'dark': dark,
+                'acquisitions': self.acquisitions, 'converged': abs(counts - target) <= tolerance}
+
+    # edit : 2026-10-19
+    # desc : Least squares line counts = offset + slope * itime. One point, or points of the
+    #        same itime, use the dark level as the offset. Returns (slope, offset).
+    def Fit(self, points, dark):
+        n = len(points)
+        if n > 1:
+            mean_t = sum(t for t, c in points) / n
+            mean_c = sum(c for t, c in points) / n
+            var_t = sum((t - mean_t) ** 2 for t, c in points)
+            if var_t > 0:
+                slope = sum((t - mean_t) * (c - mean_c) for t, c in points) / var_t
+                if slope > 0:
+                    return slope, mean_c - slope * mean_t
+        t, c = points[-1]
+        return (c - dark) / t, dark
+
+    # edit : 2026-10-19
+    # desc : Integration time and LED intensity of the next acquisition.
+    def NextSetting(self, points, itime, led, dark, target):
+        if not points:
+            # saturated, no model yet
+            return max(self.min_itime, itime // 2), led
+        slope, offset = self.Fit(points, dark)
+        if slope <= 0 or target <= offset:
+            # no signal above the dark level, try the longest time
+            return self.max_itime, led
+
+        new_itime = round((target - offset) / slope)
+        new_led = led
+        if new_itime > self.max_itime:
+            if led < MAX_LED:
+                new_led = min(MAX_LED, math.ceil(max(led, 1) * (target - offset) / (slope * self.max_itime)))
+            new_itime = self.max_itime
+        elif new_itime < self.min_itime:
+            if led > MIN_LED:
+                new_led = max(MIN_LED, int(led * (target - offset) / (slope * self.min_itime)))
+            new_itime = self.min_itime
+        return new_itime, new_led
+
+    # edit : 2026-10-19
+    # desc : Measure and read only the peak channel. Returns the counts, None on errors.
+    def ReadPeak(self, instrument, channel):
+        self.acquisitions = self.acquisitions + 1
+        ch_nr, value = instrument.GetFirstChannel(channel)
+        try:
+            value = int(value)
+        except ValueError:
+            value = -1
+        if value == -1:
+            print(f' ERROR in reading channel {channel} for the exposure!')
+            return None
+        return value
+
+    # edit : 2026-10-19
+    def SetItime(self, instrument, itime):
+        if instrument.setIntegrationTime(itime) != itime:
+            print(f' ERROR in setting integration time {itime} ms!')
+            return False
+        return True
+
+    # edit : 2026-10-19
+    # desc : Old firmware does not return the intensity (-1), the value is trusted then.
+    def SetLed(self, instrument, led):
+        new_led = instrument.setSourceIntensity(led)
+        if new_led != -1 and new_led != led:
+            print(f' ERROR in setting LED intensity {led}!')
+            return False
+        return True
+
+
+# unit test main
+# edit : 2026-10-19
+#
+if __name__ == '__main__':
+    import random
+
+    # instrument with counts = dark + (signal * led) * itime, saturated at 1023
+    class simulated_instrument:
+        def __init__(self, signal):
+            self.signal = signal
+            self.itime = 25
+            self.led = 5
+        def setIntegrationTime(self, itime):
+            self.itime = itime
+            return itime
+        def setSourceIntensity(self, led):
+            self.led = led
+            return led
+        def Level(self, ch):
+            peak = math.exp(-((ch - 150) / 30) ** 2)
+            return min(1023, int(60 + 0.2 * self.itime + self.signal * self.led * self.itime * peak + random.gauss(0, 2)))
+        def getSpectrum(self, output_data):
+            del output_data[:]
+            output_data.extend([ch, self.Level(ch)] for ch in range(1, 289))
+            return 1
+        def GetFirstChannel(self, ch):
+            return (str(ch), str(self.Level(ch)))
+
+    myExposure = mini_exposure()
+    for signal in (0.5, 0.05, 0.004, 40.0):
+        result = myExposure.Run(simulated_instrument(signal), 25, 5)
+        print(f' signal {signal}: {result}')
+        print('')
@@ -1,19 +1,37 @@
 # Copyright (c) 2025 Coded Devices Oy
 
 # file : mini_file_operations.py
-# edit : 2026-04-06
+# edit : 2026-10-19
 # desc : Reads and writes of the Mini Spec app
 # TODO : After reading the reference file name from the saved settings,
 #        then test that this filepath still points to a usable data.
-#        Add function for reading Time-D files
 
 import os
+import sys
+import json
+import math
+import zlib
+import struct
+import locale
 import mini_defaults
+from mini_metrics import get_metrics
 import configparser
+from array import array
+from itertools import accumulate
 
 # settings ini file
 settigs_file_name = "mini_settings.ini"
 
+# compressed spectrum and Time Domain files
+COMPRESSED_EXTENSION = '.msz'
+COMPRESSED_MAGIC = b'MSZ1'
+
+# text files are written with the default encoding of open()
+TEXT_ENCODING = locale.getpreferredencoding(False)
+
+# full spectrum time series, one spectrum per row
+SPECTROGRAM_HEADER = '[Spectrogram]'
+
 # edit : 2025-5-23
 # desc : Returns True if path exists.
 def Check_File_Path(file_path):
@@ -36,6 +54,7 @@ def test_settings(config):
 #       Check read settings values later in try... except way and prepare for parsing errors 
 #       --> Raises: MissingSectionHeaderError if the INI file is malformed.
 def load_settings(config, file_name):
+    get_metrics().Inc('mini_spec_settings_reads_total')
     read_file = config.read(file_name)
     if not read_file:
         raise FileNotFoundError(f" File {file_name} may not exist or is invalid.")
@@ -44,141 +63,238 @@ def load_settings(config, file_name):
 # Edit : 2025-3-21
 # Note! If the file is missing but directory is correct a new file is created.
 def save_settings(config, file_name):
+    get_metrics().Inc('mini_spec_settings_writes_total')
     try:
         with open(file_name, "w") as configfile:
             config.write(configfile)
     except Exception as e:
         print(f" ERROR in saving settings. {e}")
         
-# READ FILE HEADER
-# edit : 2026-04-12
-# Desc : Checks if file contains a spectrum or Time Domain Data
-def read_file_header(file_name):
+# file parsed by read_file_header, key is (path, mtime, size)
+# edit : 2026-10-19
+# desc : GUI first asks the header and then loads the same file, this way the file is read only once.
+#        The next load takes the result out of the cache, so a long file is not kept in memory.
+_parsed_file = {'key' : None, 'result' : None}
+
+# PARSE DATA FILE
+# edit : 2026-10-19
+# desc : Single pass reader for spectrum and Time Domain files, text or compressed.
+#        The whole file is read at once. Returns the parsed dict or -1 if reading fails.
+#        keep=True keeps the result for the next call of the same file (read_file_header).
+def parse_data_file(file_name, keep=False):
     try:
-        with(open(file_name, 'r') as file):
-            for line in file:
-                line=line.strip()
-                if line == '[spectrum]':
-                    return line
-                elif line == '[Time Domain Values]':
-                    return line
+        stat = os.stat(file_name)
+        key = (os.path.abspath(file_name), stat.st_mtime_ns, stat.st_size)
+        if _parsed_file['key'] == key:
+            result = _parsed_file['result']
+            if not keep:
+                _parsed_file['key'] = None
+                _parsed_file['result'] = None
+            return result
+        _parsed_file['key'] = None      # older file is not needed any more
+        _parsed_file['result'] = None
+        with open(file_name, 'rb') as file:
+            content = file.read()
     except FileNotFoundError:
         print(f' ERROR: {file_name} not found!')
         return -1
-    except IsADirectoryError:
+    except (IsADirectoryError, PermissionError):
         print(' ERROR: File name missing!')
         return -1
-                    
+
+    result = parse_data_bytes(content)
+    if result == -1:
+        print(f' ERROR: {file_name} is not a spectrum or Time Domain file!')
+        return -1
+    if keep:
+        _parsed_file['key'] = key
+        _parsed_file['result'] = result
+    return result
+
+# PARSE DATA BYTES
+# edit : 2026-10-19
+# desc : Parse content of a text or compressed file. Returns -1 if the content is not valid.
+def parse_data_bytes(content):
+    if content.startswith(COMPRESSED_MAGIC):
+        return parse_compressed_bytes(content)
+    try:
+        return parse_data_text(content.decode(TEXT_ENCODING))
+    except UnicodeDecodeError:
+        return -1
+
+# PARSE DATA TEXT
+# edit : 2026-10-19
+# desc : The section header is searched and the numeric block is split into tokens in one go.
+#        Columns are converted only when asked with get_columns().
+#        Returns a dict {'header', 'unit', 'comment', 'labels', 'row_count', ...}.
+#        'header' is '[spectrum]', '[Time Domain Values]', '[Spectrogram]' or None if none was found.
+def parse_data_text(text):
+    result = {'header' : None, 'unit' : '', 'comment' : '', 'labels' : [],
+              'tokens' : [], 'column_count' : 0, 'row_count' : 0, 'columns' : {}}
+    # header is searched line by line, there can be any number of comment lines before it
+    pos = 0                         # offset of the next line in text
+    line_number = 0
+    first_line = ''
+    while pos < len(text):
+        line_end = text.find('\n', pos)
+        if line_end == -1:
+            break                   # header line is always followed by the column labels
+        line = text[pos:line_end].strip()
+        pos = line_end + 1
+        if line == '[spectrum]' or line == '[Time Domain Values]' or line == SPECTROGRAM_HEADER:
+            result['header'] = line
+            if line_number > 0:
+                result['comment'] = first_line
+            break
+        if line_number == 0:
+            first_line = line
+        line_number = line_number + 1
+
+    if result['header'] is not None:
+
+        # column labels like '[ch]  [nm]  [bits]' or 'Ch1  Ch2  Ch3  Time'
+        next_line = text.find('\n', pos)
+        if next_line == -1:
+            next_line = len(text)
+        labels = text[pos:next_line].split()
+        if len(labels) > 0 and not labels[0][0].isdigit():
+            result['labels'] = labels
+            pos = next_line + 1
+        if '[%]' in labels:
+            result['unit'] = '%'
+        elif '[bits]' in labels:
+            result['unit'] = 'bits'
+
+        # numeric block ends at [end] or at the end of file (unfinished journal)
+        block_end = text.find('[end]', pos)
+        if block_end == -1:
+            block_end = len(text)
+        block = text[pos:block_end]
+        column_count = len(result['labels'])
+        if column_count == 0:
+            column_count = len(block[:block.find('\n')].split()) or 1
+        result['column_count'] = column_count
+        result['tokens'] = _split_numeric_block(block, column_count)
+        result['row_count'] = len(result['tokens']) // column_count
+
+    return result
+
+# edit : 2026-10-19
+# desc : Split a whitespace separated numeric block into a flat token list, row after row.
+#        Fast path splits the whole block once, it is used when every non-empty line has
+#        column_count values (checked with map, no Python loop). Falls back to line by line
+#        parsing if the block has lines of different length, those lines are reported and skipped.
+def _split_numeric_block(block, column_count):
+    if set(map(len, map(str.split, block.splitlines()))) <= {0, column_count}:
+        return block.split()
+
+    tokens = []
+    for line in block.splitlines():
+        point = line.split()
+        if len(point) == column_count:
+            tokens.extend(point)
+        elif len(point) > 0:
+            print(f' ERROR in reading data line: {line}')
+    return tokens
+
+# latest converted column of each column index, {index : (tokens, values)}
+# edit : 2026-10-19
+# desc : Channel and wavelength columns are the same in all files measured with the same
+#        calibration. Comparing the strings is much faster than converting them again.
+#        Only spectrum length columns are kept, Time Domain and spectrogram files use memo=False.
+_column_memo = {}
+MEMO_MAX_ROWS = 4096
+
+# GET COLUMNS OF A PARSED FILE
+# edit : 2026-10-19
+# desc : Convert the selected columns of parse_data_file result into lists.
+#        A column becomes a list of int if all its values are int, otherwise a list of float.
+#        Converted columns are kept in the result, do not modify the returned lists.
+#        memo=False skips _column_memo, for files with many columns that are not repeated.
+#        Returns None if the values can not be converted.
+def get_columns(parsed, *column_indexes, memo=True):
+    ret_columns = []
+    step = parsed['column_count']
+    for i in column_indexes:
+        if i not in parsed['columns']:
+            tokens = parsed['tokens'][i::step]
+            old = _column_memo.get(i) if memo else None
+            if old is not None and old[0] == tokens:
+                parsed['columns'][i] = old[1]
+                ret_columns.append(old[1])
+                continue
+            try:
+                parsed['columns'][i] = list(map(int, tokens))
+            except ValueError:
+                try:
+                    parsed['columns'][i] = list(map(float, tokens))
+                except ValueError:
+                    print(f' ERROR: column {i + 1} contains non numeric values!')
+                    return None
+            if memo and len(tokens) <= MEMO_MAX_ROWS:
+                _column_memo[i] = (tokens, parsed['columns'][i])
+        ret_columns.append(parsed['columns'][i])
+    return ret_columns
+
+# READ FILE HEADER
+# edit : 2026-10-19
+# Desc : Checks if file contains a spectrum or Time Domain Data.
+#        The file is parsed and cached for the following read_file or read_timed_file call.
+def read_file_header(file_name):
+    parsed = parse_data_file(file_name, keep=True)
+    if parsed == -1:
+        return -1
+    return parsed['header']
 
 # func : read_file
-# edit : 2026-04-12
+# edit : 2026-10-19
 # desc : Read spectrum or calibration data from a txt file.
 #        Spectrum data follows [spectrum] -header and ends by [End] -header
-#        Test if intensity data is int (raw spectrum) or float (calibration).
+#        Intensity data is int (raw spectrum) or float (calibration) depending on the file.
 # todo : Create separate headers for calibration, background, reference and source files.
 #        Identify the spectrum type by unit [bits] or [%] and draw the y-axis accordingly.
 #
 def read_file(fileName):
-    header_found = False
-    data = []
     unit = ''
-    try:
-        file = open(fileName, 'r')
-    except FileNotFoundError:
-        print(' Error: File not found!')
+    print(' Reading file '+ fileName + ' ...')
+    parsed = parse_data_file(fileName)
+    if parsed == -1:
         return -1, unit
-    except IsADirectoryError:
-        print(' Error: File name missing!')
+
+    unit = parsed['unit']
+    if parsed['header'] == '[Time Domain Values]':
+        print(f' Time D measurement found, but function is for spectrums.')
+        return (-1, 'T')
+    elif parsed['header'] != '[spectrum]' or parsed['column_count'] != 3:
         return -1, unit
 
-    print(' Reading file '+ fileName + ' ...')
-    for line in file:
-		
-        # check header
-        # Correct Spectrum file
-        if(line == '[spectrum]\n'):
-            header_found = True
-        # Time Domain file 
-        elif(line == '[Time Domain Values]\n'):
-            print(f' Time D measurement found, but function is for spectrums.')
-            return (-1, 'T')     
-        
-        # check what unit is used
-        elif('[%]' in line):
-            print(" Absorption spectrum found...")
-            unit = '%'
-        elif('[bits]' in line):
-            print(" Absolute spectrum found...")
-            unit = 'bits'
-		
-        # parse data lines	
-        elif(line != '[end]\n' and header_found == True):
-            point = line.split()
-            if (point[0].isdigit() and point[1].isdigit() and point[2].isdigit()): 
-                data.append([int(point[1]), int(point[2])])
-            
-            elif (point[0].isdigit() and point[1].isdigit() and point[2].isdigit() != True):
-                data.append([int(point[1]), float(point[2])])
-
-        # end of file
-        elif(line == '[end]\n' or line == ''):
-            break
-	
-    file.close()
+    if unit == '%':
+        print(" Absorption spectrum found...")
+    elif unit == 'bits':
+        print(" Absolute spectrum found...")
 
-    if header_found == True:
-        return data, unit
-    else: 
+    columns = get_columns(parsed, 1, 2)     # wavelength, intensity
+    if columns is None:
         return -1, unit
-    
+    return list(map(list, zip(*columns))), unit
+
 # READ TIME DOMAIN FILE
-# edit: 2026-04-12
-# Desc: Read multi channel data file. Each data line: Ch1 Ch2 Ch3 Time
+# edit: 2026-10-19
+# Desc: Read multi channel data file. Each data line: Ch1 Ch2 ... ChN Time
 def read_timed_file(file_name):
-     
-    timed_data=[]
-    header_found = False
-
-    try: 
-        print(f' Reading {file_name}...')
-        with open(file_name, "r") as timed_file:
-            
-            for line in timed_file:
-                    
-                # remove linechange etc.
-                line=line.strip()
-
-                # header
-                if line == '[Time Domain Values]':
-                    print(f' Time Domain measurement found...')
-                    header_found = True
-
-                # Channels
-                elif 'Ch' in line:
-                    pass
-                
-                # actual data lines
-                elif line != '[end]' and header_found == True:
-                    try:
-                        # read data line
-                        data_line = line.split()
-                        row = [(int(data_line[0])),
-                            (int(data_line[1])),
-                            (int(data_line[2])),
-                            (float(data_line[3]))]
-                        timed_data.append(row)
-                    except ValueError:
-                        print(f' ERROR in reading Time Domain Values from file {timed_file}')
-            
-                elif line == '[end]':
-                    break
-    except FileNotFoundError:
-        print(f' ERROR: file {file_name} not found!')
+    print(f' Reading {file_name}...')
+    parsed = parse_data_file(file_name)
+    if parsed == -1 or parsed['header'] != '[Time Domain Values]':
+        return -1
 
-    if header_found == True:
-        return timed_data
-    else:
-        return -1             
+    print(f' Time Domain measurement found...')
+    column_count = parsed['column_count']
+    columns = get_columns(parsed, *range(column_count), memo=False)
+    if columns is None:
+        print(f' ERROR in reading Time Domain Values from file {file_name}')
+        return -1
+    times = [float(t) for t in columns[-1]]
+    return list(map(list, zip(*columns[:-1], times)))
 
 # desc : Writea a new value in the settings file.
 # edit : 2025-05-08
@@ -211,6 +327,26 @@ def update_settings_file(section, key, value):
         print(f" ERROR: unexpected problem in writing to settings file. {e}")
         return None
 
+# desc : Remove a key from the settings file. Returns True if removed.
+# edit : 2026-10-19
+def remove_settings_option(section, key):
+    temp_config = configparser.ConfigParser(inline_comment_prefixes = "#")
+    try:
+        temp_config = load_settings(temp_config, settigs_file_name)
+        if not temp_config.has_option(section, key):
+            return False
+        temp_config.remove_option(section, key)
+        save_settings(temp_config, settigs_file_name)
+        return True
+
+    except FileNotFoundError:
+        print(f" ERROR: settigs file {settigs_file_name} not found!")
+        return False
+
+    except Exception as e:
+        print(f" ERROR: unexpected problem in writing to settings file. {e}")
+        return False
+
 # desc : Read a key value from the settings file.
 # edit : 2025-05-08
 def read_settings_file(section, key):
@@ -316,12 +452,17 @@ def write_int_file(data, file_name, comment):
 	new_file.close()
 
 # func : write_file
-# ver : 20.5.2022
+# ver : 2026-10-19
 # Desc: Checks if the instensity data is float or int and writes accordingly.
+#       File name ending .msz is written in compressed format, then wavelengths are not
+#       stored if they match the calibration coefficients calib.
 #       Returns -1 if no data to write.
 #       Returns 1 after writing data.
 #
-def write_file(data, file_name, comment, unit = '[bits]'):
+def write_file(data, file_name, comment, unit = '[bits]', calib = None):
+    if is_compressed_name(file_name):
+        return write_compressed_spectrum(data, file_name, comment, unit, calib)
+
     new_file = open(file_name, 'w')
     new_file.write(str(comment) + '\n')
     new_file.write('[spectrum]\n')
@@ -359,33 +500,235 @@ def create_spectra_folder(folder_name):
         os.mkdir(folder_name)
         print(" Folder " + folder_name + " created.")
 
-# edit : 2024-3-10
-# desc : timed data is 2d-array
+# edit : 2026-10-19
+# desc : Header lines of a Time Domain file, without the comment line.
+def timed_header(ch_count):
+    labels = ''.join('Ch%i\t' %(i+1) for i in range(ch_count))
+    return '[Time Domain Values]\n' + labels + 'Time\t\n'
+
+# edit : 2026-10-19
+# desc : One data line of a Time Domain file, values separated (and ended) by tabs.
+def format_timed_row(row):
+    return '\t'.join(map(str, row)) + '\t\n'
+
+# edit : 2026-10-19
+# desc : timed data is 2d-array. Lines are formatted first and written with one call.
+#        File name ending .msz is written in compressed format.
 def WriteTimedFile(timed_data, file_name, comment=''):
     columns = len(timed_data[0])
-    rows = len(timed_data)
+    if is_compressed_name(file_name):
+        return write_compressed_series(timed_data, file_name, comment)
 
-    # init & header
-    new_file = open(file_name, 'w')
-    new_file.write(str(comment) + '\n')
-    new_file.write('[Time Domain Values]\n')
-    for i in range(columns-1):
-        temp_str = 'Ch%i' %(i+1)
-        new_file.write(temp_str+'\t')
-    new_file.write('Time\t\n')
-
-    # data rows
-    for i in range(rows):
-        for j in range(columns):
-            new_file.write(str(timed_data[i][j]) + '\t')
-        new_file.write('\n')
-
-    # end & close
-    new_file.write('[end]\n')
-    new_file.close()
+    with open(file_name, 'w') as new_file:
+        new_file.write(str(comment) + '\n')
+        new_file.write(timed_header(columns - 1))
+        new_file.writelines(map(format_timed_row, timed_data))
+        new_file.write('[end]\n')
 
     return 1
 
+# WRITE SPECTROGRAM FILE
+# edit : 2026-10-19
+# desc : Full spectrum time series. Each data line: Time I(wl1) I(wl2) ... I(wlN),
+#        wavelengths are the column labels. channel_columns has the intensities of each wavelength.
+#        File name ending .msz is written in compressed format, each wavelength column delta encoded.
+def write_spectrogram_file(times, wavelengths, channel_columns, file_name, comment=''):
+    if len(times) == 0:
+        print(" Error: No data to save!")
+        return -1
+
+    labels = ['Time'] + [str(w) for w in wavelengths]
+    if is_compressed_name(file_name):
+        meta = {'header' : SPECTROGRAM_HEADER, 'comment' : str(comment), 'labels' : labels,
+                'row_count' : len(times), 'calib' : None, 'columns' : []}
+        encoded = []
+        for label, values in zip(labels, [times] + list(channel_columns)):
+            column_meta, column_data = _encode_column(label, list(values))
+            meta['columns'].append(column_meta)
+            encoded.append(column_data)
+        return _write_compressed(file_name, meta, encoded)
+
+    with open(file_name, 'w') as new_file:
+        new_file.write(str(comment) + '\n')
+        new_file.write(SPECTROGRAM_HEADER + '\n')
+        new_file.write('\t'.join(labels) + '\t\n')
+        new_file.writelines(map(format_timed_row, zip(times, *channel_columns)))
+        new_file.write('[end]\n')
+    return 1
+
+# READ SPECTROGRAM FILE
+# edit : 2026-10-19
+# desc : Returns (times, wavelengths, channel columns) or -1.
+def read_spectrogram_file(file_name):
+    print(f' Reading {file_name}...')
+    parsed = parse_data_file(file_name)
+    if parsed == -1 or parsed['header'] != SPECTROGRAM_HEADER:
+        return -1
+
+    print(f' Spectrogram found...')
+    columns = get_columns(parsed, *range(parsed['column_count']), memo=False)
+    if columns is None:
+        print(f' ERROR in reading spectrogram from file {file_name}')
+        return -1
+    try:
+        wavelengths = [int(x) for x in parsed['labels'][1:]]
+    except ValueError:
+        wavelengths = list(range(1, parsed['column_count']))
+    return [float(t) for t in columns[0]], wavelengths, columns[1:]
+
+# COMPRESSED FILES
+# edit : 2026-10-19
+# desc : File is COMPRESSED_MAGIC followed by zlib compressed payload:
+#        meta length (uint32) + meta (json) + binary column data in the order of meta['columns'].
+#        Column encodings:
+#          'calib'    wavelengths are calculated from meta['calib'], no data stored
+#          'delta'    int values, first value and differences as little endian int array
+#          'delta_ms' float timestamps with 3 decimals, stored like 'delta' in ms units
+#          'raw'      float values as little endian doubles
+#        Raw 10/12 bit counts change only a little from channel to channel, the differences
+#        fit into 16 bits and compress well.
+
+_calib_memo = {'key' : None, 'result' : None}   # latest calib_wavelengths result
+
+# edit : 2026-10-19
+def is_compressed_name(file_name):
+    return str(file_name).lower().endswith(COMPRESSED_EXTENSION)
+
+# edit : 2026-10-19
+# desc : Wavelengths of channels 1...channel_count calculated like mini_data.channelToWavelength.
+#        Result of the latest calibration is kept, it is the same for every saved spectrum.
+def calib_wavelengths(calib, channel_count):
+    key = (tuple(sorted(calib.items())), channel_count)
+    if _calib_memo.get('key') != key:
+        _calib_memo['key'] = key
+        _calib_memo['result'] = [int(calib["a0"] + x * calib["b1"] + x**2 * calib["b2"] + x**3 * calib["b3"]
+                                     + x**4 * calib["b4"] + x**5 * calib["b5"] + 0.5) for x in range(1, channel_count + 1)]
+    return list(_calib_memo['result'])
+
+# edit : 2026-10-19
+# desc : Encode one column, returns (column meta, bytes).
+#        NaN and inf (absorbance, corrected data) have no integer value, such columns are raw.
+def _encode_column(label, values):
+    if all(isinstance(x, int) for x in values):
+        ints = values
+        encoding = 'delta'
+    elif all(math.isfinite(x) and abs(x) < 1e15 and round(x * 1000) / 1000 == x for x in values):
+        ints = [round(x * 1000) for x in values]
+        encoding = 'delta_ms'
+    else:
+        column = array('d', values)
+        encoding = 'raw'
+
+    if encoding != 'raw':
+        deltas = ints[:1] + [b - a for a, b in zip(ints, ints[1:])]
+        type_code = 'q'
+        if len(deltas) > 0 and -32768 <= min(deltas) and max(deltas) <= 32767:
+            type_code = 'h'
+        elif len(deltas) > 0 and -2**31 <= min(deltas) and max(deltas) < 2**31:
+            type_code = 'i'
+        column = array(type_code, deltas)
+
+    if sys.byteorder == 'big':
+        column.byteswap()
+    data = column.tobytes()
+    return {'label' : label, 'encoding' : encoding, 'type' : column.typecode, 'size' : len(data)}, data
+
+# edit : 2026-10-19
+# desc : Decode one column of a compressed file.
+def _decode_column(meta, data, calib, row_count):
+    if meta['encoding'] == 'calib':
+        return calib_wavelengths(calib, row_count)
+    column = array(meta['type'], data)
+    if sys.byteorder == 'big':
+        column.byteswap()
+    if meta['encoding'] == 'raw':
+        return column.tolist()
+    values = list(accumulate(column))
+    if meta['encoding'] == 'delta_ms':
+        values = [x / 1000 for x in values]
+    return values
+
+# edit : 2026-10-19
+def _write_compressed(file_name, meta, encoded):
+    meta_bytes = json.dumps(meta).encode('utf-8')
+    payload = struct.pack('<I', len(meta_bytes)) + meta_bytes + b''.join(encoded)
+    with open(file_name, 'wb') as new_file:
+        new_file.write(COMPRESSED_MAGIC)
+        new_file.write(zlib.compress(payload, 6))
+    return 1
+
+# edit : 2026-10-19
+# desc : Spectrum [[wavelength, intensity], ...] into compressed file.
+#        Returns -1 if no data to write, 1 after writing data.
+def write_compressed_spectrum(data, file_name, comment, unit = '[bits]', calib = None):
+    if len(data) == 0:
+        print(" Error: No data to save!")
+        return -1
+
+    wavelengths = [x[0] for x in data]
+    intensities = [x[1] for x in data]
+    meta = {'header' : '[spectrum]', 'comment' : str(comment), 'labels' : ['[ch]', '[nm]', unit],
+            'row_count' : len(data), 'calib' : None, 'columns' : []}
+    encoded = []
+
+    if calib is not None and None not in calib.values() and calib_wavelengths(calib, len(data)) == wavelengths:
+        meta['calib'] = dict(calib)
+        meta['columns'].append({'label' : '[nm]', 'encoding' : 'calib', 'type' : None, 'size' : 0})
+    else:
+        column_meta, column_data = _encode_column('[nm]', wavelengths)
+        meta['columns'].append(column_meta)
+        encoded.append(column_data)
+
+    column_meta, column_data = _encode_column(unit, intensities)
+    meta['columns'].append(column_meta)
+    encoded.append(column_data)
+    return _write_compressed(file_name, meta, encoded)
+
+# edit : 2026-10-19
+# desc : Time Domain rows [ch1, ..., chN, time] into compressed file.
+def write_compressed_series(timed_data, file_name, comment=''):
+    column_count = len(timed_data[0])
+    labels = ['Ch%i' %(i+1) for i in range(column_count - 1)] + ['Time']
+    meta = {'header' : '[Time Domain Values]', 'comment' : str(comment), 'labels' : labels,
+            'row_count' : len(timed_data), 'calib' : None, 'columns' : []}
+    encoded = []
+    for i in range(column_count):
+        column_meta, column_data = _encode_column(labels[i], [row[i] for row in timed_data])
+        meta['columns'].append(column_meta)
+        encoded.append(column_data)
+    return _write_compressed(file_name, meta, encoded)
+
+# edit : 2026-10-19
+# desc : Parse compressed file content into the same dict as parse_data_text gives,
+#        all columns already converted. Returns -1 if the content is not valid.
+def parse_compressed_bytes(content):
+    try:
+        payload = zlib.decompress(content[len(COMPRESSED_MAGIC):])
+        meta_length = struct.unpack_from('<I', payload)[0]
+        meta = json.loads(payload[4:4 + meta_length].decode('utf-8'))
+        row_count = meta['row_count']
+        pos = 4 + meta_length
+        values = []
+        for column_meta in meta['columns']:
+            data = payload[pos:pos + column_meta['size']]
+            pos = pos + column_meta['size']
+            values.append(_decode_column(column_meta, data, meta['calib'], row_count))
+    except (zlib.error, struct.error, ValueError, KeyError, TypeError) as e:
+        print(f' ERROR in compressed data: {e}')
+        return -1
+
+    if meta['header'] == '[spectrum]':
+        values.insert(0, list(range(1, row_count + 1)))     # channel numbers
+    labels = meta['labels']
+    unit = ''
+    if '[%]' in labels:
+        unit = '%'
+    elif '[bits]' in labels:
+        unit = 'bits'
+    return {'header' : meta['header'], 'unit' : unit, 'comment' : meta['comment'], 'labels' : labels,
+            'tokens' : [], 'column_count' : len(values), 'row_count' : row_count,
+            'columns' : dict(enumerate(values))}
+
 
 # unit test main
 # edit : 2025-05-08
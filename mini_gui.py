@@ -17,7 +17,13 @@ import importlib
 #import mini_settings
 import mini_file_operations as fop
 import mini_defaults
+from mini_scheduler import mini_scheduler
+from mini_instrument import mini_instrument
 
+# file types of the load and save dialogs, .msz is the compressed format
+# edit : 2026-10-19
+LOAD_FILE_TYPES = (("Mini Spec files", "*.txt *.msz"), ("txt files", "*.txt"), ("all files", "*.*"))
+SAVE_FILE_TYPES = (("txt files", "*.txt"), ("compressed files", "*.msz"), ("all files", "*.*"))
 
 # edit : 2025-4-24
 class GUI:
@@ -30,9 +36,7 @@ class GUI:
         self.root.title("Mini Spec App by Coded Devices")
         #self.default_file_location = "c:"   # mini_settings.my_spectra_folder
         self.app_version = ""               # MainApp constructor sets version during start up
-        self.continuousActivated = False
-        self.continuousInterval = 1000      # in ms
-        self.continuousCount = 0            # number of measured sets of selected channels in continuous mode
+        self.continuousScheduler = None     # mini_scheduler of the running continuous measurement
 
         # NOTEBOOK & STYLE definition
         self.notebook = ttk.Notebook(self.root)
@@ -75,6 +79,12 @@ class GUI:
         self.button_new_redraw = ttk.Button(page_meas, text='REDRAW', command=self.button_new_redraw_clicked)
         self.button_new_redraw.grid(row=4, column=2, padx=5, pady= 7, sticky=W)
 
+        # edit : 2026-10-19
+        # LIVE checkbox: spectra are measured continuously and the graph line is updated in place
+        self.live_view = tkinter.BooleanVar(page_meas, False)
+        self.check_live_view = ttk.Checkbutton(page_meas, text='LIVE', variable=self.live_view, command=self.check_live_view_click)
+        self.check_live_view.grid(row=1, column=2, padx=5, pady=7, sticky=W)
+
         # information about current measurement 
         self.str_meas_source = tkinter.StringVar(page_meas, 'No measurement in memory.')
         label_new_state = ttk.Label(page_meas, textvariable=self.str_meas_source)
@@ -204,6 +214,35 @@ class GUI:
         self.entry_max_cnt = ttk.Entry(self.labelFr_continuous, textvariable=self.str_max_cnt, width=5)
         self.entry_max_cnt.grid(row=2, column=2, padx=5, pady=7, sticky=W)
 
+        # edit : 2026-10-19
+        # full spectra mode: ONCE, continuous, SAVE and RESET handle the spectrogram instead of channels
+        self.labelFr_spectrogram = ttk.LabelFrame(page_timed, text='Spectrogram')
+        self.labelFr_spectrogram.grid(row=1, column=3, padx=5, pady=7, sticky='NW')
+
+        self.full_spectra = tkinter.BooleanVar(self.labelFr_spectrogram, False)
+        self.check_full_spectra = ttk.Checkbutton(self.labelFr_spectrogram, text='Full spectra', variable=self.full_spectra)
+        self.check_full_spectra.grid(row=1, column=1, padx=5, pady=7, sticky=W)
+
+        # edit : 2026-10-19
+        # external trigger: an edge of the input pin starts the same reading as ONCE
+        self.labelFr_trigger = ttk.LabelFrame(page_timed, text='Trigger')
+        self.labelFr_trigger.grid(row=1, column=4, padx=5, pady=7, sticky='NW')
+
+        self.external_trigger = tkinter.BooleanVar(self.labelFr_trigger, False)
+        self.check_external_trigger = ttk.Checkbutton(self.labelFr_trigger, text='External input', variable=self.external_trigger,
+                                                      command=self.external_trigger_click)
+        self.check_external_trigger.grid(row=1, column=1, padx=5, pady=7, sticky=W)
+
+        # edit : 2026-10-19
+        # rolling statistics of the channels, updated after every reading
+        self.labelFr_stats = ttk.LabelFrame(page_timed, text='Statistics')
+        self.labelFr_stats.grid(row=3, column=1, columnspan=5, padx=5, pady=7, sticky='NW')
+
+        self.str_timed_stats = tkinter.StringVar(self.labelFr_stats, '')
+        self.label_timed_stats = ttk.Label(self.labelFr_stats, textvariable=self.str_timed_stats, font='TkFixedFont', justify='left')
+        self.label_timed_stats.grid(row=1, column=1, padx=5, pady=7, sticky=W)
+        self.update_timed_stats()
+
     def _initialize_tab_SETTINGS(self):
         # __init__ TAB 'SETTINGS' ************************************************************************
         # edit: 2024-4-24
@@ -317,6 +356,8 @@ class GUI:
         # Notebook in the root window
         #self.notebook.pack(expand=1, fill='both')
         self.notebook.grid(column=0, row=0, sticky=(N, W, S, E))
+        self.root.columnconfigure(0, weight=1)     # graph tabs follow the window size
+        self.root.rowconfigure(0, weight=1)
 
     # button_new event handler 
     # desc : 2026-05-11
@@ -355,7 +396,7 @@ class GUI:
     # desc : For loading saved data. Common to MEAS and TIMED tabs. Uses gui_read_file_header to identify data type,
     #        spectrum or time domain. Then calls proper reading function.
     def button_load_click(self):
-        load_name = filedialog.askopenfilename(title="Select file", filetypes=(("txt files", "*.txt"), ("all files", "*.*")))
+        load_name = filedialog.askopenfilename(title="Select file", filetypes=LOAD_FILE_TYPES)
         if load_name !='':
             header = self.callback('gui_read_file_header', filename=load_name)
             if header == '[spectrum]':
@@ -366,6 +407,9 @@ class GUI:
                 self.str_meas_source.set(f)
             elif header == '[Time Domain Values]':
                 f = self.callback('ld', filename = load_name)
+                self.update_timed_stats()
+            elif header == fop.SPECTROGRAM_HEADER:
+                f = self.callback('sg_load', filename = load_name)
         self.update_abs_buttons()
 
     # button_save event handler
@@ -374,7 +418,7 @@ class GUI:
     def button_save_click(self):
         time_stamp = datetime.now()
         default_filename = time_stamp.strftime("meas %Y-%m-%d %H.%M.%S.txt")
-        save_name = filedialog.asksaveasfilename(initialfile=default_filename)
+        save_name = filedialog.asksaveasfilename(initialfile=default_filename, filetypes=SAVE_FILE_TYPES)
         if save_name != '':
             f = self.callback('s', filename = save_name)
             self.str_meas_source.set(f)
@@ -391,7 +435,7 @@ class GUI:
     # desc : Used to select the reference file in the ABSORP tab 
     #        Saves automatically the selected file path in the settings file.
     def button_browse_file_click(self):
-        zero_file = filedialog.askopenfilename(title = "Select file", filetypes = (("txt files", "*.txt"),("all files", "*.*")))
+        zero_file = filedialog.askopenfilename(title = "Select file", filetypes = LOAD_FILE_TYPES)
         
         if len(zero_file) > 0:
             self.ref_file_name_var.set('')
@@ -419,7 +463,7 @@ class GUI:
     def button_save_abs_click(self):
         time_stamp = datetime.now()
         default_filename = time_stamp.strftime("abs %Y-%m-%d %H.%M.%S.txt")
-        save_name = filedialog.asksaveasfilename(title='Save As', initialfile=default_filename)
+        save_name = filedialog.asksaveasfilename(title='Save As', initialfile=default_filename, filetypes=SAVE_FILE_TYPES)
         self.callback('gui_sab', filename = save_name)
 
     # button clear_abs event handler
@@ -438,7 +482,7 @@ class GUI:
     def button_save_ave_click(self):
         time_stamp = datetime.now()
         default_filename = time_stamp.strftime("ave %Y-%m-%d %H.%M.%S.txt")
-        save_name = filedialog.asksaveasfilename(initialfile=default_filename)
+        save_name = filedialog.asksaveasfilename(initialfile=default_filename, filetypes=SAVE_FILE_TYPES)
         if save_name != '':
             f = self.callback('sa', filename = save_name)
 
@@ -517,6 +561,12 @@ class GUI:
         self.str_app_version.set('PC App Version : ' + str(app_version))
         self.str_fw_version.set('Firmware Version : ' + fw_version)
 
+    # show the result of the automatic exposure in the spinboxes
+    # edit : 2026-10-19
+    def update_exposure(self, itime, led_intensity):
+        self.str_itime.set(str(itime))
+        self.str_source_int.set(str(led_intensity))
+
     # check and vallidate ch1_nm entry value in TIME D tab
     # edit : 2024-3-20
     # todo : get correct max & min values from somewhere
@@ -542,89 +592,123 @@ class GUI:
 
         return True
     
-    # edit : 2024-3-28
+    # edit : 2026-10-19
     # desc : Eventhandler of 'ONCE' button, gets one reading of each selected channels.
+    #        Port is locked over the channels, all of them must come from the same measurement,
+    #        the trigger poller can not send its commands in between.
     def button_read_chs_click(self):
 
         # TEST WAIT STATE
         #self.callback('gui_input_state')
 
+        # the port is not waited for during the handshake, the window would freeze
+        if not self.callback('gui_connected'):
+            return
+
+        if self.full_spectra.get():
+            self.callback('sg')
+            return
+
         try:
-            # read first channel
-            #self.callback('gui_first_ch', wavelength=self.channel_list[0].ch_str.get())
-            self.callback('gui_first_ch', wavelength=self.channel_list[0].get())
-            # read other channels in the channel list
-            for i in range(1, len(self.channel_list)):
-                #print(self.channel_list[i].ch_str.get())
-                #self.callback('gui_another_ch', index=i, wavelength=self.channel_list[i].ch_str.get())
-                self.callback('gui_another_ch', index=i, wavelength=self.channel_list[i].get())
+            with mini_instrument.port_lock:
+                # read first channel
+                #self.callback('gui_first_ch', wavelength=self.channel_list[0].ch_str.get())
+                self.callback('gui_first_ch', wavelength=self.channel_list[0].get())
+                # read other channels in the channel list
+                for i in range(1, len(self.channel_list)):
+                    #print(self.channel_list[i].ch_str.get())
+                    #self.callback('gui_another_ch', index=i, wavelength=self.channel_list[i].ch_str.get())
+                    self.callback('gui_another_ch', index=i, wavelength=self.channel_list[i].get())
             self.callback('gui_draw_timed_graph')
+            self.update_timed_stats()
 
         except Exception as e:
             print(' ERROR in handling "READ CHs" button click!')
             print(str(e))
 
-    # edit : 2025-4-20
-    # desc : Start continuous measurement. Stop continuous measurement if button is pressed. Adjust interval with hardware delay.
-    #        Optimal hw_delay with firmware ver 1.0.4.1 was tested to be 860 ms.
-    #        The final value of continuousInterval variable should be above zero.
+    # edit : 2026-10-19
+    # desc : Start continuous measurement. Stop continuous measurement if button is pressed.
+    #        Readings are started at fixed deadlines 'interval' apart, so the time of the reading
+    #        itself does not need to be subtracted (hw_delay is not used any more).
     def continuous_button_click(self):
 
-        # read & verify the value of the hardware delay
-        try:
-            hw_delay = int(fop.read_settings_file("device", "hw_delay"))
-            if (hw_delay < 0 or hw_delay > 3000):
-                default_hw_delay = int(mini_defaults.DEFAULT_SETTINGS["device"]["hw_delay"])
-                fop.update_settings_file("device", "hw_delay", default_hw_delay)
-                print(f" Incorrect hw_delay value! {default_hw_delay} (ms) will be used instead.")
-        except:
-            print(f" ERROR in reading hw_delay value from {fop.test_settings_file_name}")
-            hw_delay = 860
-
         # start button pressed
         if(self.continuous_text.get() == 'START'):
-            self.continuousInterval = int(float(self.str_interval.get()) * 1000 - hw_delay)
-            if self.continuousInterval < 100:
-                self.continuousInterval = 100
-            self.continuousCount = 0
-            self.continuousActivated = True
-            self.root.after(self.continuousInterval, self.ContinuousTimeOut)
+            try:
+                interval = float(self.str_interval.get())
+                max_count = int(self.str_max_cnt.get())
+            except ValueError:
+                print(' ERROR: Incorrect interval or max count!')
+                return
+            if not self.callback('gui_connected'):
+                return
+            self.continuousScheduler = mini_scheduler(max(interval, 0.1), max_count)
+            self.continuousScheduler.StartTk(self.root, self.button_read_chs_click, self.ContinuousStopped)
             self.continuous_text.set('STOP')
 
         # stop button pressed
         elif(self.continuous_text.get() == 'STOP'):
-            self.continuousActivated = False
+            if self.continuousScheduler is not None:
+                self.continuousScheduler.Stop()
             self.continuous_text.set('START')
+            self.callback('gui_flush_journal')
 
         else:
             print(' ERROR in activating continuous measurement.')
 
-    # edit : 2024-3-16
-    def ContinuousTimeOut(self):
-        #print(' Time out ')
-        if self.continuousActivated == True:
-            self.button_read_chs_click()
-            self.continuousCount = self.continuousCount + 1
-
-            # all readings are done -> stop
-            if self.continuousCount == int(self.str_max_cnt.get()):
-                self.continuousActivated = False
-                self.continuous_text.set('START')
-
-        if self.continuousActivated == True:
-            self.root.after(self.continuousInterval, self.ContinuousTimeOut)
+    # edit : 2026-10-19
+    # desc : Start or stop the live measurement at the live_interval of the settings.
+    def check_live_view_click(self):
+        if self.live_view.get():
+            interval = fop.read_settings_file('display', 'live_interval') or mini_defaults.DEFAULT_SETTINGS['display']['live_interval']
+            if not self.callback('live_on', interval=interval):
+                self.live_view.set(False)
+        else:
+            self.callback('live_off')
+
+    # edit : 2026-10-19
+    # desc : Start or stop the readings on the external input edges.
+    def external_trigger_click(self):
+        if self.external_trigger.get():
+            if not self.callback('trig_start', mode='timed'):
+                self.external_trigger.set(False)
+        else:
+            self.callback('trig_stop')
+
+    # edit : 2026-10-19
+    # desc : Show the rolling statistics of the channels.
+    def update_timed_stats(self):
+        text = self.callback('gui_timed_stats')
+        if text is not None:
+            self.str_timed_stats.set(text)
+
+    # edit : 2026-10-19
+    # desc : All readings are done.
+    def ContinuousStopped(self):
+        self.continuous_text.set('START')
+        self.callback('gui_flush_journal')
         
-    # edit : 2024-3-10
+    # edit : 2026-10-19
     def save_timed_button_click(self):
         time_stamp = datetime.now()
+        if self.full_spectra.get():
+            default_filename = time_stamp.strftime("spectrogram %Y-%m-%d %H.%M.%S.msz")
+            save_name = filedialog.asksaveasfilename(initialfile=default_filename, filetypes=SAVE_FILE_TYPES)
+            if save_name:
+                self.callback('sg_save', filename=save_name, comment='')
+            return
         default_filename = time_stamp.strftime("timed %Y-%m-%d %H.%M.%S.txt")
-        save_name = filedialog.asksaveasfilename(initialfile=default_filename)
+        save_name = filedialog.asksaveasfilename(initialfile=default_filename, filetypes=SAVE_FILE_TYPES)
         self.callback('gui_save_timed', filename=save_name, comment='')
 
-    # edit : 2024-1-26
+    # edit : 2026-10-19
     def reset_serie_button_click(self):
         try:
+            if self.full_spectra.get():
+                self.callback('sg_clear')
+                return
             self.callback('gui_one_reset')
+            self.update_timed_stats()
         except Exception as e:
             print( ' ERROR in handling "RESET SERIE" button click!')
 
@@ -21,11 +21,38 @@
 import serial
 import random
 import time
+import threading
+import functools
 import mini_file_operations as fop
+from mini_metrics import get_metrics
+
+# edit : 2026-10-19
+# desc : Decorator for methods using the port. Only one thread at a time talks to the
+#        instrument, e.g. the trigger poller and the GUI. Lock is reentrant, so a caller
+#        can hold it over several commands with 'with instrument.port_lock:'.
+#        Duration of each command is collected into the metrics, a command that raised or
+#        returned the error value -1 (or a tuple with -1) is counted as failed.
+def port_locked(method):
+    command = method.__name__
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self.port_lock:
+            result = -1
+            start = time.perf_counter()
+            try:
+                result = method(self, *args, **kwargs)
+                return result
+            finally:
+                metrics = get_metrics()
+                metrics.Observe('mini_spec_serial_seconds', time.perf_counter() - start, command=command)
+                if (isinstance(result, int) and result == -1) or (isinstance(result, tuple) and -1 in result):
+                    metrics.Inc('mini_spec_serial_errors_total', command=command)
+    return locked
 
 class mini_instrument:
 
     myPort = serial.Serial()
+    port_lock = threading.RLock()       # shared like the port
  
     # Constructor
     # edit : 2025-05-27
@@ -47,6 +74,7 @@ class mini_instrument:
 
     # desc : Get comport name from the settings file. Then open the comport. Return True if successful.
     # edit : 2025-05-08
+    @port_locked
     def openPort(self):
         port_opened = False
         try:
@@ -61,6 +89,7 @@ class mini_instrument:
     # ver : 1.4.2022
     # desc : Writes a char to COM port. No check if port is open --> do not call directly
     #        outside of this class.
+    @port_locked
     def writeC(self, c):
         try:
             self.myPort.write(c)
@@ -72,6 +101,7 @@ class mini_instrument:
     # edit : 2025-2-14
     # desc : Return the current hardware firmware version. If version is 'None' it has not been
     #        read-back from the instrument after starting the program. Then read it first. 
+    @port_locked
     def getFirmwareVersion(self):
 
         # if the firmware version has not yet been read back the device
@@ -122,6 +152,7 @@ class mini_instrument:
     #          Notice indexing : channel nr 1 --> data[0][channel_nr = 1, intensity]
     #                            channel nr 288 --> data[287][channel_nr = 288, intensity]
     # 
+    @port_locked
     def getSpectrum(self, output_data):
 
         if (self.myPort.is_open == True):   # isOpen() of pySerial will be depricated
@@ -186,8 +217,10 @@ class mini_instrument:
             # check if all values were received
             if ch_index == channel_count:
                 print(" Ready!")
+                get_metrics().Mark('mini_spec_spectra')
             else:
                 print(" Something went wrong and not all values were received!")
+                get_metrics().Inc('mini_spec_spectrum_incomplete_total')
 
             # clear input buffer
             time.sleep(0.2)
@@ -210,6 +243,7 @@ class mini_instrument:
     # desc   : Get reading of one pre selected channel. 
     #          Sends the channel number (1...288) to instrument just before requesting the reading.
     #          Short sleep values are essential to reliability of the operation.    
+    @port_locked
     def GetFirstChannel(self, ch_number):
 
         delay = 0.05
@@ -245,6 +279,7 @@ class mini_instrument:
     #          micro controller (usually a reference channel value of the same measurement as one 
     #          received by calling getOneChannel method).
     #          Some sleep between the writes is a must.    
+    @port_locked
     def GetAnotherChannel(self, ch_number):
 
         delay = 0.05
@@ -275,6 +310,7 @@ class mini_instrument:
     #          Then send the command 'H' to use the sent value as the new intensity setting.
     #          Finally read the new value sent back by the device.
     # todo   : Use different return values for errors and for not having a read-back value.
+    @port_locked
     def setSourceIntensity(self, intensity):
 
         intensity = int(intensity)
@@ -317,6 +353,7 @@ class mini_instrument:
     # desc : give time in ms units using int type
     #        when ready and tested replace current setIntegrationTime method
     #        Works with firmware version 1.0.1.0 or later
+    @port_locked
     def setIntegrationTime(self, itime):
         try:
             for x in str(itime):
@@ -343,6 +380,7 @@ class mini_instrument:
     # method : blink_LED
     # ver : 5.1.2021
     #
+    @port_locked
     def blink(self,times):
         try:
             for x in str(times):
@@ -358,12 +396,14 @@ class mini_instrument:
         except Exception as x:
             print(x)
 
-    # edit : 2024-3-28
+    # edit : 2026-10-19
     # desc : Ask the current state of the external input pin (RA2).
-    def AskInputState(self):
+    #        wait=0 is used by the trigger poller, readline waits for the answer anyway.
+    @port_locked
+    def AskInputState(self, wait=0.1):
         try:
             self.myPort.write(b'W')
-            time.sleep(0.1)
+            time.sleep(wait)
             line = self.myPort.readline().strip().decode("ascii")   # read the echo 'W' and the state
             #print(line)
             return line
@@ -375,6 +415,7 @@ class mini_instrument:
     # method : clearInputBuffer
     # edit : 2023-5-5
     # desc : Read input buffer untill it is empty, discard all data.
+    @port_locked
     def clearInputBuffer(self):
         try:
             time.sleep(0.5)
@@ -0,0 +1,122 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_journal.py
+# edit : 2026-10-19
+# desc : Journal file for Time Domain rows. Rows are written to disk while the measurement
+#        is running, so an interrupted run can still be loaded with 'ld'.
+#        Journal file has the same format as files of WriteTimedFile, only [end] is missing
+#        until the journal is finalised.
+
+import os
+import time
+import mini_file_operations as fop
+
+class mini_journal:
+
+    # edit : 2026-10-19
+    # desc : Open a new journal file and write the header. Buffered rows are written to disk
+    #        when flush_interval (sec) has passed or buffer has grown over flush_size (bytes).
+    def __init__(self, file_name, ch_count, flush_interval=5.0, flush_size=65536):
+        self.file_name = file_name
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.buffer = []                # formatted lines waiting for the next flush
+        self.buffer_size = 0
+        self.row_count = 0              # rows added into the journal
+        self.last_flush = time.monotonic()
+        self.unsynced = False           # written into the file object but not yet on disk
+
+        self.file = open(file_name, 'x')    # an existing journal is never truncated
+        self.file.write('Time Domain journal\n')   # comment line is replaced when finalised
+        self.file.write(fop.timed_header(ch_count))
+        self.Flush()
+
+    # edit : 2026-10-19
+    # desc : Add one complete row [ch1, ch2, ..., time] into the journal.
+    def AddRow(self, row):
+        line = fop.format_timed_row(row)
+        self.buffer.append(line)
+        self.buffer_size = self.buffer_size + len(line)
+        self.row_count = self.row_count + 1
+        if self.buffer_size >= self.flush_size or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.Flush()
+
+    # edit : 2026-10-19
+    # desc : Flush if flush_interval has passed since the last flush. Called by a timer, so the
+    #        buffered rows reach the disk also when the measurement has stopped or paused.
+    def FlushIfDue(self):
+        if (self.buffer or self.unsynced) and time.monotonic() - self.last_flush >= self.flush_interval:
+            self.Flush()
+
+    # edit : 2026-10-19
+    # desc : Write buffered rows and make sure they are on the disk. On an error the rows are
+    #        kept and the flush is tried again on the next FlushIfDue or Flush.
+    def Flush(self):
+        if self.file is None:
+            return False
+        if self.buffer:
+            try:
+                self.file.write(''.join(self.buffer))
+            except OSError as e:
+                print(f' ERROR in writing the journal {self.file_name}, rows kept for the next flush: {e}')
+                return False
+            self.buffer = []
+            self.buffer_size = 0
+            self.unsynced = True
+        try:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        except OSError as e:
+            print(f' ERROR in writing the journal {self.file_name}, trying again at the next flush: {e}')
+            return False
+        self.unsynced = False
+        self.last_flush = time.monotonic()
+        return True
+
+    # edit : 2026-10-19
+    # desc : Copy the journal into a normal Time Domain file. Rows that are not yet in the
+    #        journal (for example an unfinished last row) are given in pending_rows.
+    #        The journal stays open, measurement can continue after saving.
+    def Finalise(self, file_name, comment='', pending_rows=()):
+        if not self.Flush():
+            print(f' ERROR: journal {self.file_name} is not complete on the disk, {file_name} not saved!')
+            return -1
+        if fop.is_compressed_name(file_name):
+            rows = fop.read_timed_file(self.file_name)
+            if rows == -1:
+                return -1
+            return fop.WriteTimedFile(rows + list(pending_rows), file_name, comment)
+
+        with open(self.file_name, 'r') as journal, open(file_name, 'w') as new_file:
+            journal.readline()          # skip the journal comment line
+            new_file.write(str(comment) + '\n')
+            while True:
+                chunk = journal.read(65536)
+                if not chunk:
+                    break
+                new_file.write(chunk)
+            new_file.writelines(fop.format_timed_row(row) for row in pending_rows)
+            new_file.write('[end]\n')
+        return 1
+
+    # edit : 2026-10-19
+    # desc : Flush and close. Journal file is left on the disk.
+    def Close(self):
+        if self.file is not None:
+            self.Flush()
+            self.file.close()
+            self.file = None
+
+
+# edit : 2026-10-19
+# desc : Start a journal named by the current time in the folder. Two runs can start within
+#        the same second, a number is added to the name instead of overwriting a journal.
+def new_journal(folder, ch_count, flush_interval=5.0):
+    name = time.strftime('journal %Y-%m-%d %H.%M.%S')
+    number = 1
+    while True:
+        suffix = '' if number == 1 else f'-{number}'
+        try:
+            return mini_journal(os.path.join(folder, name + suffix + '.txt'), ch_count, flush_interval)
+        except FileExistsError:
+            number = number + 1
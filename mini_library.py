@@ -0,0 +1,252 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_library.py
+# edit : 2026-10-19
+# desc : Library index of the saved spectra. Path, mtime, content hash, header type, unit,
+#        comment, wavelength range and intensity statistics of every file are kept in a
+#        SQLite database in the spectra folder. Spectrum data is stored also in binary form,
+#        so a found spectrum can be loaded without parsing the text file.
+#        Scan reads only new and changed files.
+
+import os
+import time
+import sqlite3
+import hashlib
+from array import array
+from datetime import datetime
+import mini_file_operations as fop
+
+LIBRARY_FILE_NAME = 'library.sqlite'
+
+class mini_library:
+
+    # edit : 2026-10-19
+    # desc : Open (or create) the library database of the given spectra folder.
+    def __init__(self, folder):
+        self.folder = folder
+        self.db = sqlite3.connect(os.path.join(folder, LIBRARY_FILE_NAME))
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS spectra (
+                path TEXT PRIMARY KEY,
+                mtime REAL,             -- seconds since epoch
+                mtime_ns INTEGER,
+                size INTEGER,
+                hash TEXT,              -- sha1 of the file content
+                header TEXT,            -- [spectrum] or [Time Domain Values]
+                unit TEXT,              -- bits, % or empty
+                comment TEXT,
+                point_count INTEGER,    -- spectrum channels or Time Domain rows
+                wl_min INTEGER,         -- integer affinity, a non-integer wavelength is kept as REAL
+                wl_max INTEGER,
+                int_min REAL,
+                int_max REAL,
+                int_mean REAL,
+                peak_wl INTEGER,        -- wavelength of the highest intensity
+                int_type TEXT,          -- array type code of the intensities, 'q' or 'd'
+                wavelengths BLOB,
+                intensities BLOB,
+                wl_type TEXT            -- array type code of the wavelengths, 'q' or 'd'
+            );
+            CREATE INDEX IF NOT EXISTS spectra_mtime ON spectra (mtime);
+            CREATE INDEX IF NOT EXISTS spectra_unit ON spectra (unit);
+            CREATE INDEX IF NOT EXISTS spectra_int_max ON spectra (int_max);
+        ''')
+        # libraries made before wl_type have integer wavelengths only
+        if 'wl_type' not in [x['name'] for x in self.db.execute('PRAGMA table_info(spectra)')]:
+            self.db.execute("ALTER TABLE spectra ADD COLUMN wl_type TEXT DEFAULT 'q'")
+            self.db.commit()
+        self.last_found = []        # results of the latest Find, used by number in 'lib_load'
+
+    # edit : 2026-10-19
+    def Close(self):
+        self.db.close()
+
+    # edit : 2026-10-19
+    # desc : Update the library with the .txt and .msz files of the folder and its subfolders.
+    #        Unchanged files (same mtime and size) are not read. Removed files are dropped.
+    #        Returns (new or changed, unchanged, removed) counts.
+    def Scan(self):
+        start_time = time.perf_counter()
+        known = {}
+        for row in self.db.execute('SELECT path, mtime_ns, size, hash FROM spectra'):
+            known[row['path']] = (row['mtime_ns'], row['size'], row['hash'])
+
+        changed = 0
+        unchanged = 0
+        seen = set()
+        with self.db:
+            for dir_path, dir_names, file_names in os.walk(self.folder):
+                for name in file_names:
+                    if not name.lower().endswith(('.txt', fop.COMPRESSED_EXTENSION)):
+                        continue
+                    path = os.path.normpath(os.path.join(dir_path, name))
+                    seen.add(path)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    old = known.get(path)
+                    if old is not None and old[0] == stat.st_mtime_ns and old[1] == stat.st_size:
+                        unchanged = unchanged + 1
+                    else:
+                        try:
+                            if self.UpdateFile(path, stat, old):
+                                changed = changed + 1
+                        except (ValueError, TypeError, OverflowError) as e:
+                            print(f' ERROR in adding {path} to the library: {e}')
+
+            removed = [p for p in known if p not in seen]
+            self.db.executemany('DELETE FROM spectra WHERE path = ?', [(p,) for p in removed])
+
+        print(f' Library: {changed} new or changed, {unchanged} unchanged, {len(removed)} removed'
+              f' ({time.perf_counter() - start_time:.2f} s)')
+        return (changed, unchanged, len(removed))
+
+    # edit : 2026-10-19
+    # desc : Read one file and store its information. If only mtime has changed but the content
+    #        hash is the same, only mtime is updated. Returns True if the file was stored.
+    def UpdateFile(self, path, stat, old=None):
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except OSError as e:
+            print(f' ERROR in reading {path}: {e}')
+            return False
+
+        content_hash = hashlib.sha1(content).hexdigest()
+        if old is not None and old[2] == content_hash:
+            self.db.execute('UPDATE spectra SET mtime = ?, mtime_ns = ?, size = ? WHERE path = ?',
+                            (stat.st_mtime, stat.st_mtime_ns, stat.st_size, path))
+            return True
+
+        parsed = fop.parse_data_bytes(content)
+        if parsed == -1 or parsed['header'] is None:
+            return False
+
+        info = {'point_count' : 0, 'wl_min' : None, 'wl_max' : None, 'int_min' : None, 'int_max' : None,
+                'int_mean' : None, 'peak_wl' : None, 'int_type' : None, 'wavelengths' : None, 'intensities' : None,
+                'wl_type' : None}
+
+        if parsed['header'] == '[spectrum]' and parsed['column_count'] == 3:
+            columns = fop.get_columns(parsed, 1, 2)
+            if columns is not None and len(columns[0]) > 0:
+                wavelengths, intensities = columns
+                int_max = max(intensities)
+                int_type = 'q' if isinstance(int_max, int) else 'd'
+                wl_type = 'q' if isinstance(wavelengths[0], int) else 'd'     # column is all int or all float
+                info = {'point_count' : len(wavelengths),
+                        'wl_min' : min(wavelengths),
+                        'wl_max' : max(wavelengths),
+                        'int_min' : min(intensities),
+                        'int_max' : int_max,
+                        'int_mean' : sum(intensities) / len(intensities),
+                        'peak_wl' : wavelengths[intensities.index(int_max)],
+                        'int_type' : int_type,
+                        'wavelengths' : array(wl_type, wavelengths).tobytes(),
+                        'intensities' : array(int_type, intensities).tobytes(),
+                        'wl_type' : wl_type}
+        else:
+            info['point_count'] = parsed['row_count']
+
+        self.db.execute('''INSERT OR REPLACE INTO spectra (path, mtime, mtime_ns, size, hash, header, unit, comment,
+                               point_count, wl_min, wl_max, int_min, int_max, int_mean, peak_wl, int_type,
+                               wavelengths, intensities, wl_type)
+                           VALUES (:path, :mtime, :mtime_ns, :size, :hash,
+                               :header, :unit, :comment, :point_count, :wl_min, :wl_max, :int_min, :int_max,
+                               :int_mean, :peak_wl, :int_type, :wavelengths, :intensities, :wl_type)''',
+                        dict(info, path=path, mtime=stat.st_mtime, mtime_ns=stat.st_mtime_ns, size=stat.st_size,
+                             hash=content_hash, header=parsed['header'], unit=parsed['unit'],
+                             comment=parsed['comment']))
+        return True
+
+    # edit : 2026-10-19
+    # desc : Find files by saving date ('YYYY-MM-DD'), comment text, unit, header type
+    #        and highest intensity range. Returns a list of sqlite3.Row, newest first.
+    def Find(self, date_from=None, date_to=None, comment=None, unit=None, header=None,
+             max_from=None, max_to=None, limit=1000):
+        conditions = []
+        args = []
+        if date_from:
+            conditions.append('mtime >= ?')
+            args.append(datetime.strptime(date_from, '%Y-%m-%d').timestamp())
+        if date_to:
+            conditions.append('mtime < ?')
+            args.append(datetime.strptime(date_to, '%Y-%m-%d').timestamp() + 24 * 3600)
+        if comment:
+            conditions.append('comment LIKE ?')
+            args.append('%' + comment + '%')
+        if unit:
+            conditions.append('unit = ?')
+            args.append(unit)
+        if header:
+            conditions.append('header = ?')
+            args.append(header)
+        if max_from is not None:
+            conditions.append('int_max >= ?')
+            args.append(float(max_from))
+        if max_to is not None:
+            conditions.append('int_max <= ?')
+            args.append(float(max_to))
+
+        query = ('SELECT path, mtime, header, unit, comment, point_count, wl_min, wl_max, int_min, int_max, '
+                 'int_mean, peak_wl FROM spectra')
+        if conditions:
+            query = query + ' WHERE ' + ' AND '.join(conditions)
+        query = query + ' ORDER BY mtime DESC LIMIT ?'
+        args.append(int(limit))
+        self.last_found = self.db.execute(query, args).fetchall()
+        return self.last_found
+
+    # edit : 2026-10-19
+    # desc : Print results of Find with numbers for 'lib_load'.
+    def PrintFound(self):
+        for i, row in enumerate(self.last_found):
+            date = datetime.fromtimestamp(row['mtime']).strftime('%Y-%m-%d %H:%M')
+            if row['header'] == '[spectrum]':
+                print(f' {i+1:4} : {date}  [{row["unit"]}]  max {row["int_max"]:.1f} at {row["peak_wl"]} nm'
+                      f'  "{row["comment"]}"  {row["path"]}')
+            else:
+                print(f' {i+1:4} : {date}  Time Domain, {row["point_count"]} rows  "{row["comment"]}"  {row["path"]}')
+        print(f' {len(self.last_found)} files found.')
+
+    # edit : 2026-10-19
+    # desc : Load a spectrum from the binary copy in the library. The file is indexed again first
+    #        if it has changed. Returns (data, unit) like fop.read_file, -1 as data if not found.
+    def LoadSpectrum(self, path):
+        path = os.path.normpath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            print(f' ERROR: {path} not found!')
+            return -1, ''
+
+        row = self.db.execute('SELECT mtime_ns, size, hash FROM spectra WHERE path = ?', (path,)).fetchone()
+        if row is None or row['mtime_ns'] != stat.st_mtime_ns or row['size'] != stat.st_size:
+            with self.db:
+                if row is None:
+                    self.UpdateFile(path, stat)
+                else:
+                    self.UpdateFile(path, stat, (row['mtime_ns'], row['size'], row['hash']))
+
+        row = self.db.execute('SELECT unit, int_type, wl_type, wavelengths, intensities FROM spectra WHERE path = ?',
+                              (path,)).fetchone()
+        if row is None or row['wavelengths'] is None:
+            print(f' ERROR: {path} is not a spectrum file!')
+            return -1, ''
+
+        wavelengths = array(row['wl_type'] or 'q', row['wavelengths'])
+        intensities = array(row['int_type'], row['intensities'])
+        return list(map(list, zip(wavelengths, intensities))), row['unit']
+
+
+# unit test main
+# edit : 2026-10-19
+#
+if __name__ == '__main__':
+    import sys
+
+    myLibrary = mini_library(sys.argv[1] if len(sys.argv) > 1 else './my_spectra/')
+    myLibrary.Scan()
+    myLibrary.Find(limit=10)
+    myLibrary.PrintFound()
@@ -0,0 +1,111 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_live_spectrum.py
+# edit : 2026-10-19
+# desc : Live view of the latest spectrum in the ABSOLUTE GRAPH. Figure and lines are created
+#        once like in mini_live_view, a new spectrum only replaces the data of the lines and is
+#        drawn with blitting at most max_fps times per second. Optionally the previous
+#        history_count spectra are shown as fading lines. Zoom and pan of the user are kept,
+#        otherwise the view is rescaled when the spectrum goes outside of it.
+
+from collections import deque
+import numpy as np              # installed with matplotlib
+from mini_live_view import mini_live_view
+from mini_renderer import get_renderer
+
+class mini_live_spectrum(mini_live_view):
+
+    # edit : 2026-10-19
+    def __init__(self, figure_name='ABSOLUTE GRAPH', history_count=0, max_fps=20):
+        super().__init__(figure_name, 'wavelength [nm]', 'intensity [bit]', max_fps, 'off')
+        self.history = deque(maxlen=history_count + 1)     # (x, y) of the latest spectra, newest last
+        self.title = ''
+        self.title_text = None          # suptitle artist of the figure
+
+    # edit : 2026-10-19
+    # desc : Number of old spectra shown, the figure is created again if it is open.
+    def SetHistory(self, history_count):
+        self.history = deque(self.history, maxlen=max(int(history_count), 0) + 1)
+        if self.IsOpen():
+            self.Open()
+
+    # edit : 2026-10-19
+    # desc : Create the figure, oldest history line first and the latest spectrum last (on top).
+    def Open(self, labels=None, styles=None):
+        count = self.history.maxlen
+        super().Open([''] * count, ['-'])
+        for i, line in enumerate(self.lines):
+            line.set_color('C0')
+            line.set_alpha((i + 1) / count if i < count - 1 else 1.0)
+            line.set_linewidth(1.0 if i < count - 1 else 1.5)
+        self.title_text = self.figure.suptitle(self.title)
+
+    # edit : 2026-10-19
+    # desc : No legend, the file name is shown as the title.
+    def SetLabels(self, labels):
+        self.labels = list(labels)
+
+    # edit : 2026-10-19
+    def SetTitle(self, title):
+        self.title = title
+        if self.IsOpen() and self.title_text.get_text() != title:
+            self.title_text.set_text(title)
+            self.background = None
+            get_renderer().Draw(self.figure)
+
+    # edit : 2026-10-19
+    def ClearHistory(self):
+        self.history.clear()
+        self.ResetData()
+        if self.IsOpen():
+            for line in self.lines:
+                line.set_data([], [])
+            self.background = None
+            get_renderer().Draw(self.figure)
+
+    # edit : 2026-10-19
+    # desc : Show a new spectrum, data is [[wavelength, intensity], ...].
+    def AddSpectrum(self, data, title=''):
+        if not self.IsOpen():
+            self.Open()
+        self.SetTitle(title)
+        self.history.append((np.array([x[0] for x in data], dtype=float), np.array([x[1] for x in data], dtype=float)))
+        return self.Update(self.history[-1][0], [y for x, y in self.history])
+
+    # edit : 2026-10-19
+    # desc : Lines without a spectrum yet stay empty, newest spectrum is on the last line.
+    def SetLineData(self):
+        offset = len(self.lines) - len(self.history)
+        for i, line in enumerate(self.lines):
+            if i < offset:
+                line.set_data([], [])
+            else:
+                x, y = self.history[i - offset]
+                line.set_data(x, y)
+
+    # edit : 2026-10-19
+    # desc : Spectrum replaces the previous one, so the limits are those of the latest spectrum.
+    #        View is set again only if it was not zoomed or panned by the user and the
+    #        spectrum does not fit into it or uses less than half of its height.
+    #        Returns True if the view was changed.
+    def UpdateLimits(self):
+        if len(self.history) == 0:
+            return False
+        x, y = self.history[-1]
+        if len(x) == 0:
+            return False
+
+        xlim = self.axes.get_xlim()
+        ylim = self.axes.get_ylim()
+        if self.view_limits is not None and self.view_limits != (xlim, ylim):
+            return False        # zoomed or panned by the user
+        x_min, x_max = float(x.min()), float(x.max())
+        y_max = float(y.max())
+        if (self.view_limits is not None and xlim == (x_min, x_max)
+                and min(y.min(), 0.0) >= ylim[0] and 0.5 * ylim[1] <= y_max * 1.1 and y_max <= ylim[1]):
+            return False
+
+        self.axes.set_xlim(x_min, x_max)
+        self.axes.set_ylim(min(float(y.min()), 0.0), max(y_max * 1.1, 1.0))
+        self.view_limits = (self.axes.get_xlim(), self.axes.get_ylim())
+        return True
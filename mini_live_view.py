@@ -0,0 +1,248 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_live_view.py
+# edit : 2026-10-19
+# desc : Live graph of time series. Figure, axes and Line2D artists are created once and
+#        only their data is replaced on update. Lines are redrawn with blitting over a saved
+#        background at most max_fps times per second, updates in between are drawn by a
+#        canvas timer. Axes are rescaled only when new data goes outside the current view
+#        and the view has not been zoomed or panned by the user.
+#        Long series are decimated to the visible x range and the pixel width of the axes,
+#        decimation is done again when the view is zoomed or panned.
+#        Figure is created and fully redrawn through the renderer (mini_renderer).
+
+import time
+import numpy as np              # installed with matplotlib
+from mini_renderer import get_renderer
+from mini_metrics import get_metrics
+from mini_decimate import mini_pyramid, lttb_indexes
+
+MAX_MARKERS = 200               # markers drawn per line, long series get a marker only on every n:th point
+
+class mini_live_view:
+
+    # edit : 2026-10-19
+    # desc : decimation is 'minmax', 'lttb' or 'off'.
+    def __init__(self, figure_name, xlabel='', ylabel='', max_fps=10, decimation='minmax'):
+        self.figure_name = figure_name
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.min_interval = 1.0 / max_fps   # shortest time between two redraws (sec)
+        self.figure = None
+        self.axes = None
+        self.lines = []
+        self.labels = []
+        self.background = None          # saved canvas without the lines, None until the first full draw
+        self.timer = None
+        self.last_draw = 0.0            # time.monotonic() of the latest redraw
+        self.pending = False            # data has been updated but not drawn
+        self.x = None                   # latest data given to Update
+        self.ys = []
+        self.point_count = 0            # points already included in the data limits
+        self.data_limits = None         # [x min, x max, y min, y max] of the data
+        self.view_limits = None         # (xlim, ylim) set by autoscaling, other limits are set by the user
+        self.decimation = decimation
+        self.pyramids = []              # mini_pyramid of each line
+
+    # edit : 2026-10-19
+    def IsOpen(self):
+        return get_renderer().IsOpen(self.figure)
+
+    # edit : 2026-10-19
+    # desc : Create the figure and one line for each label. Styles are matplotlib format strings.
+    def Open(self, labels, styles):
+        self.Close()
+        renderer = get_renderer()
+        self.figure = renderer.Figure(self.figure_name)
+        self.figure.clear()
+        self.axes = self.figure.add_subplot()
+        self.axes.grid(True)
+        self.axes.set_xlabel(self.xlabel)
+        self.axes.set_ylabel(self.ylabel)
+        self.lines = []
+        for i in range(len(labels)):
+            line, = self.axes.plot([], [], styles[i % len(styles)], animated=True)
+            self.lines.append(line)
+        self.SetLabels(labels)
+        self.ResetData()
+        self.background = None
+
+        self.axes.callbacks.connect('xlim_changed', self.OnXlimChanged)
+        canvas = self.figure.canvas
+        canvas.mpl_connect('draw_event', self.OnDraw)
+        canvas.mpl_connect('close_event', self.OnClose)
+        self.timer = canvas.new_timer(interval=int(self.min_interval * 1000))
+        self.timer.add_callback(self.DrawPending)
+        self.timer.start()
+        renderer.Show(self.figure)
+        renderer.Draw(self.figure)
+
+    # edit : 2026-10-19
+    # desc : Set legend texts of the lines.
+    def SetLabels(self, labels):
+        self.labels = list(labels)
+        for line, label in zip(self.lines, self.labels):
+            line.set_label(label)
+        self.axes.legend(handles=self.lines, loc='upper left')    # 'best' would search through all data
+        if self.background is not None:
+            self.background = None
+            get_renderer().Draw(self.figure)
+
+    # edit : 2026-10-19
+    # desc : Next data is a new series, not a continuation of the previous one.
+    def ResetData(self):
+        self.point_count = 0
+        self.data_limits = None
+        self.view_limits = None
+        self.pyramids = [mini_pyramid() for line in self.lines]
+
+    # edit : 2026-10-19
+    # desc : 'minmax', 'lttb' or 'off'
+    def SetDecimation(self, decimation):
+        if decimation not in ('minmax', 'lttb', 'off'):
+            print(f' ERROR: unknown decimation {decimation}, minmax used!')
+            decimation = 'minmax'
+        self.decimation = decimation
+
+    # edit : 2026-10-19
+    def Close(self):
+        if self.timer is not None:
+            self.timer.stop()
+            self.timer = None
+        if self.IsOpen():
+            get_renderer().Close(self.figure)
+        self.figure = None
+        self.lines = []
+
+    # edit : 2026-10-19
+    def OnClose(self, event):
+        if self.timer is not None:
+            self.timer.stop()
+            self.timer = None
+        self.figure = None
+
+    # edit : 2026-10-19
+    # desc : Full redraw of the figure (first draw, resize, zoom, rescale). Background is saved
+    #        for blitting and the animated lines are drawn on top of it.
+    def OnDraw(self, event):
+        canvas = self.figure.canvas
+        if canvas.supports_blit:
+            self.background = canvas.copy_from_bbox(self.figure.bbox)
+        for line in self.lines:
+            self.axes.draw_artist(line)
+
+    # edit : 2026-10-19
+    # desc : Zoom or pan, decimate again for the new x range before the view is drawn.
+    def OnXlimChanged(self, axes):
+        if self.x is not None:
+            self.SetLineData()
+
+    # edit : 2026-10-19
+    # desc : Give the latest data, x is a sequence and ys has one sequence for each line.
+    #        Sequences are used as they are, views of arrays avoid copying.
+    #        Drawing is delayed if the previous redraw was less than 1/max_fps seconds ago.
+    def Update(self, x, ys, force=False):
+        if not self.IsOpen():
+            return False
+        self.x = x
+        self.ys = ys
+        self.pending = True
+        if force or time.monotonic() - self.last_draw >= self.min_interval:
+            self.DrawPending()
+        return True
+
+    # edit : 2026-10-19
+    # desc : Draw the pending update.
+    def DrawPending(self):
+        if not self.pending or not self.IsOpen():
+            return
+        self.pending = False
+        self.last_draw = time.monotonic()
+
+        if self.UpdateLimits():
+            self.background = None      # axes changed, full redraw saves a new background
+        self.SetLineData()
+        canvas = self.figure.canvas
+        if self.background is None or not canvas.supports_blit:
+            get_renderer().Draw(self.figure)
+        else:
+            start = time.perf_counter()
+            canvas.restore_region(self.background)
+            for line in self.lines:
+                self.axes.draw_artist(line)
+            canvas.blit(self.figure.bbox)
+            get_metrics().Observe('mini_spec_render_seconds', time.perf_counter() - start, kind='blit')
+        get_renderer().FlushEvents(self.figure)
+
+    # edit : 2026-10-19
+    # desc : Give the data to the lines. Points of the visible x range are decimated to about
+    #        two points per pixel column, unless decimation is off or x is not increasing.
+    def SetLineData(self):
+        # memoryviews of arrays are given to matplotlib as numpy arrays sharing the memory
+        x = np.asarray(self.x)
+        xlim = self.axes.get_xlim()
+        first = max(int(np.searchsorted(x, xlim[0], 'left')) - 1, 0)
+        last = min(int(np.searchsorted(x, xlim[1], 'right')) + 1, len(x))
+        width = max(int(self.axes.bbox.width), 100)
+
+        for line, y, pyramid in zip(self.lines, self.ys, self.pyramids):
+            y = np.asarray(y)
+            if self.decimation != 'off':
+                pyramid.Update(x, y)
+            if self.decimation == 'off' or not pyramid.monotonic:
+                line.set_data(x, y)
+                line.set_markevery(len(x) // MAX_MARKERS + 1)
+                continue
+            indexes = pyramid.GetIndexes(y, first, last, width)
+            if self.decimation == 'lttb':
+                indexes = lttb_indexes(x, y, indexes, width)
+            line.set_data(x[indexes], y[indexes])
+            line.set_markevery(len(indexes) // MAX_MARKERS + 1)
+
+    # edit : 2026-10-19
+    # desc : Extend the data limits with the new points only. If data went outside the view
+    #        set by the previous autoscale, the view is set again with some room to grow.
+    #        Returns True if the view was changed.
+    def UpdateLimits(self):
+        count = len(self.x)
+        if count == 0:
+            return False
+        if count < self.point_count or self.data_limits is None:
+            # data was cleared or replaced
+            self.point_count = 0
+            self.data_limits = [self.x[0], self.x[0], None, None]
+            self.view_limits = None
+
+        new_x = self.x[self.point_count:]
+        limits = self.data_limits
+        if len(new_x) > 0:
+            limits[0] = min(limits[0], min(new_x))
+            limits[1] = max(limits[1], max(new_x))
+        for y in self.ys:
+            new_y = y[self.point_count:count]
+            if len(new_y) > 0:
+                y_min = min(new_y)
+                y_max = max(new_y)
+                limits[2] = y_min if limits[2] is None else min(limits[2], y_min)
+                limits[3] = y_max if limits[3] is None else max(limits[3], y_max)
+        self.point_count = count
+
+        xlim = self.axes.get_xlim()
+        ylim = self.axes.get_ylim()
+        if self.view_limits is not None and self.view_limits != (xlim, ylim):
+            return False        # zoomed or panned by the user
+        if (self.view_limits is not None and xlim[0] <= limits[0] and limits[1] <= xlim[1]
+                and limits[2] is not None and ylim[0] <= limits[2] and limits[3] <= ylim[1]):
+            return False
+
+        x_span = max(limits[1] - limits[0], 1.0)
+        xlim = (limits[0], limits[1] + 0.25 * x_span)
+        if limits[2] is None:
+            ylim = (0.0, 1.0)
+        else:
+            y_margin = max(0.1 * (limits[3] - limits[2]), 1.0)
+            ylim = (limits[2] - y_margin, limits[3] + y_margin)
+        self.axes.set_xlim(xlim)
+        self.axes.set_ylim(ylim)
+        self.view_limits = (self.axes.get_xlim(), self.axes.get_ylim())
+        return True
@@ -9,36 +9,79 @@
 #        - Change command 'one' to ask a wavelength instead of channel nr.
 #        - Check if port is open before further action.
 
-import matplotlib.pyplot as plt
+import time
+START_TIME = time.perf_counter()        # startup is measured from here, before the other imports
+JOURNAL_TICK = 1000                     # ms between the checks of a due journal flush
+
 import mini_file_operations as fop
 import mini_temp
 from mini_data import mini_data
 from mini_instrument import mini_instrument
 from mini_timed_multi_data import mini_timed_multi_data
+from mini_rolling_stats import parse_windows
+from mini_timed_file import mini_timed_file
+from mini_library import mini_library
+from mini_spectrogram import mini_spectrogram
+from mini_scheduler import mini_scheduler
+from mini_trigger import mini_trigger
+from mini_renderer import get_renderer
+from mini_commands import mini_commands
+from mini_exposure import mini_exposure
+from mini_metrics import get_metrics, label_key
+import mini_shm
 import mini_gui
 from datetime import datetime
-import time
 import threading
+import argparse
+import sys
 import tkinter as tk
 import configparser
 import mini_defaults
+import os
 
 # VERSION
 # UPDATE THE VERSION NUMBER/DATE ONLY HERE
 app_version = "2026-05-14"
 
+# Time Domain files longer than this are loaded as a decimated overview
+TIMED_OVERVIEW_ROWS = 100000
+
 class MainApp:
     
-    # edit 2026-04-10
-    def __init__(self):
+    # edit 2026-10-19
+    # desc : Window is shown first, hardware handshake is done in the background (ConnectInstrument).
+    #        matplotlib is imported when the first graph is drawn.
+    #        headless runs commands of script (or stdin) without the window, see RunHeadless.
+    def __init__(self, headless=False, script=None, draw=False):
         
+        self.startup_times = [('imports', time.perf_counter())]    # (phase, perf_counter) for ReportStartup
         self.myData = mini_data()               # spectrum data
         self.myMultiTimedData = mini_timed_multi_data() # timed data points for default number of channels
+        self.mySpectrogram = mini_spectrogram()         # full spectra time series
         self.myInstrument = mini_instrument()
         self.data = []
         self.continuousActivated = False        # boolean for state of continuous measuring
         self.continuousInterval = 1             # interval of continuous readings in sec
+        self.continuousScheduler = None         # mini_scheduler of 'gui_start_timer'
+        self.liveScheduler = None               # mini_scheduler of the live measurement
+        self.live_pending = False               # live spectrum measured but not yet shown
         self.hw_channel_count = None            # number of channels of the connected instrument (initialized with bad value)
+        self.myLibrary = None                   # library index of my_spectra_folder, opened when first used
+        self.connected = False                  # True when the handshake with the instrument is done
+        self.myTrigger = None                   # mini_trigger of the external input, created when started
+        self.root = None                        # tkinter root, None in headless mode
+        self.gui = None
+        self.myServer = None                    # mini_server for other processes, created when started
+        self.command_lock = threading.Lock()    # headless: script and server commands one at a time
+        self.myShm = None                       # mini_shm block of the latest spectrum, created when started
+        self.spectrum_time = 0.0                # time.time() of the spectrum in memory
+        self.spectrum_state = 0                 # processing state of the spectrum in memory, mini_shm.STATE_*
+        self.myProfiler = None                  # mini_profiler (cProfile, sampling, tracemalloc), created when used
+        self.myExposure = mini_exposure()       # automatic integration time and LED intensity
+        self.integration_time = None            # integration time (ms) set to the instrument, None if not known
+        self.background_auto = False            # background is removed from every measured spectrum
+        self.commands = mini_commands()         # command table of GUI_callback
+        self.RegisterCommands()
 
         # Print Start info
         print("")
@@ -66,78 +109,327 @@ class MainApp:
             self.myData.CALIB[key] = float(self.settings["calibration"][key])
         self.myData.CheckCalib()
 
-        # Connect to the instrument
-        # edit : 2026-04-10
-        # desc : Connect to the instrument. Then 
-        #        1) read back firmware version,
-        #        2) Send LED intensity to the instrument,
-        #        3) Send integration time to the instrument.  
-        # todo : Separate error in returned LED value from old firmware not returning it.
-        self.connected = self.myInstrument.openPort()
-        if self.connected is True:
-
-            # BLINK LED
-            self.myInstrument.blink(2)
-            
-            # INIT FIRMWARE VERSION
-            fw_version = self.myInstrument.getFirmwareVersion()
-            print(" Firmware version : " + fw_version)
-
-            # INIT LED INTENSITY
-            LEDi = int(self.settings.get('measurement', 'hw_source_intensity'))
-            if (LEDi < 0 or LEDi > 31):
-                LEDi = int(mini_defaults.DEFAULT_SETTINGS['measurement']['hw_source_intensity'])
-            new_LEDi = self.myInstrument.setSourceIntensity(LEDi)
-            # requested LED intensity (but not returned because of old fw version or error)
-            if (new_LEDi == -1):
-                print(f' LED intensity : {LEDi}')
-            # returned LED intensity
-            else:
-                print(f' LED intensity : {new_LEDi}')
-
-            # INIT INTEGRATION TIME
-            iTime = int(self.settings.get('measurement','hw_integration_time'))
-            if (iTime < 10 or iTime > 500):
-                iTime = int(mini_defaults.DEFAULT_SETTINGS['measurement']['hw_integration_time'])
-            new_iTime = self.myInstrument.setIntegrationTime(iTime)
-            if(new_iTime != iTime):
-                print(f' ERROR in setting integration time!')
-            else:
-                print(f' Integration time : {new_iTime} ms')
-
-        else:
-            fw_version = 'N.A.'
+        # Timed data with the journal and memory settings
+        # edit : 2026-10-19
+        self.NewTimedData(self.myMultiTimedData.ch_count)
 
         # Other Init
         # edit : 2025-4-20
         fop.create_spectra_folder(fop.read_settings_file("files", "my_spectra_folder"))        # default folder for spectra
         self.hw_channel_count = int(fop.read_settings_file("device", "hw_channel_count"))      # instrument channel count
 
+        if self.settings.get('server', 'autostart') == '1':
+            self.StartServer()
+        if self.settings.get('shm', 'autostart') == '1':
+            self.StartShm()
+        self.background_auto = self.settings.get('background', 'auto') == '1'
+        self.myExposure.LoadSettings(self.settings)
+        self.StartMetrics()
+
+        if headless:
+            self.RunHeadless(script, draw)
+            return
+
         # Start GUI
+        self.startup_times.append(('settings', time.perf_counter()))
         self.root = tk.Tk()
         self.gui = mini_gui.GUI(self.root, self.GUI_callback)
-        self.gui.update_version(app_version, fw_version)
+        self.gui.update_version(app_version, 'connecting...')
+        # graphs in tabs of the window ('tk') or in separate windows ('pyplot')
+        if self.settings.get('display', 'renderer') == 'tk':
+            get_renderer().UseTk(self.root, self.gui.notebook)
         self.root.protocol('WM_DELETE_WINDOW', self.exit_app)
         print(f" Ready!")
         print('')
 
+        self.startup_times.append(('GUI', time.perf_counter()))
+
+        # Connect to the instrument in the background, window is responsive meanwhile
+        threading.Thread(target=self.ConnectInstrument, daemon=True).start()
+
         # Start terminal command thread
         threading.Thread(target=self.terminal_command_loop, daemon=True).start()
         
         # Start the Tkinter event loop (GUI remains active until closed)
+        self.root.after(0, self.ReportStartup)
+        self.root.after(JOURNAL_TICK, self.JournalTick)
         self.root.mainloop()
 
+    # edit : 2026-10-19
+    # desc : Called by the event loop when the window has been shown.
+    def ReportStartup(self):
+        self.startup_times.append(('window', time.perf_counter()))
+        phases = []
+        previous = START_TIME
+        for phase, t in self.startup_times:
+            phases.append(f'{phase} {(t - previous) * 1000:.0f} ms')
+            previous = t
+        print(f' Startup: window in {(previous - START_TIME):.2f} s ({", ".join(phases)})')
+
+    # edit : 2026-10-19
+    # desc : Journal rows are flushed once the flush interval has passed, also when no new rows come.
+    def JournalTick(self):
+        self.myMultiTimedData.FlushJournal(if_due=True)
+        self.root.after(JOURNAL_TICK, self.JournalTick)
+
+    # CONNECT TO THE INSTRUMENT
+    # edit : 2026-10-19
+    # desc : Run in a thread after the window is shown. Connect to the instrument. Then 
+    #        1) read back firmware version,
+    #        2) Send LED intensity to the instrument,
+    #        3) Send integration time to the instrument.  
+    #        Port is kept locked until the handshake is done, instrument commands are refused
+    #        until then (InstrumentReady) instead of waiting for it on the Tk thread.
+    #        Firmware version is shown in the GUI when it is known.
+    # todo : Separate error in returned LED value from old firmware not returning it.
+    def ConnectInstrument(self):
+        start_time = time.perf_counter()
+        with self.myInstrument.port_lock:
+            connected = self.myInstrument.openPort()
+            if connected is True:
+
+                # BLINK LED
+                self.myInstrument.blink(2)
+        
+                # INIT FIRMWARE VERSION
+                fw_version = self.myInstrument.getFirmwareVersion()
+                print(" Firmware version : " + fw_version)
+
+                # INIT LED INTENSITY
+                LEDi = int(self.settings.get('measurement', 'hw_source_intensity'))
+                if (LEDi < 0 or LEDi > 31):
+                    LEDi = int(mini_defaults.DEFAULT_SETTINGS['measurement']['hw_source_intensity'])
+                new_LEDi = self.myInstrument.setSourceIntensity(LEDi)
+                # requested LED intensity (but not returned because of old fw version or error)
+                if (new_LEDi == -1):
+                    print(f' LED intensity : {LEDi}')
+                # returned LED intensity
+                else:
+                    print(f' LED intensity : {new_LEDi}')
+
+                # INIT INTEGRATION TIME
+                iTime = int(self.settings.get('measurement','hw_integration_time'))
+                if (iTime < 10 or iTime > 500):
+                    iTime = int(mini_defaults.DEFAULT_SETTINGS['measurement']['hw_integration_time'])
+                new_iTime = self.myInstrument.setIntegrationTime(iTime)
+                if(new_iTime != iTime):
+                    print(f' ERROR in setting integration time!')
+                else:
+                    print(f' Integration time : {new_iTime} ms')
+                    self.integration_time = new_iTime
+
+            else:
+                fw_version = 'N.A.'
+
+        self.connected = connected
+        print(f' Instrument handshake {time.perf_counter() - start_time:.2f} s')
+        if self.gui is not None:
+            self.root.after(0, lambda: self.gui.update_version(app_version, fw_version))
+
+    # edit : 2026-10-19
+    # desc : Instrument commands are refused until the handshake is done. ConnectInstrument holds
+    #        the port during the handshake, a command waiting for it would freeze the window.
+    def InstrumentReady(self):
+        if self.connected is not True:
+            print(' ERROR: No connection to the instrument!')
+            return False
+        return True
+
        
     
+    # NEW TIMED DATA
+    # edit : 2026-10-19
+    # desc : Create a new timed data object. Rows of a running measurement are journaled into
+    #        subfolder 'journal' of my_spectra_folder, journal_flush_interval 0 disables the journal.
+    #        timed_memory_rows > 0 keeps only the latest rows in memory.
+    #        stats_windows are the windows of the rolling statistics of the channels.
+    def NewTimedData(self, channel_count=3):
+        self.myMultiTimedData.CloseJournal()
+        self.myMultiTimedData.CloseTimedGraph()
+        journal_folder = None
+        try:
+            flush_interval = float(self.settings.get('measurement', 'journal_flush_interval'))
+        except ValueError:
+            flush_interval = float(mini_defaults.DEFAULT_SETTINGS['measurement']['journal_flush_interval'])
+        try:
+            max_rows = int(self.settings.get('measurement', 'timed_memory_rows'))
+        except ValueError:
+            max_rows = mini_defaults.DEFAULT_SETTINGS['measurement']['timed_memory_rows']
+        if flush_interval > 0:
+            journal_folder = os.path.join(self.settings.get('files', 'my_spectra_folder'), 'journal')
+        stats_windows = parse_windows(self.settings.get('measurement', 'stats_windows'))
+        if not stats_windows:
+            stats_windows = parse_windows(mini_defaults.DEFAULT_SETTINGS['measurement']['stats_windows'])
+        self.myMultiTimedData = mini_timed_multi_data(channel_count, journal_folder, flush_interval, max_rows, stats_windows)
+        self.myMultiTimedData.SetDecimation(self.settings.get('display', 'decimation'))
+        self.myMultiTimedData.row_listener = self.PublishTimedRow
+
+    # SPECTRUM LIBRARY
+    # edit : 2026-10-19
+    # desc : Library index is opened when it is used first time.
+    def GetLibrary(self):
+        if self.myLibrary is None:
+            self.myLibrary = mini_library(self.settings.get('files', 'my_spectra_folder'))
+        return self.myLibrary
+
+    # LOCAL SERVER
+    # edit : 2026-10-19
+    # desc : Start the server for other processes, port from the settings if not given.
+    def StartServer(self, port=None):
+        if self.myServer is not None and self.myServer.listener is not None:
+            print(f' Server is already running on port {self.myServer.port}.')
+            return True
+        try:
+            if port is None:
+                port = int(self.settings.get('server', 'port'))
+            queue_size = int(self.settings.get('server', 'queue_size'))
+        except ValueError:
+            port = mini_defaults.DEFAULT_SETTINGS['server']['port']
+            queue_size = mini_defaults.DEFAULT_SETTINGS['server']['queue_size']
+        from mini_server import mini_server
+        self.myServer = mini_server(self.ServerCall, self.ParseCommand, port, queue_size)
+        return self.myServer.Start()
+
+    # edit : 2026-10-19
+    # desc : Run a command from a server client. Called on the client thread, the command is
+    #        run on the tkinter thread like GUI commands and this waits for its result.
+    #        Async commands (ae, lib_scan) run on the client thread and their result is returned.
+    def ServerCall(self, command, kwargs):
+        if self.root is None:
+            with self.command_lock:
+                return self.commands.CallWait(command, **kwargs)
+        if self.commands.IsAsync(command):
+            return self.commands.CallWait(command, **kwargs)
+        done = threading.Event()
+        result = {}
+        def run():
+            try:
+                result['value'] = self.GUI_callback(command, **kwargs)
+            except Exception as e:
+                result['error'] = e
+            finally:
+                done.set()
+        self.root.after(0, run)
+        done.wait()
+        if 'error' in result:
+            raise result['error']
+        return result.get('value')
+
+    # SHARED MEMORY
+    # edit : 2026-10-19
+    # desc : Create the shared memory block of the latest spectrum, name from the settings if not given.
+    def StartShm(self, name=None):
+        if self.myShm is not None:
+            print(f' Shared memory {self.myShm.name} is already in use.')
+            return True
+        if name is None:
+            name = self.settings.get('shm', 'name')
+        try:
+            self.myShm = mini_shm.mini_shm(name, max(self.hw_channel_count, mini_shm.MAX_CHANNELS))
+        except (OSError, ValueError) as e:
+            print(f' ERROR in creating shared memory {name}: {e}')
+            return False
+        print(f' Latest spectrum in shared memory {name}')
+        if len(self.myData.data) > 0:
+            self.myShm.Publish(self.myData.data, self.spectrum_time, self.spectrum_state)
+        return True
+
+    # METRICS
+    # edit : 2026-10-19
+    # desc : Gauges of the app state and the export given in the settings. file_name and
+    #        port override the settings, port 0 and an empty file name are not used.
+    def StartMetrics(self, file_name=None, port=None, interval=None):
+        metrics = get_metrics()
+        metrics.Gauge('mini_spec_missed_samples', self.MissedSamples)
+        metrics.Gauge('mini_spec_queue_depth', self.QueueDepths)
+        metrics.Gauge('mini_spec_server_dropped', lambda: self.myServer.dropped if self.myServer is not None else 0)
+        try:
+            if file_name is None:
+                file_name = self.settings.get('metrics', 'file')
+            if port is None:
+                port = int(self.settings.get('metrics', 'port'))
+            if interval is None:
+                interval = float(self.settings.get('metrics', 'interval'))
+        except ValueError:
+            print(' ERROR in metrics settings, defaults used!')
+            port = mini_defaults.DEFAULT_SETTINGS['metrics']['port']
+            interval = mini_defaults.DEFAULT_SETTINGS['metrics']['interval']
+        ok = True
+        if file_name:
+            ok = metrics.StartFile(file_name, interval)
+        if port:
+            ok = metrics.StartHttp(port) and ok
+        return ok
+
+    # edit : 2026-10-19
+    # desc : Missed deadlines of the schedulers and missed triggers for the metrics.
+    def MissedSamples(self):
+        missed = {}
+        for source, scheduler in (('continuous', self.continuousScheduler), ('live', self.liveScheduler)):
+            if scheduler is not None:
+                missed[label_key({'source': source})] = scheduler.missed
+        if self.myTrigger is not None:
+            missed[label_key({'source': 'trigger'})] = self.myTrigger.missed
+        return missed
+
+    # edit : 2026-10-19
+    # desc : Triggers waiting for acquisition and stream messages waiting for server clients.
+    def QueueDepths(self):
+        depths = {}
+        if self.myTrigger is not None:
+            depths[label_key({'queue': 'trigger'})] = self.myTrigger.queue.qsize()
+        if self.myServer is not None:
+            depths[label_key({'queue': 'server'})] = sum(len(x.stream) for x in list(self.myServer.clients))
+        return depths
+
+    # edit : 2026-10-19
+    # desc : Send the spectrum in memory to the subscribers and into the shared memory block.
+    #        With timestamp it is a new spectrum of the given state, without it the spectrum
+    #        in memory has been processed and state is added to its state.
+    def PublishSpectrum(self, timestamp=None, state=0):
+        if timestamp is not None:
+            self.spectrum_time = timestamp
+            self.spectrum_state = state
+        else:
+            self.spectrum_state = self.spectrum_state | state
+        if self.myShm is not None:
+            self.myShm.Publish(self.myData.data, self.spectrum_time, self.spectrum_state)
+        if self.myServer is not None and self.myServer.Subscribed('spectrum'):
+            self.myServer.Publish('spectrum', {'time': self.spectrum_time, 'state': self.spectrum_state,
+                                               'file': self.myData.data_file_name,
+                                               'wavelengths': [x[0] for x in self.myData.data],
+                                               'intensities': [x[1] for x in self.myData.data]})
+
+    # edit : 2026-10-19
+    # desc : row_listener of the timed data, row is [ch1, ..., chN, time].
+    def PublishTimedRow(self, row):
+        if self.myServer is not None and self.myServer.Subscribed('timed'):
+            self.myServer.Publish('timed', {'row': row, 'wavelengths': list(self.myMultiTimedData.ChWavelength)})
+
     # CLOSE APP
-    # edit : 2024-4-19
+    # edit : 2026-10-19
     def exit_app(self):
         print(' Closing the App, bye!')
-        self.root.destroy()
-
-        #close graphs
+        if self.continuousScheduler is not None:
+            self.continuousScheduler.Stop()
+        if self.myTrigger is not None:
+            self.myTrigger.Stop()
+        if self.liveScheduler is not None:
+            self.liveScheduler.Stop()
+        if self.myServer is not None:
+            self.myServer.Stop()
+        if self.myShm is not None:
+            self.myShm.Close()
+        get_metrics().Stop()
+        self.myMultiTimedData.CloseJournal()
+
+        #close graphs, before the window when they are in its tabs
         self.myMultiTimedData.CloseTimedGraph()
+        self.mySpectrogram.CloseWaterfall()
         self.myData.CloseGraphs()
+        get_renderer().CloseAll()
+        if self.root is not None:
+            self.root.destroy()
 
     # TERMINAL OPERATION
     # edit : 2026-03-28
@@ -151,16 +443,7 @@ class MainApp:
             input_line = input().strip()
             if not input_line:
                 continue
-
-            line_parts = input_line.split()
-            command = line_parts[0]
-            kwargs = {}
-
-            # ARGUMENTS
-            for x in line_parts:
-                if '=' in x:
-                    key, value = x.split('=', 1)
-                    kwargs[key] = value
+            command, kwargs = self.ParseCommand(input_line)
             
             # Dispatch command safely into the tkinter thread
             # after() function expects no argument function --> lambda() function hides the arguments
@@ -169,645 +452,1356 @@ class MainApp:
             # Käytetään oletusarvoja (cmd=command), jotta muuttujat lukittuvat oikein
             self.root.after(0, lambda cmd=command, kw=kwargs: self.GUI_callback(cmd, **kw))
 
-    # Callback message from GUI
-    # edit : 2026-03-27
-    # desc : Read command from inputCommand and possible keyword argument in kwargs
-    def GUI_callback(self, inputCommand, **kwargs):
-            
-        if inputCommand == 'h':
-            print("r : measure new spectrum")
-            print("l : load saved spectrum")
-            print("ld : load Time Domain data")
-            print("s : save spectrum") 
-            print(f"b : remove background ({self.settings.get('files','background_file_name')})")
-            print("a : add to average")
-            print("sa : save average")
-            print("ca : clear average")
-            print("c : CIE coordinates")
-            print("d : remove dc")
-            print("m : find max")
-            print("f : filter")
-            print("p : point to source (continuous)")
-            print(f"n : intensity correction ({self.settings.get('files', 'intensity_calib_file')})")
-            print(f"o : get absorption using reference ({self.settings.get('files', 'zero_reference_file')})")
-            print("g : gain")
-            print("cab : calculate relative absorption")
-            print("sab : save relative absorption")
-            print("one : read one channel")
-            print("int : change source intensity 0...31")
-
-            print("ds : draw spectrum in memory")
-            print("da : draw average in memory")
-            print("dab : draw absorption in memory")
-            print("clg : clear absolute graph")
-            print("clr : clear relative (absorption) graph")
-            print("meas_in_memory : check if there is measurement data in memory")
-            print("abs_in_memory : check if there is absorption data in memory")      
-            # for gui only 'ask_gui'
-            # for gui only 'gui_int'
-            # for gui only 'gui_itime'
-            # for gui only 'gui_sab' instead of 'sab'
-            # for gui only 'gui_first_ch'
-            # for gui only 'gui_another_ch'
-            # for gui only 'gui_one_reset'
-            # for gui only 'gui_timed_ch_count'
-            # for gui only 'gui_draw_timed_graph'
-            # for gui only 'gui_save_timed'
-            # for gui only 'gui_start_timer'
-            # for gui only 'gui_stop_timer'
-            # for gui only 'gui_read_file_header'
-            # 'gui_input_state'
-            print("q : quit")
-        
-        # INTEGRATION TIME W GUI
-        # edit : 2025-4-20
-        elif inputCommand == 'gui_itime':
-            print(' Change integration time')
-            if 'time' in kwargs:
-                itime = kwargs['time']
-
-                # save to file
-                fop.update_settings_file("measurement", "hw_integration_time", itime)
-                                
-                # send to instrument
+    # edit : 2026-10-19
+    # desc : Split a terminal line into the command and its keyword=value arguments.
+    def ParseCommand(self, input_line):
+        line_parts = input_line.split()
+        command = line_parts[0]
+        kwargs = {}
+
+        # ARGUMENTS
+        for x in line_parts:
+            if '=' in x:
+                key, value = x.split('=', 1)
+                kwargs[key] = value
+        return command, kwargs
+
+    # HEADLESS OPERATION
+    # edit : 2026-10-19
+    # desc : Run without the window, for unattended acquisitions. Commands are read from the
+    #        script file or stdin one per line like in the terminal, # starts a comment line.
+    #        Commands are run in order on this thread. Graphs use the Agg backend and are not
+    #        drawn unless draw is True, then 'save_graphs' saves them as png files.
+    #        Commands that need the window (live view, trigger) are not available.
+    def RunHeadless(self, script=None, draw=False):
+        get_renderer().UseAgg(draw)
+        self.commands.Register('wait', self.cmd_wait, {'seconds': float}, required=('seconds',))
+        self.ConnectInstrument()
+
+        source = sys.stdin
+        if script is not None:
+            try:
+                source = open(script)
+            except OSError as e:
+                print(f' ERROR in opening script {script}: {e}')
+                self.exit_app()
+                return
+        print(f' Headless mode, commands from {script if script is not None else "stdin"}')
+        try:
+            for input_line in source:
+                input_line = input_line.strip()
+                if not input_line or input_line.startswith('#'):
+                    continue
+                print(' command: ' + input_line)
+                command, kwargs = self.ParseCommand(input_line)
                 try:
-                    new_itime = self.myInstrument.setIntegrationTime(itime)
-                    if new_itime != itime:
-                        print(" Error in reading back the new integration time value!")
-                    else:         
-                        print(f" Integration time set : {new_itime} ms")
-                except ValueError:
-                    print(" Error : Incorrect integration time!")
+                    with self.command_lock:
+                        # async commands (lib_scan, ae) are finished before the next line is read
+                        self.commands.CallWait(command, **kwargs)
+                        self.myMultiTimedData.FlushJournal(if_due=True)
+                except Exception as e:
+                    print(f' ERROR in command {input_line}: {e}')
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            self.exit_app()
 
-            else:
-                print(" Error : No integration time!")
-
-        # READ FULL SPECTRUM (ALL CHANNELS)
-        # edit : 2023-12-15
-        elif inputCommand == 'r':
-            if(self.myInstrument.getSpectrum(self.myData.data) == 1):
-                self.myData.channelToWavelength()
-                self.myData.data_file_name = ""         # data in memory
-                self.myData.drawLineSpectrum()
-                self.myData.added_to_average = False    # new data
-        
-        # SAVE DATA FROM MEMORY TO FILE
-        # edit : 2023-9-22
-        # desc : Get necessary input arguments in **kwargs
-        elif inputCommand == 's':
-            if 'filename' in kwargs:
-                file_name = kwargs['filename']
-            else:
-                file_name = ''
-            
-            if 'comment' in kwargs:
-                file_comment = kwargs['comment']
-            else:
-                file_comment = ''
-            
-            ret_val = fop.write_file(self.myData.data, file_name, file_comment)
-            
-            # check if successful and return accordingly       
-            if(ret_val == 1):
-                print(" spectrum saved in " + file_name)
-                self.myData.data_file_name = file_name
-                return file_name
-            else:
-                return ''
-            
-        # READ FILE HEADER
-        # edit : 2026-04-12
-        # desc : Use to identify file type before importing its data.
-        #        Return the header, None if missing.
-        elif inputCommand == 'gui_read_file_header':
-            
-            file_name = kwargs.get('filename')     
-            if not file_name:
-                print(f' ERROR: Missing file name!')
-                return None
-            
+    # Callback message from GUI
+    # edit : 2026-10-19
+    # desc : Run command inputCommand with possible keyword arguments in kwargs.
+    #        Commands are in the table of RegisterCommands.
+    def GUI_callback(self, inputCommand, **kwargs):
+        return self.commands.Call(inputCommand, **kwargs)
+
+    # COMMAND TABLE
+    # edit : 2026-10-19
+    # desc : Command, handler, arguments {name: type} and required arguments.
+    #        Terminal arguments are strings, they are converted to the given type.
+    #        is_async commands run on a worker thread and return nothing.
+    def RegisterCommands(self):
+        c = self.commands
+        c.Register('h', self.cmd_h)
+        c.Register('r', self.cmd_r)
+        c.Register('s', self.cmd_s, {'filename': str, 'comment': str})
+        c.Register('l', self.cmd_l, {'filename': str})
+        c.Register('ld', self.cmd_ld, {'filename': str, 'start': float, 'end': float, 'overview': int})
+        c.Register('lib_scan', self.cmd_lib_scan, is_async=True)
+        c.Register('lib_find', self.cmd_lib_find, {'from': str, 'to': str, 'comment': str, 'unit': str,
+                                                   'min': float, 'max': float, 'limit': int})
+        c.Register('lib_load', self.cmd_lib_load, {'n': int, 'filename': str})
+        c.Register('sg', self.cmd_sg)
+        c.Register('sg_trace', self.cmd_sg_trace, {'wl': int, 'from': int, 'to': int, 'filename': str})
+        c.Register('sg_save', self.cmd_sg_save, {'filename': str, 'comment': str})
+        c.Register('sg_load', self.cmd_sg_load, {'filename': str})
+        c.Register('sg_clear', self.cmd_sg_clear)
+        c.Register('b', self.cmd_b)
+        c.Register('bg_auto', self.cmd_bg_auto, {'on': int})
+        c.Register('a', self.cmd_a)
+        c.Register('sa', self.cmd_sa, {'filename': str}, required=('filename',))
+        c.Register('ca', self.cmd_ca)
+        c.Register('c', self.cmd_c)
+        c.Register('d', self.cmd_d)
+        c.Register('f', self.cmd_f)
+        c.Register('p', self.cmd_p)
+        c.Register('n', self.cmd_n)
+        c.Register('o', self.cmd_o)
+        c.Register('cab', self.cmd_cab, {'filename': str})
+        c.Register('sab', self.cmd_sab)
+        c.Register('one', self.cmd_one)
+        c.Register('int', self.cmd_int)
+        c.Register('ae', self.cmd_ae, {'sample': str, 'target': int, 'refresh': int}, is_async=True)
+        c.Register('ae_list', self.cmd_ae_list, {'forget': str})
+        c.Register('g', self.cmd_g)
+        c.Register('ds', self.cmd_ds)
+        c.Register('da', self.cmd_da)
+        c.Register('clg', self.cmd_clg)
+        c.Register('clr', self.cmd_clr)
+        c.Register('render_stats', self.cmd_render_stats)
+        c.Register('live_on', self.cmd_live_on, {'history': int, 'fps': float, 'interval': float})
+        c.Register('live_off', self.cmd_live_off)
+        c.Register('trig_start', self.cmd_trig_start, {'mode': str, 'edge': str})
+        c.Register('trig_stop', self.cmd_trig_stop)
+        c.Register('trig_stats', self.cmd_trig_stats, {'filename': str})
+        c.Register('td_stats', self.cmd_td_stats)
+        c.Register('stats', self.cmd_stats, {'reset': int})
+        c.Register('save_graphs', self.cmd_save_graphs, {'folder': str})
+        c.Register('server_start', self.cmd_server_start, {'port': int})
+        c.Register('server_stop', self.cmd_server_stop)
+        c.Register('server_stats', self.cmd_server_stats)
+        c.Register('shm_start', self.cmd_shm_start, {'name': str})
+        c.Register('shm_stop', self.cmd_shm_stop)
+        c.Register('prof_start', self.cmd_prof_start, {'mode': str, 'interval': float})
+        c.Register('prof_stop', self.cmd_prof_stop, {'filename': str, 'top': int})
+        c.Register('mem_start', self.cmd_mem_start, {'frames': int})
+        c.Register('mem_snap', self.cmd_mem_snap, {'filename': str, 'top': int, 'base': str})
+        c.Register('mem_stop', self.cmd_mem_stop)
+        c.Register('metrics', self.cmd_metrics)
+        c.Register('metrics_start', self.cmd_metrics_start, {'file': str, 'port': int, 'interval': float})
+        c.Register('metrics_stop', self.cmd_metrics_stop)
+        c.Register('q', self.cmd_q)
+
+        # GUI
+        c.Register('gui_itime', self.cmd_gui_itime, {'time': int})
+        c.Register('gui_int', self.cmd_gui_int, {'led_intensity': int})
+        c.Register('gui_read_file_header', self.cmd_gui_read_file_header, {'filename': str})
+        c.Register('gui_sab', self.cmd_gui_sab, {'filename': str}, required=('filename',))
+        c.Register('gui_first_ch', self.cmd_gui_first_ch, {'wavelength': int}, required=('wavelength',))
+        c.Register('gui_another_ch', self.cmd_gui_another_ch, {'wavelength': int, 'index': int},
+                   required=('wavelength', 'index'))
+        c.Register('gui_start_timer', self.cmd_gui_start_timer, {'interval': int}, required=('interval',))
+        c.Register('gui_stop_timer', self.cmd_gui_stop_timer)
+        c.Register('gui_flush_journal', self.cmd_gui_flush_journal)
+        c.Register('gui_save_timed', self.cmd_gui_save_timed, {'filename': str, 'comment': str}, required=('filename',))
+        c.Register('gui_draw_timed_graph', self.cmd_gui_draw_timed_graph)
+        c.Register('gui_timed_stats', self.cmd_gui_timed_stats)
+        c.Register('gui_timed_ch_count', self.cmd_gui_timed_ch_count, {'count': int}, required=('count',))
+        c.Register('gui_timed_add_wavelength', self.cmd_gui_timed_add_wavelength, {'index': int, 'wavelength': str},
+                   required=('index', 'wavelength'))
+        c.Register('gui_one_reset', self.cmd_gui_one_reset)
+        c.Register('ask_meas_file', self.cmd_ask_meas_file)
+        c.Register('ask_ave_count', self.cmd_ask_ave_count)
+        c.Register('gui_input_state', self.cmd_gui_input_state)
+        c.Register('gui_connected', self.cmd_gui_connected)
+        c.Register('meas_in_memory', self.cmd_meas_in_memory)
+        c.Register('abs_in_memory', self.cmd_abs_in_memory)
+
+    # HELP
+    def cmd_h(self, **kwargs):
+        print("r : measure new spectrum")
+        print("l : load saved spectrum")
+        print("ld : load Time Domain data")
+        print("s : save spectrum") 
+        print(f"b : remove background ({self.settings.get('files','background_file_name')})")
+        print("bg_auto : remove background from every measured spectrum (on=1|0, without on= shows the state)")
+        print("a : add to average")
+        print("sa : save average")
+        print("ca : clear average")
+        print("c : CIE coordinates")
+        print("d : remove dc")
+        print("m : find max")
+        print("f : filter")
+        print("p : point to source (continuous)")
+        print(f"n : intensity correction ({self.settings.get('files', 'intensity_calib_file')})")
+        print(f"o : get absorption using reference ({self.settings.get('files', 'zero_reference_file')})")
+        print("g : gain")
+        print("cab : calculate relative absorption")
+        print("sab : save relative absorption")
+        print("one : read one channel")
+        print("int : change source intensity 0...31")
+        print(f"ae : automatic exposure, integration time and LED for the peak at the target"
+              f" (sample=<name> uses and saves the cached result, target=<bits> default {self.settings.get('exposure', 'target')}, refresh=1 ignores the cache)")
+        print("ae_list : cached exposures of the samples (forget=<sample> removes one)")
+
+        print("ds : draw spectrum in memory")
+        print("da : draw average in memory")
+        print("dab : draw absorption in memory")
+        print("clg : clear absolute graph")
+        print("clr : clear relative (absorption) graph")
+        print("meas_in_memory : check if there is measurement data in memory")
+        print("abs_in_memory : check if there is absorption data in memory")      
+        print("lib_scan : update the library index of the spectra folder")
+        print("lib_find : find spectra (from= to= comment= unit= min= max= limit=)")
+        print("lib_load : load a found spectrum (n=<number> or filename=<filename>)")
+        print("sg : measure a full spectrum into the spectrogram")
+        print("sg_trace : draw a trace from the spectrogram (wl=<nm> or from=<nm> to=<nm>, filename= saves it)")
+        print("sg_save : save the spectrogram (filename=<filename> comment=<text>, .msz is compressed)")
+        print("sg_load : load a spectrogram (filename=<filename>)")
+        print("sg_clear : clear the spectrogram")
+        print("render_stats : redraw requests and redraws of the graphs")
+        print("live_on : live spectrum view (history=<count> fps=<max redraws/s> interval=<sec> measures continuously)")
+        print("live_off : stop the live spectrum view")
+        print("trig_start : start acquisitions on the external input edge (mode=timed|spectrum|sg edge=rising|falling|both)")
+        print("trig_stop : stop the external trigger")
+        print("trig_stats : trigger counts and latency (filename=<filename> saves the trigger log)")
+        print(f"td_stats : rolling statistics of Time Domain channels ({self.settings.get('measurement', 'stats_windows')})")
+        print("stats : call counts and latency of the commands (reset=1 clears them)")
+        print("save_graphs : save the open graphs as png files (folder=<folder>, default my_spectra_folder)")
+        print("wait : headless only, wait before the next command (seconds=<sec>)")
+        print(f"server_start : server for other processes on 127.0.0.1 (port=<port>, default {self.settings.get('server', 'port')})")
+        print("server_stop : stop the server")
+        print("server_stats : clients, sent and dropped messages of the server")
+        print(f"shm_start : latest spectrum into shared memory for other processes (name=<name>, default {self.settings.get('shm', 'name')})")
+        print("shm_stop : remove the shared memory block")
+        print("prof_start : start profiling (mode=sample|cprofile interval=<ms> of sampling)")
+        print("prof_stop : stop profiling, save the top functions (filename=<filename> top=<count>)")
+        print("mem_start : start tracing memory allocations (frames=<traceback depth>)")
+        print("mem_snap : memory snapshot, save the sites that grew most (filename=<filename> top=<count> base=previous|first)")
+        print("mem_stop : stop tracing memory allocations")
+        print("metrics : print the metrics (Prometheus text format)")
+        print("metrics_start : export the metrics (file=<filename> interval=<sec> port=<port> of http://127.0.0.1:port/metrics)")
+        print("metrics_stop : stop exporting the metrics")
+        # for gui only 'ask_gui'
+        # for gui only 'gui_int'
+        # for gui only 'gui_itime'
+        # for gui only 'gui_sab' instead of 'sab'
+        # for gui only 'gui_first_ch'
+        # for gui only 'gui_another_ch'
+        # for gui only 'gui_one_reset'
+        # for gui only 'gui_timed_ch_count'
+        # for gui only 'gui_draw_timed_graph'
+        # for gui only 'gui_timed_stats'
+        # for gui only 'gui_save_timed'
+        # for gui only 'gui_start_timer'
+        # for gui only 'gui_stop_timer'
+        # for gui only 'gui_flush_journal'
+        # for gui only 'gui_read_file_header'
+        # for gui only 'gui_connected'
+        # 'gui_input_state'
+        print("q : quit")
+
+    # INTEGRATION TIME W GUI
+    # edit : 2026-10-19
+    def cmd_gui_itime(self, **kwargs):
+        print(' Change integration time')
+        if not self.InstrumentReady():
+            return
+        if 'time' in kwargs:
+            itime = kwargs['time']
+
+            # save to file
+            fop.update_settings_file("measurement", "hw_integration_time", itime)
+
+            # send to instrument
             try:
-                header = fop.read_file_header(file_name)
-            except Exception as e:
-                print(f' ERROR in reading header of file {file_name}: {e}')
-                return None
-            
-            # Return know header
-            if header == '[spectrum]' or header == '[Time Domain Values]':
-                return header
-            else:
-                return None
-                    
-
-        # LOAD FROM FILE
-        # ver 2026-05-12
-        # desc : Use unit info to choose proper draw method. 
-        #        Note! Does not work in VSCode environment.
-        elif inputCommand == 'l':
-           
-            file_name = kwargs.get('filename')     
-            if not file_name:
-                print(f' Missing file name! Correct command: l filename=<filename>')
-                return -1
-            
-            tempData = []
+                new_itime = self.myInstrument.setIntegrationTime(itime)
+                if new_itime != itime:
+                    print(" Error in reading back the new integration time value!")
+                    self.integration_time = None
+                else:         
+                    print(f" Integration time set : {new_itime} ms")
+                    self.integration_time = new_itime
+            except ValueError:
+                print(" Error : Incorrect integration time!")
 
-            # THIS HELPS WITH TERMINAL COMMANDS BUT DOESN'T WORK WITH GUI COMMANDS
-            #folder = self.settings.get('files', 'my_spectra_folder')
-            #file_name = folder + file_name
-            
-            #print(f' Loading from file {file_name}')
-            tempData, unit = fop.read_file(file_name)
- 
-            # NOTE : fop.read_file() returns -1 if file is not found
-                        
-            if tempData != -1: # error in reading file       
-                try:   
-                    # % 
-                    if unit == '%':
-                        self.myData.rel_abs_file_name = file_name
-                        self.myData.rel_absorption = tempData
-                        self.myData.draw_rel_absorption(self.myData.rel_absorption)
-                    # bits 
-                    else:
-                        self.myData.data_file_name = file_name
-                        self.myData.data = tempData
-                        self.myData.drawLineSpectrum()
-
-                    self.myData.added_to_average = False # can be added to average
-
-                    return self.myData.data_file_name
-
-                except TypeError: 
-                    print(" Wrong file type!")
-                    return -1
-        
-        # LOAD TIMED DATA
-        # ver : 2026-04-12
-        # Desc : Load Time Domain data, then tranfer data to object and make draw.
-        elif inputCommand == 'ld':
-            file_name = kwargs.get('filename')
-            if not file_name:
-                print(f' Missing file name! Correct command: ld filename=<filename>')
+        else:
+            print(" Error : No integration time!")
+
+    # READ FULL SPECTRUM (ALL CHANNELS)
+    # edit : 2026-10-19
+    def cmd_r(self, **kwargs):
+        if not self.InstrumentReady():
+            return
+        if(self.myInstrument.getSpectrum(self.myData.data) == 1):
+            self.NewSpectrum(time.time())
+
+    # edit : 2026-10-19
+    # desc : New measured spectrum in myData.data, background, wavelengths, publish and draw.
+    def NewSpectrum(self, timestamp):
+        state = self.AutoBackground()
+        self.myData.channelToWavelength()
+        self.myData.data_file_name = ""         # data in memory
+        self.PublishSpectrum(timestamp, state)
+        self.myData.drawLineSpectrum()
+        self.myData.added_to_average = False    # new data
+
+    # SAVE DATA FROM MEMORY TO FILE
+    # edit : 2023-9-22
+    # desc : Get necessary input arguments in **kwargs
+    def cmd_s(self, **kwargs):
+        if 'filename' in kwargs:
+            file_name = kwargs['filename']
+        else:
+            file_name = ''
+
+        if 'comment' in kwargs:
+            file_comment = kwargs['comment']
+        else:
+            file_comment = ''
+
+        ret_val = fop.write_file(self.myData.data, file_name, file_comment, calib=self.myData.CALIB)
+
+        # check if successful and return accordingly       
+        if(ret_val == 1):
+            print(" spectrum saved in " + file_name)
+            self.myData.data_file_name = file_name
+            return file_name
+        else:
+            return ''
+
+    # READ FILE HEADER
+    # edit : 2026-04-12
+    # desc : Use to identify file type before importing its data.
+    #        Return the header, None if missing.
+    def cmd_gui_read_file_header(self, **kwargs):
+
+        file_name = kwargs.get('filename')     
+        if not file_name:
+            print(f' ERROR: Missing file name!')
+            return None
+
+        try:
+            header = fop.read_file_header(file_name)
+        except Exception as e:
+            print(f' ERROR in reading header of file {file_name}: {e}')
+            return None
+
+        # Return know header
+        if header == '[spectrum]' or header == '[Time Domain Values]' or header == fop.SPECTROGRAM_HEADER:
+            return header
+        else:
+            return None
+
+    # LOAD FROM FILE
+    # ver 2026-05-12
+    # desc : Use unit info to choose proper draw method. 
+    #        Note! Does not work in VSCode environment.
+    def cmd_l(self, **kwargs):
+
+        file_name = kwargs.get('filename')     
+        if not file_name:
+            print(f' Missing file name! Correct command: l filename=<filename>')
+            return -1
+
+        tempData = []
+
+        # THIS HELPS WITH TERMINAL COMMANDS BUT DOESN'T WORK WITH GUI COMMANDS
+        #folder = self.settings.get('files', 'my_spectra_folder')
+        #file_name = folder + file_name
+
+        #print(f' Loading from file {file_name}')
+        tempData, unit = fop.read_file(file_name)
+
+        # NOTE : fop.read_file() returns -1 if file is not found
+
+        if tempData != -1: # error in reading file       
+            try:   
+                # % 
+                if unit == '%':
+                    self.myData.rel_abs_file_name = file_name
+                    self.myData.rel_absorption = tempData
+                    self.myData.draw_rel_absorption(self.myData.rel_absorption)
+                # bits 
+                else:
+                    self.myData.data_file_name = file_name
+                    self.myData.data = tempData
+                    self.PublishSpectrum(time.time(), mini_shm.STATE_LOADED)
+                    self.myData.drawLineSpectrum()
+
+                self.myData.added_to_average = False # can be added to average
+
+                return self.myData.data_file_name
+
+            except TypeError: 
+                print(" Wrong file type!")
                 return -1
-            try:
+
+    # LOAD TIMED DATA
+    # ver : 2026-10-19
+    # Desc : Load Time Domain data, then tranfer data to object and make draw.
+    #        Optional arguments start=<s> end=<s> load only a time range. Files longer than
+    #        overview=<rows> (default TIMED_OVERVIEW_ROWS) are loaded as a decimated overview.
+    def cmd_ld(self, **kwargs):
+        file_name = kwargs.get('filename')
+        if not file_name:
+            print(f' Missing file name! Correct command: ld filename=<filename>')
+            return -1
+        try:
+            # compressed files are always read as whole
+            if fop.is_compressed_name(file_name):
                 tempData = fop.read_timed_file(file_name)
-                if tempData != -1:
-                    self.myMultiTimedData.ImportLoadData(tempData)
-                    try:
-                        self.myMultiTimedData.DrawTimedGraph()
-                    except TypeError as e:
-                        print(f' ERROR in drawing loaded TimeD data!')
-                        print(f'{e}')
-
-                    return file_name
-                
-            except TypeError:
-                print(f' ERROR in loading Time Domain Data from file {file_name}')
+                if tempData == -1:
+                    return -1
+                ch_count = len(tempData[0]) - 1 if len(tempData) > 0 else self.myMultiTimedData.ch_count
+                if ch_count != self.myMultiTimedData.ch_count:
+                    self.NewTimedData(ch_count)
+                self.myMultiTimedData.ImportLoadData(tempData)
+                self.myMultiTimedData.DrawTimedGraph()
+                return file_name
+
+            print(f' Reading {file_name}...')
+            timed_file = mini_timed_file(file_name)
+            if not timed_file.Open():
+                print(f' ERROR: {file_name} is not a Time Domain file!')
                 return -1
-            
-        # REMOVE BACKGROUND
-        # ver : 2026-03-28
-        elif inputCommand == 'b':
-            self.myData.removeBackground(self.settings.get('files', 'background_file_name'))
-            self.myData.drawLineSpectrum()
 
-        # ADD A SPECTRUM TO AVERAGE
-        # ver 2023-12-15
-        elif inputCommand == 'a':
-            print("Add to average")
-            if (self.myData.added_to_average == False):
-                self.myData.addSpectrumToAverage()
-                print(" Average contains now " + str(self.myData.ave_size) + " spectrums.")
-                self.myData.drawLineAverage()
+            max_rows = int(kwargs.get('overview', TIMED_OVERVIEW_ROWS))
+            if 'start' in kwargs or 'end' in kwargs:
+                tempData = timed_file.GetRows(float(kwargs.get('start', '-inf')), float(kwargs.get('end', 'inf')))
+            elif timed_file.RowCount() > max_rows:
+                tempData = timed_file.GetOverview(max_rows)
+                print(f' Long file, every {timed_file.RowCount() // len(tempData)}. row loaded ({len(tempData)} of {timed_file.RowCount()}).')
+                print(f' Use ld filename=<filename> start=<s> end=<s> to load a time range.')
             else:
-                print(" Can't be added multiple times")
-
-        # SAVE AVERAGE
-        # edit : 2023-9-29
-        # desc : This version is to be used with GUI
-        #        The filename is delivered in arguments instead of terminal input.
-        elif inputCommand == 'sa':
-            print("Saving average of " + str(self.myData.ave_size) + ":")
-            #file_name = input("file name (empty for date-time name)?:")
-            file_name = kwargs['filename']
-            # if(len(file_name) != 0):
-            #     file_name = settings.my_spectra_folder + file_name
-            # else:
-            #     time_stamp = datetime.now()
-            #     file_name = settings.my_spectra_folder + time_stamp.strftime("%Y-%m-%d %H.%M.%S.txt")
-            # file_comment = input("add comment ?: ")
-            # if len(file_comment) == 0:
-            #     file_comment = 'average'
-
-            file_comment = 'This is average!'
-            ret_val = fop.write_file(self.myData.average, file_name, file_comment)
-            
-            # check if successful        
-            if(ret_val == 1):
-                print(" average spectrum saved in " + file_name)
-    
-        # CLEAR AVERAGE - remove spectrums from average array and reset average counter
-        # ver 2023-9-22
-        elif inputCommand == 'ca':
-            #print("Clear average, contains " + str(self.myData.ave_size) + " spectrums?")
-            #answer = input("Y/N:")
-            #if(answer == "Y" or answer == 'y'):
-                self.myData.average = []
-                self.myData.ave_size = 0
-                print(" Average cleared!")
-        
-        # CALCULATE CIE TRISTIMULUS VALUES X, Y AND Z
-        elif inputCommand == 'c':
-
-            # NEW METHOD 9.10.2020
-            XYZ = color.calc_XYZ_coords(self.myData.data)
-            print(" TRISTIMULUS VALUES :")
-            print(" X = %.2f" %XYZ[0])
-            print(" Y = %.2f" %XYZ[1])
-            print(" Z = %.2f" %XYZ[2])
-
-        # REMOVE DC
-        # edit : 2025-08-06
-        elif inputCommand == 'd':
-            self.myData.remove_any_dc(self.myData.data, self.myData.estimate_any_dc(self.myData.data))
-            self.myData.drawLineSpectrum()
-
-        # elif inputCommand == 'm':
-        #     print(' Max intensity at wavelength : %.2i nm' %mini_temp.find_maximum_l(self.myData.data))
-        #     print(' Temp = %.3f K' %mini_temp.get_bb_temp(self.myData.data))
+                tempData = timed_file.ReadRows(0, timed_file.RowCount())
 
-        elif inputCommand == 'f':
-            print(' low-pass filtration done')
-            self.myData.data = mini_temp.lowpass_filter(self.myData.data)
+            if timed_file.ch_count != self.myMultiTimedData.ch_count:
+                self.NewTimedData(timed_file.ch_count)
+            self.myMultiTimedData.ImportLoadData(tempData)
+            try:
+                self.myMultiTimedData.DrawTimedGraph()
+            except TypeError as e:
+                print(f' ERROR in drawing loaded TimeD data!')
+                print(f'{e}')
+
+            return file_name
+
+        except (TypeError, ValueError, OSError) as e:
+            print(f' ERROR in loading Time Domain Data from file {file_name}: {e}')
+            return -1
+
+    # UPDATE SPECTRUM LIBRARY
+    # edit : 2026-10-19
+    # desc : Index new and changed files of my_spectra_folder. Run on a worker thread with
+    #        its own connection, a SQLite connection can not be shared between threads.
+    def cmd_lib_scan(self, **kwargs):
+        library = mini_library(self.settings.get('files', 'my_spectra_folder'))
+        try:
+            library.Scan()
+        finally:
+            library.Close()
+
+    # FIND FROM SPECTRUM LIBRARY
+    # edit : 2026-10-19
+    # desc : Dates as YYYY-MM-DD, min and max limit the highest intensity of the spectrum.
+    #        Returns the number of found files.
+    def cmd_lib_find(self, **kwargs):
+        try:
+            found = self.GetLibrary().Find(date_from=kwargs.get('from'), date_to=kwargs.get('to'),
+                                           comment=kwargs.get('comment'), unit=kwargs.get('unit'),
+                                           max_from=kwargs.get('min'), max_to=kwargs.get('max'),
+                                           limit=kwargs.get('limit', 1000))
+            self.myLibrary.PrintFound()
+            return len(found)
+        except ValueError as e:
+            print(f' ERROR in library search: {e}')
+            return 0
+
+    # LOAD FROM SPECTRUM LIBRARY
+    # edit : 2026-10-19
+    # desc : Load a spectrum by its number in the latest lib_find result or by file name.
+    def cmd_lib_load(self, **kwargs):
+        library = self.GetLibrary()
+        file_name = kwargs.get('filename')
+        try:
+            if file_name is None:
+                file_name = library.last_found[int(kwargs['n']) - 1]['path']
+        except (KeyError, ValueError, IndexError):
+            print(f' Correct command: lib_load n=<number in lib_find results> or lib_load filename=<filename>')
+            return -1
+
+        tempData, unit = library.LoadSpectrum(file_name)
+        if tempData == -1:
+            return -1
+        if unit == '%':
+            self.myData.rel_abs_file_name = file_name
+            self.myData.rel_absorption = tempData
+            self.myData.draw_rel_absorption(self.myData.rel_absorption)
+        else:
+            self.myData.data_file_name = file_name
+            self.myData.data = tempData
+            self.PublishSpectrum(time.time(), mini_shm.STATE_LOADED)
             self.myData.drawLineSpectrum()
-
-        # NOT USED WITH GUI, NOT UP-TO-DATE
-        # CONTINUOUSLY ONE CHANNEL ONCE PER SEC
-        # edit : 2023-12-15
-        # TODO : Condsider combining 'one' with 'p'
-        elif inputCommand == 'p':
-            wave_length = input('Give a wave length:')
-            ch_number = self.myData.waveLengthToChannel(int(wave_length))
-            
-            if(ch_number < 1):
-                print(' ' + wave_length + ' nm is too SHORT a wave length for the hardware.')
-
-            elif (ch_number > self.hw_channel_count):
-                print(' ' + wave_length + ' nm is too LONG a wave length for the hardware.')
-            
+        self.myData.added_to_average = False
+        return file_name
+
+    # MEASURE SPECTRUM INTO SPECTROGRAM
+    # edit : 2026-10-19
+    # desc : Full spectrum is measured and added as a new row of the spectrogram.
+    #        Measured spectrum is also in myData.data like after 'r'.
+    def cmd_sg(self, **kwargs):
+        if not self.InstrumentReady() or self.myInstrument.getSpectrum(self.myData.data) != 1:
+            return -1
+        timestamp = time.time()
+        state = self.AutoBackground()
+        self.myData.channelToWavelength()
+        self.myData.data_file_name = ""         # data in memory
+        self.myData.added_to_average = False    # new data
+        row_count = self.mySpectrogram.AddSpectrum(self.myData.data, timestamp)
+        self.PublishSpectrum(timestamp, state)
+        self.mySpectrogram.DrawWaterfall()
+        return row_count
+
+    # TRACE FROM SPECTROGRAM
+    # edit : 2026-10-19
+    # desc : Intensity of one wavelength (wl=) or mean of a band (from= to=) in all spectra.
+    #        Trace is saved as a one channel Time Domain file if filename is given.
+    def cmd_sg_trace(self, **kwargs):
+        if self.mySpectrogram.row_count == 0:
+            print(' ERROR: Spectrogram is empty!')
+            return -1
+        try:
+            if 'wl' in kwargs:
+                wavelength = int(kwargs['wl'])
+                ch_i = self.mySpectrogram.GetChannelIndex(wavelength)
+                trace = self.mySpectrogram.GetColumnView(ch_i)
+                label = f'{self.mySpectrogram.wavelengths[ch_i]} nm'
             else:
-                print(' Starting continuous mode. Press Ctrl+C to end. ')
-                try:
-                    while True:
-                        (ch_nr, ch_val) = self.myInstrument.getOneChannel(self.myData.waveLengthToChannel(int(wave_length)))
-                        time.sleep(0.8)
-                except KeyboardInterrupt:
-                    print("Stopped!")
-                self.myInstrument.clearInputBuffer()
-
-
-        # INTENSITY CORRECTION, NOT USED WITH GUI, NOT UP-TO-DATE
-        # ver 11.5.2022
-        # TODO : Use estimate_dc to check if there is a significant dc-value,
-        #        then remove it automatically before int_calibration and
-        #        return it afterwards, info user.
-        #
-
-        elif inputCommand == 'n':
-            calib_file = settings.my_spectra_folder + settings.intensity_calib_file
-
-            ref_wavelength = (int)(input("Give the reference wavelength (nm)!"))
-            if ref_wavelength < 320 or ref_wavelength > 880:
-                print("That is outside of the range, let's use the HIGHEST POINT.")
-                ref_wavelength = 0
-        
+                wl_from = int(kwargs['from'])
+                wl_to = int(kwargs['to'])
+                trace = self.mySpectrogram.GetBandTrace(wl_from, wl_to)
+                label = f'{wl_from}...{wl_to} nm'
+        except (KeyError, ValueError):
+            print(' Correct command: sg_trace wl=<nm> or sg_trace from=<nm> to=<nm>')
+            return -1
+
+        self.mySpectrogram.DrawTrace(trace, label)
+        if 'filename' in kwargs:
+            fop.WriteTimedFile(list(map(list, zip(trace, self.mySpectrogram.GetTimeView()))),
+                               kwargs['filename'], label)
+        return len(trace)
+
+    # SAVE SPECTROGRAM
+    # edit : 2026-10-19
+    def cmd_sg_save(self, **kwargs):
+        file_name = kwargs.get('filename')
+        if not file_name:
+            print(f' Missing file name! Correct command: sg_save filename=<filename>')
+            return -1
+        try:
+            return self.mySpectrogram.SaveSpectrogram(file_name, kwargs.get('comment', ''))
+        except OSError as e:
+            print(f' ERROR in saving spectrogram: {e}')
+            return -1
+
+    # LOAD SPECTROGRAM
+    # edit : 2026-10-19
+    def cmd_sg_load(self, **kwargs):
+        file_name = kwargs.get('filename')
+        if not file_name:
+            print(f' Missing file name! Correct command: sg_load filename=<filename>')
+            return -1
+        row_count = self.mySpectrogram.LoadSpectrogram(file_name)
+        if row_count > 0:
+            self.mySpectrogram.DrawWaterfall(True)
+            return file_name
+        return -1
+
+    # CLEAR SPECTROGRAM
+    # edit : 2026-10-19
+    def cmd_sg_clear(self, **kwargs):
+        self.mySpectrogram.CloseWaterfall()
+        self.mySpectrogram.ClearSpectrogram()
+
+    # REMOVE BACKGROUND
+    # ver : 2026-03-28
+    def cmd_b(self, **kwargs):
+        if self.myData.removeBackground(self.settings.get('files', 'background_file_name'), *self.BackgroundTimes()) == 1:
+            self.PublishSpectrum(state=mini_shm.STATE_BACKGROUND)
+        self.myData.drawLineSpectrum()
+
+    # edit : 2026-10-19
+    # desc : (integration time of the spectrum, integration time of the background file) in ms,
+    #        background is scaled when both are known.
+    def BackgroundTimes(self):
+        try:
+            bg_itime = float(self.settings.get('background', 'itime'))
+        except ValueError:
+            bg_itime = 0
+        return self.integration_time, bg_itime
+
+    # edit : 2026-10-19
+    # desc : Remove the background from a new spectrum in auto mode. Returns the state bit for PublishSpectrum.
+    def AutoBackground(self):
+        if self.background_auto:
+            if self.myData.removeBackground(self.settings.get('files', 'background_file_name'), *self.BackgroundTimes()) == 1:
+                return mini_shm.STATE_BACKGROUND
+        return 0
+
+    # AUTOMATIC BACKGROUND REMOVAL
+    # edit : 2026-10-19
+    def cmd_bg_auto(self, **kwargs):
+        if 'on' in kwargs:
+            self.background_auto = kwargs['on'] == 1
+        print(f" Automatic background removal {'on' if self.background_auto else 'off'}"
+              f" ({self.settings.get('files', 'background_file_name')})")
+        self.myData.background_cache.PrintStats()
+        return self.background_auto
+
+    # ADD A SPECTRUM TO AVERAGE
+    # ver 2023-12-15
+    def cmd_a(self, **kwargs):
+        print("Add to average")
+        if (self.myData.added_to_average == False):
+            self.myData.addSpectrumToAverage()
+            print(" Average contains now " + str(self.myData.ave_size) + " spectrums.")
+            self.myData.drawLineAverage()
+        else:
+            print(" Can't be added multiple times")
+
+    # SAVE AVERAGE
+    # edit : 2023-9-29
+    # desc : This version is to be used with GUI
+    #        The filename is delivered in arguments instead of terminal input.
+    def cmd_sa(self, **kwargs):
+        print("Saving average of " + str(self.myData.ave_size) + ":")
+        #file_name = input("file name (empty for date-time name)?:")
+        file_name = kwargs['filename']
+        # if(len(file_name) != 0):
+        #     file_name = settings.my_spectra_folder + file_name
+        # else:
+        #     time_stamp = datetime.now()
+        #     file_name = settings.my_spectra_folder + time_stamp.strftime("%Y-%m-%d %H.%M.%S.txt")
+        # file_comment = input("add comment ?: ")
+        # if len(file_comment) == 0:
+        #     file_comment = 'average'
+
+        file_comment = 'This is average!'
+        ret_val = fop.write_file(self.myData.average, file_name, file_comment, calib=self.myData.CALIB)
+
+        # check if successful        
+        if(ret_val == 1):
+            print(" average spectrum saved in " + file_name)
+
+    # CLEAR AVERAGE - remove spectrums from average array and reset average counter
+    # ver 2023-9-22
+    def cmd_ca(self, **kwargs):
+        #print("Clear average, contains " + str(self.myData.ave_size) + " spectrums?")
+        #answer = input("Y/N:")
+        #if(answer == "Y" or answer == 'y'):
+            self.myData.average = []
+            self.myData.ave_size = 0
+            print(" Average cleared!")
+
+    # CALCULATE CIE TRISTIMULUS VALUES X, Y AND Z
+    def cmd_c(self, **kwargs):
+
+        # NEW METHOD 9.10.2020
+        XYZ = color.calc_XYZ_coords(self.myData.data)
+        print(" TRISTIMULUS VALUES :")
+        print(" X = %.2f" %XYZ[0])
+        print(" Y = %.2f" %XYZ[1])
+        print(" Z = %.2f" %XYZ[2])
+
+    # REMOVE DC
+    # edit : 2025-08-06
+    def cmd_d(self, **kwargs):
+        self.myData.remove_any_dc(self.myData.data, self.myData.estimate_any_dc(self.myData.data))
+        self.PublishSpectrum(state=mini_shm.STATE_DC)
+        self.myData.drawLineSpectrum()
+
+    # def cmd_m(self, **kwargs):
+    #     print(' Max intensity at wavelength : %.2i nm' %mini_temp.find_maximum_l(self.myData.data))
+    #     print(' Temp = %.3f K' %mini_temp.get_bb_temp(self.myData.data))
+
+    def cmd_f(self, **kwargs):
+        print(' low-pass filtration done')
+        self.myData.data = mini_temp.lowpass_filter(self.myData.data)
+        self.PublishSpectrum(state=mini_shm.STATE_FILTERED)
+        self.myData.drawLineSpectrum()
+
+    # NOT USED WITH GUI, NOT UP-TO-DATE
+    # CONTINUOUSLY ONE CHANNEL ONCE PER SEC
+    # edit : 2023-12-15
+    # TODO : Condsider combining 'one' with 'p'
+    def cmd_p(self, **kwargs):
+        if not self.InstrumentReady():
+            return
+        wave_length = input('Give a wave length:')
+        ch_number = self.myData.waveLengthToChannel(int(wave_length))
+
+        if(ch_number < 1):
+            print(' ' + wave_length + ' nm is too SHORT a wave length for the hardware.')
+
+        elif (ch_number > self.hw_channel_count):
+            print(' ' + wave_length + ' nm is too LONG a wave length for the hardware.')
+
+        else:
+            print(' Starting continuous mode. Press Ctrl+C to end. ')
             try:
-                self.myData.loadIntCalib(calib_file)
-                self.myData.intCorrect(ref_wavelength)
-                self.myData.drawLineSpectrum()
-            except FileNotFoundError:
-                print("File " + calib_file + " was not found!")
-
-        # ABSORPTION SPECTRUM
-        # ver 10.9.2020
-        # 
-        elif inputCommand == 'o':
-            print("Reading zero reference file...")
-            self.myData.get_absorption() 
-            self.myData.drawLineAbsorption()
-        
-        # CALC RELATIVE ABSORPTION
-        # edit : 2025-4-25
-        # Compare to zero_reference data
-        elif inputCommand == 'cab':
-            print(" Calculating relative absorption... ")
-            if 'filename' in kwargs:
-                file_name = kwargs['filename']
-                print(" Zero reference file: " + file_name)
-                retval = self.myData.get_rel_abs_from_file(file_name)
-                if retval == 1:
-                    self.myData.draw_rel_absorption(self.myData.rel_absorption)
-            else:
-                print(" No zero reference file defined! ")
-                # print(" Default zero reference file (see mini_settings.py)")
-                # if(self.myData.get_rel_abs() != -1): # default file found
-                #     self.myData.draw_rel_absorption(self.myData.rel_absorption)
-
-        # SAVE RELATIVE ABSORPTION
-        # edit: 2026-05-13
-        elif inputCommand == 'sab':
-            ret_val = 0
-            
-            file_name = input("file name (empty for date-time name)?:")
-            if(len(file_name) != 0):
-                file_name = self.settings.get('files','my_spectra_folder') + file_name
-            else:
-                time_stamp = datetime.now()
-                file_name = self.settings.get('files', 'my_spectra_folder') + time_stamp.strftime("%Y-%m-%d %H.%M.%S.txt")
-            file_comment = input("add comment ?: ")
-            if len(file_comment) == 0:
-                file_comment = 'Relative absorption'
-            if(len(self.myData.rel_absorption) > 1):
-                ret_val = fop.write_file(self.myData.rel_absorption, file_name, file_comment, '[%]')
-            
-            # check if successful        
-            if(ret_val == 1):
-                print(" absorption saved in " + file_name)
-                self.myData.rel_abs_file_name = file_name
-                if self.myData.is_rel_abs_graph_open():
-                    self.myData.draw_rel_absorption(self.myData.rel_absorption)
+                while True:
+                    (ch_nr, ch_val) = self.myInstrument.getOneChannel(self.myData.waveLengthToChannel(int(wave_length)))
+                    time.sleep(0.8)
+            except KeyboardInterrupt:
+                print("Stopped!")
+            self.myInstrument.clearInputBuffer()
+
+    # INTENSITY CORRECTION, NOT USED WITH GUI, NOT UP-TO-DATE
+    # ver 11.5.2022
+    # TODO : Use estimate_dc to check if there is a significant dc-value,
+    #        then remove it automatically before int_calibration and
+    #        return it afterwards, info user.
+    #
+    def cmd_n(self, **kwargs):
+        calib_file = settings.my_spectra_folder + settings.intensity_calib_file
+
+        ref_wavelength = (int)(input("Give the reference wavelength (nm)!"))
+        if ref_wavelength < 320 or ref_wavelength > 880:
+            print("That is outside of the range, let's use the HIGHEST POINT.")
+            ref_wavelength = 0
 
-        # SAVE RELATIVE ABSORPTION - GUI VERSION
-        # edit 2026-05-13
-        # desc : give file name in input parameters ('gui_sab', filename='xxxx')
-        elif inputCommand == 'gui_sab':
+        try:
+            self.myData.loadIntCalib(calib_file)
+            self.myData.intCorrect(ref_wavelength)
+            self.PublishSpectrum(state=mini_shm.STATE_INT_CORRECTED)
+            self.myData.drawLineSpectrum()
+        except FileNotFoundError:
+            print("File " + calib_file + " was not found!")
+
+    # ABSORPTION SPECTRUM
+    # ver 10.9.2020
+    # 
+    def cmd_o(self, **kwargs):
+        print("Reading zero reference file...")
+        self.myData.get_absorption() 
+        self.myData.drawLineAbsorption()
+
+    # CALC RELATIVE ABSORPTION
+    # edit : 2025-4-25
+    # Compare to zero_reference data
+    def cmd_cab(self, **kwargs):
+        print(" Calculating relative absorption... ")
+        if 'filename' in kwargs:
             file_name = kwargs['filename']
+            print(" Zero reference file: " + file_name)
+            retval = self.myData.get_rel_abs_from_file(file_name)
+            if retval == 1:
+                self.myData.draw_rel_absorption(self.myData.rel_absorption)
+        else:
+            print(" No zero reference file defined! ")
+            # print(" Default zero reference file (see mini_settings.py)")
+            # if(self.myData.get_rel_abs() != -1): # default file found
+            #     self.myData.draw_rel_absorption(self.myData.rel_absorption)
+
+    # SAVE RELATIVE ABSORPTION
+    # edit: 2026-05-13
+    def cmd_sab(self, **kwargs):
+        ret_val = 0
+
+        file_name = input("file name (empty for date-time name)?:")
+        if(len(file_name) != 0):
+            file_name = self.settings.get('files','my_spectra_folder') + file_name
+        else:
+            time_stamp = datetime.now()
+            file_name = self.settings.get('files', 'my_spectra_folder') + time_stamp.strftime("%Y-%m-%d %H.%M.%S.txt")
+        file_comment = input("add comment ?: ")
+        if len(file_comment) == 0:
             file_comment = 'Relative absorption'
-            ret_val = 0
-            if(len(self.myData.rel_absorption) > 1):
-                ret_val = fop.write_file(self.myData.rel_absorption, file_name, file_comment, '[%]')
-            else:
-                print(' Error: No absorption data to save!')
+        if(len(self.myData.rel_absorption) > 1):
+            ret_val = fop.write_file(self.myData.rel_absorption, file_name, file_comment, '[%]', self.myData.CALIB)
+
+        # check if successful        
+        if(ret_val == 1):
+            print(" absorption saved in " + file_name)
+            self.myData.rel_abs_file_name = file_name
+            if self.myData.is_rel_abs_graph_open():
+                self.myData.draw_rel_absorption(self.myData.rel_absorption)
+
+    # SAVE RELATIVE ABSORPTION - GUI VERSION
+    # edit 2026-05-13
+    # desc : give file name in input parameters ('gui_sab', filename='xxxx')
+    def cmd_gui_sab(self, **kwargs):
+        file_name = kwargs['filename']
+        file_comment = 'Relative absorption'
+        ret_val = 0
+        if(len(self.myData.rel_absorption) > 1):
+            ret_val = fop.write_file(self.myData.rel_absorption, file_name, file_comment, '[%]', self.myData.CALIB)
+        else:
+            print(' Error: No absorption data to save!')
+
+        # check if successful update file name to Data object       
+        if(ret_val == 1):
+            print(" absorption saved in " + file_name)
+            self.myData.rel_abs_file_name = file_name
+            if self.myData.is_rel_abs_graph_open():
+                self.myData.draw_rel_absorption(self.myData.rel_absorption)
+
+    # NOT USED WITH GUI, NOT UP-TO-DATE
+    # READ ONE CHANNEL
+    # edit 2023-12-15
+    # TODO : Condsider combining 'one' with 'p'
+    def cmd_one(self, **kwargs):
+        if not self.InstrumentReady():
+            return
+
+        wave_length = input(" Give a wave length (313...882)")
+        ch_number = self.myData.waveLengthToChannel(int(wave_length))
+        if(ch_number < 1):
+            print(' ' + wave_length + ' nm is too SHORT a wave length for the hardware.')
+        elif (ch_number > self.hw_channel_count):
+            print(' ' + wave_length + ' nm is too LONG a wave length for the hardware.')
+        else:
+            (ch_nr, ch_val) = self.myInstrument.getOneChannel(self.myData.waveLengthToChannel(int(wave_length)))
 
-            # check if successful update file name to Data object       
-            if(ret_val == 1):
-                print(" absorption saved in " + file_name)
-                self.myData.rel_abs_file_name = file_name
-                if self.myData.is_rel_abs_graph_open():
-                    self.myData.draw_rel_absorption(self.myData.rel_absorption)
-
-        # NOT USED WITH GUI, NOT UP-TO-DATE
-        # READ ONE CHANNEL
-        # edit 2023-12-15
-        # TODO : Condsider combining 'one' with 'p'
-        elif inputCommand == 'one':
-            
-            wave_length = input(" Give a wave length (313...882)")
-            ch_number = self.myData.waveLengthToChannel(int(wave_length))
-            if(ch_number < 1):
-                print(' ' + wave_length + ' nm is too SHORT a wave length for the hardware.')
-            elif (ch_number > self.hw_channel_count):
-                print(' ' + wave_length + ' nm is too LONG a wave length for the hardware.')
-            else:
-                (ch_nr, ch_val) = self.myInstrument.getOneChannel(self.myData.waveLengthToChannel(int(wave_length)))
-
-        # edit 2025-4-20
-        # desc : Ask uc to measure a new spectrum and the to send the value of the channel matching the selected wavelength.
-        #        -1 one used as bad value, and it can be coming also from the myInstrument.getOneChannel
-        elif inputCommand == 'gui_first_ch':
-
-            ch_nr = -1     # init with bad values
-            ch_val = -1
-
-            wave_length = int(kwargs['wavelength'])
-            ch_number = self.myData.waveLengthToChannel(wave_length)
-             
-            if(ch_number < 1):
-                print(' ERROR: ' + wave_length + ' nm is too SHORT a wave length for the hardware.')
-            elif (ch_number > self.hw_channel_count):
-                print(' ERROR:' + wave_length + ' nm is too LONG a wave length for the hardware.')
-            else:
-                (ch_nr, ch_val) = self.myInstrument.GetFirstChannel(ch_number)
-            
-            try:
-                self.myMultiTimedData.AddDataPoint(0, ch_val, time.time() - self.myMultiTimedData.startTime)
-                self.myMultiTimedData.AddChWavelength(0, str(wave_length))
-            
-            except ValueError as e:
-                print(str(e))
+    # edit 2026-10-19
+    # desc : Ask uc to measure a new spectrum and the to send the value of the channel matching the selected wavelength.
+    #        -1 one used as bad value, and it can be coming also from the myInstrument.getOneChannel
+    def cmd_gui_first_ch(self, **kwargs):
 
+        ch_nr = -1     # init with bad values
+        ch_val = -1
+        if not self.InstrumentReady():
             return (ch_nr, ch_val)
-        
-        # ANOTHER VALUE FROM MEASURED SPECTRUM
-        # edit : 2025-4-20
-        # desc : Get another channel value from already measured spectrum.
-        #        Use the timestamp of the first channel of this same spectrum data.
-        elif inputCommand == 'gui_another_ch':
 
-            ch_nr = -1     # init with bad values
-            ch_val = -1
+        wave_length = int(kwargs['wavelength'])
+        ch_number = self.myData.waveLengthToChannel(wave_length)
 
-            wave_length = int(kwargs['wavelength'])
-            ch_index = int(kwargs['index'])
-            ch_number = self.myData.waveLengthToChannel(wave_length)
-            
-            if(ch_index < 0 or ch_index > self.myMultiTimedData.ch_count):
-                print(' ERROR: Channel index outside of expected range 0...%i!' %self.myMultiTimedData.ch_count)
+        if(ch_number < 1):
+            print(' ERROR: ' + wave_length + ' nm is too SHORT a wave length for the hardware.')
+        elif (ch_number > self.hw_channel_count):
+            print(' ERROR:' + wave_length + ' nm is too LONG a wave length for the hardware.')
+        else:
+            (ch_nr, ch_val) = self.myInstrument.GetFirstChannel(ch_number)
 
-            if(ch_number < 1):
-                print(' ERROR: ' + wave_length + ' nm is too SHORT a wave length for the hardware.')
-            elif (ch_number > self.hw_channel_count):
-                print(' ERROR:' + wave_length + ' nm is too LONG a wave length for the hardware.')
-            else:
-                (ch_nr, ch_val) = self.myInstrument.GetAnotherChannel(ch_number)
-            
-            try:
-                last_ts = self.myMultiTimedData.GetLatestTimestamp()
-                self.myMultiTimedData.AddDataPoint(ch_index, ch_val, last_ts)
-                self.myMultiTimedData.AddChWavelength(ch_index, str(wave_length))
-                #self.myMultiTimedData.DrawTimedGraph()
-            except ValueError as e:
-                print(str(e))
+        try:
+            self.myMultiTimedData.AddDataPoint(0, ch_val, time.time() - self.myMultiTimedData.startTime)
+            self.myMultiTimedData.AddChWavelength(0, str(wave_length))
 
+        except ValueError as e:
+            print(str(e))
+
+        return (ch_nr, ch_val)
+
+    # ANOTHER VALUE FROM MEASURED SPECTRUM
+    # edit : 2026-10-19
+    # desc : Get another channel value from already measured spectrum.
+    #        Use the timestamp of the first channel of this same spectrum data.
+    def cmd_gui_another_ch(self, **kwargs):
+
+        ch_nr = -1     # init with bad values
+        ch_val = -1
+        if not self.InstrumentReady():
             return (ch_nr, ch_val)
 
-        # START TIMER OF CONTINUOUS MEASUREMENT
-        # edit : 2024-3-15
-        # desc : interval is in seconds        
-        elif inputCommand == 'gui_start_timer':
-            self.continuousInterval = int(kwargs['interval'])
-            self.continuousActivated = True
-            print(' Continuous measuring started!')
-            threading.Timer(self.continuousInterval, self.TimerInterruptHandler).start()
-        
-        # STOP TIMER OF CONTINUOUS MEAUSREMENT
-        # edit : 2024-3-15
-        elif inputCommand == 'gui_stop_timer':
-            self.continuousActivated = False  
-
-        # SAVE TIMED CHANNEL DATA INTO FILE
-        # edit : 2024-3-10
-        elif inputCommand == 'gui_save_timed':
-            try:
-                file_name = kwargs['filename']
-                comment = kwargs['comment']
-                fop.WriteTimedFile(self.myMultiTimedData.timed_data, file_name, comment)
-            except Exception as e:
-                print(' ERROR in writing timed file!')
-                print(str(e))
-
-        # DRAW MULTI TIMED GRAPH
-        # edit : 2024-2-25
-        elif inputCommand == 'gui_draw_timed_graph':
-            self.myMultiTimedData.DrawTimedGraph()
-            self.myMultiTimedData.PrintLastDataRow()
-        
-        # SET THE NUMBER OF TIMED CHANNELS (1...9)
-        # edit : 2024-2-23
-        elif inputCommand == 'gui_timed_ch_count':
-            self.myMultiTimedData = mini_timed_multi_data(int(kwargs['count']))
-
-        # edit : 2024-3-17
-        # NOT READY! Consider copying all wavelengths as one array instead of one by one.        
-        elif inputCommand == 'gui_timed_add_wavelength':
-            self.myMultiTimedData.AddChWavelength(kwargs['index'], kwargs['wavelength'])
-
-        # edit 2024-2-11
-        # desc: Reset time series of channels and clear the graph.
-        elif inputCommand == 'gui_one_reset':
-            #self.myTimedData.CloseTimedGraph()
-            #self.myTimedData.ClearTimedData()
-            self.myMultiTimedData.CloseTimedGraph()
-            self.myMultiTimedData.ClearTimedData()
-
-        # CHANGE SOURCE (LED) INTENSITY VIA GUI
-        # edit : 2025-4-20
-        # desc : Save the new LED value in to the settings file, then send it to the instrument.
-        elif inputCommand == 'gui_int':
-            print(' Change LED intensity')
-            if 'led_intensity' in kwargs:
-                LED_int = kwargs['led_intensity']
-
-                # save to file
-                fop.update_settings_file("measurement", "hw_source_intensity", LED_int)
-                
-                # send to instrument
-                try:
-                    new_LED_int = self.myInstrument.setSourceIntensity(LED_int)
-                    # old firmware does not return the set value, -1 instead
-                    if new_LED_int == -1:
-                        print(f" LED intensity set : {LED_int}")
-                    # new firmware does return the set value
-                    elif new_LED_int == LED_int:         
-                        print(f" LED intensity set : {new_LED_int}")
-                    # unexpected value 
-                    else:
-                        print(f" ERROR in reading back the new LED intensity value : {new_LED_int}!")
-                
-                except ValueError:
-                    print(" Error : Incorrect LED intensity value!")
-            else:
-                print(" Error : No new LED instensity value defined!")
-            
-        # CHANGE SOURCE INTENSITY
-        # ver 29.4.2022
-        elif inputCommand == 'int':
-            print("Change source intensity")
-            if self.connected is True:
-                LED_int = input(" Give intensity (0...31): ")
-                try:
-                    self.myInstrument.setSourceIntensity(LED_int)
-                except ValueError:
-                    print(" Incorrect intensity value!")
-            else:
-                print(" No connection to hardware. ")   
-
-        # GAIN
-        # ver 7.1.2021
-        #
-        elif inputCommand == 'g':
-            gain = (float)(input("Give gain coefficient"))
-            self.myData.multiply(gain)
-            self.myData.drawLineSpectrum()
+        wave_length = int(kwargs['wavelength'])
+        ch_index = int(kwargs['index'])
+        ch_number = self.myData.waveLengthToChannel(wave_length)
 
-        # DRAW SPECTRUM IN MEMORY
-        # ver 29.5.2022
-        elif inputCommand == 'ds':
-            print(" Draw spectrum in memory")
-            if(len(self.myData.data) > 1):
-                self.myData.drawLineSpectrum()
-            else:
-                print(" No spectrum in memory!")
-
-        # DRAW AVERAGE IN MEMORY
-        # ver 29.5.2022
-        elif inputCommand == 'da':
-            print(" Draw average in memory")
-            if(len(self.myData.average) > 1):
-                self.myData.drawLineAverage()
-            else:
-                print(" No average in memory!")
-        
-        # CLEAR ABSOLUTE GRAPH
-        # edit : 2023-8-25
-        elif inputCommand == 'clg':
-            print(" Clearing the absolute graph...")
-            self.myData.ClearLineSpectrum()
-
-        # CLEAR RELATIVE (ABSORPTION) GRAPH AND DATA
-        # edit : 2023-8-27
-        elif inputCommand == 'clr':
-            print(" Clearing the relative (absorption) graph and data...")
-            self.myData.ClearRelAbsSpectrum()
-            #self.myData.init_rel_graph()
-
-        # ASK MEAS SOURCE
-        # Obsolete since 2026-04-06
-        # edit : 2023-9-1
-        elif inputCommand == 'ask_meas_file':
-            print("send to gui : " + self.myData.data_file_name)
-            return self.myData.data_file_name
-        
-        # ASK AVE COUNT
-        # edit : 2023-12-27
-        elif inputCommand == 'ask_ave_count':
-            return self.myData.ave_size
-        
-        # ASK EXTERN INPUT STATE
-        # edit : 2024-3-28
-        elif inputCommand == 'gui_input_state':
-            state = self.myInstrument.AskInputState()
-            if (state == 'W0'):
-                return 'LOW'
-            elif state == 'W1':
-                return 'HIGH'
-            else:
-                return 'ERROR'
-            
-        # CHECK IF MEASUREMENT DATA IN MEMORY
-        # edit : 2026-05-11
-        elif inputCommand == 'meas_in_memory':
-            return self.myData.Meas_in_memory()
-        
-        # CHECK IF ABSOPTION DATA IN MEMORY
-        # edit : 2026-05-11
-        elif inputCommand == 'abs_in_memory':
-            return self.myData.Abs_in_memory()
-
-        # QUIT
-        elif inputCommand == 'q':
-            print("Quit")
-            if self.connected is True:
-                self.myInstrument.setSourceIntensity(0) # turn LED off
-            print('Bye!')
-            exit()
+        if(ch_index < 0 or ch_index > self.myMultiTimedData.ch_count):
+            print(' ERROR: Channel index outside of expected range 0...%i!' %self.myMultiTimedData.ch_count)
+
+        if(ch_number < 1):
+            print(' ERROR: ' + wave_length + ' nm is too SHORT a wave length for the hardware.')
+        elif (ch_number > self.hw_channel_count):
+            print(' ERROR:' + wave_length + ' nm is too LONG a wave length for the hardware.')
+        else:
+            (ch_nr, ch_val) = self.myInstrument.GetAnotherChannel(ch_number)
+
+        try:
+            last_ts = self.myMultiTimedData.GetLatestTimestamp()
+            self.myMultiTimedData.AddDataPoint(ch_index, ch_val, last_ts)
+            self.myMultiTimedData.AddChWavelength(ch_index, str(wave_length))
+            #self.myMultiTimedData.DrawTimedGraph()
+        except ValueError as e:
+            print(str(e))
+
+        return (ch_nr, ch_val)
+
+    # START TIMER OF CONTINUOUS MEASUREMENT
+    # edit : 2026-10-19
+    # desc : interval is in seconds. Readings run on the Tk thread like in mini_gui, the graph and
+    #        the timed data are used only from that thread. Headless mode has no Tk loop, a thread is used.
+    def cmd_gui_start_timer(self, **kwargs):
+        if not self.InstrumentReady():
+            return False
+        self.continuousInterval = int(kwargs['interval'])
+        self.continuousActivated = True
+        print(' Continuous measuring started!')
+        if self.continuousScheduler is not None:
+            self.continuousScheduler.Stop()
+        self.continuousScheduler = mini_scheduler(self.continuousInterval)
+        if self.root is not None:
+            self.continuousScheduler.StartTk(self.root, self.TimerInterruptHandler)
+        else:
+            self.continuousScheduler.StartThread(self.HeadlessTimerHandler)
+
+    # edit : 2026-10-19
+    # desc : Headless timer thread, readings take turns with the script and server commands.
+    def HeadlessTimerHandler(self):
+        with self.command_lock:
+            self.TimerInterruptHandler()
+
+    # STOP TIMER OF CONTINUOUS MEAUSREMENT
+    # edit : 2026-10-19
+    def cmd_gui_stop_timer(self, **kwargs):
+        self.continuousActivated = False  
+        if self.continuousScheduler is not None:
+            self.continuousScheduler.Stop()
+            print(' Continuous measuring stopped!')
+        self.myMultiTimedData.FlushJournal()
+
+    # edit : 2026-10-19
+    # desc : Measurement of the TIME D tab stopped, rows of the journal are written to disk.
+    def cmd_gui_flush_journal(self, **kwargs):
+        self.myMultiTimedData.FlushJournal()
+
+    # SAVE TIMED CHANNEL DATA INTO FILE
+    # edit : 2026-10-19
+    # desc : Journal of a running measurement is copied into the file.
+    def cmd_gui_save_timed(self, **kwargs):
+        try:
+            file_name = kwargs['filename']
+            comment = kwargs.get('comment', '')
+            self.myMultiTimedData.SaveTimedFile(file_name, comment)
+        except Exception as e:
+            print(' ERROR in writing timed file!')
+            print(str(e))
 
+    # DRAW MULTI TIMED GRAPH
+    # edit : 2024-2-25
+    def cmd_gui_draw_timed_graph(self, **kwargs):
+        self.myMultiTimedData.DrawTimedGraph()
+        self.myMultiTimedData.PrintLastDataRow()
+
+    # RENDERER STATISTICS
+    # edit : 2026-10-19
+    def cmd_render_stats(self, **kwargs):
+        get_renderer().PrintStats()
+
+    # LIVE SPECTRUM VIEW
+    # edit : 2026-10-19
+    # desc : Spectrum line of the ABSOLUTE GRAPH is updated in place. With interval= new
+    #        spectra are measured at that interval until 'live_off'. Spectra are measured on the
+    #        scheduler thread and shown on the Tk thread, the window is not blocked by the serial
+    #        transfer. One spectrum takes about 0.5 s (fixed sleeps of getSpectrum and the transfer),
+    #        a shorter interval only counts missed deadlines.
+    def cmd_live_on(self, **kwargs):
+        if self.root is None:
+            print(' ERROR: live view is not available in headless mode!')
+            return False
+        try:
+            history_count = int(kwargs.get('history', self.settings.get('display', 'live_history')))
+            max_fps = float(kwargs.get('fps', self.settings.get('display', 'live_max_fps')))
+            interval = float(kwargs['interval']) if 'interval' in kwargs else None
+        except ValueError:
+            print(' ERROR: incorrect history, fps or interval!')
+            return False
+        self.myData.SetLiveMode(True, history_count, max(max_fps, 1.0))
+        if self.liveScheduler is not None:
+            self.liveScheduler.Stop()
+            self.liveScheduler = None
+        if interval is not None:
+            if not self.InstrumentReady():
+                return False
+            self.live_pending = False
+            self.liveScheduler = mini_scheduler(max(interval, 0.02))
+            self.liveScheduler.StartThread(self.LiveAcquire)
+        return True
+
+    # edit : 2026-10-19
+    # desc : Live measurement on the scheduler thread. Only the serial exchange is done here.
+    #        No new spectrum is measured while the previous one is still waiting to be shown.
+    def LiveAcquire(self):
+        if self.live_pending:
+            return
+        data = []
+        if self.myInstrument.getSpectrum(data) == 1:
+            self.live_pending = True
+            try:
+                self.root.after(0, self.ShowLiveSpectrum, data, time.time())
+            except (RuntimeError, tk.TclError):
+                pass                        # window is closing
+
+    # edit : 2026-10-19
+    # desc : Live spectrum on the Tk thread.
+    def ShowLiveSpectrum(self, data, timestamp):
+        self.live_pending = False
+        if self.liveScheduler is None:
+            return                          # live_off meanwhile
+        self.myData.data = data
+        self.NewSpectrum(timestamp)
+
+    # edit : 2026-10-19
+    def cmd_live_off(self, **kwargs):
+        if self.liveScheduler is not None:
+            self.liveScheduler.Stop()
+            self.liveScheduler = None
+        self.myData.SetLiveMode(False)
+
+    # START EXTERNAL TRIGGER
+    # edit : 2026-10-19
+    # desc : Input pin is polled in a thread, each edge starts an acquisition:
+    #        timed = ONCE of the TIME D tab, spectrum = 'r', sg = 'sg'.
+    def cmd_trig_start(self, **kwargs):
+        if self.root is None:
+            print(' ERROR: trigger is not available in headless mode!')
+            return False
+        if not self.InstrumentReady():
+            return False
+        mode = kwargs.get('mode', 'timed')
+        if mode == 'timed':
+            acquire = lambda trigger_time: self.gui.button_read_chs_click()
+        elif mode == 'spectrum':
+            acquire = lambda trigger_time: self.GUI_callback('r')
+        elif mode == 'sg':
+            acquire = lambda trigger_time: self.GUI_callback('sg')
+        else:
+            print(f' ERROR: unknown trigger mode {mode}!')
+            return False
+        if self.myTrigger is not None:
+            self.myTrigger.Stop()
+        try:
+            poll_interval = float(self.settings.get('trigger', 'poll_interval')) / 1000
+            queue_size = int(self.settings.get('trigger', 'queue_size'))
+        except ValueError:
+            poll_interval = mini_defaults.DEFAULT_SETTINGS['trigger']['poll_interval'] / 1000
+            queue_size = mini_defaults.DEFAULT_SETTINGS['trigger']['queue_size']
+        edge = kwargs.get('edge', self.settings.get('trigger', 'edge'))
+        self.myTrigger = mini_trigger(self.myInstrument, poll_interval, edge, queue_size)
+        return self.myTrigger.Start(self.root, acquire)
+
+    # STOP EXTERNAL TRIGGER
+    # edit : 2026-10-19
+    def cmd_trig_stop(self, **kwargs):
+        if self.myTrigger is not None:
+            self.myTrigger.Stop()
+        self.myMultiTimedData.FlushJournal()
+
+    # EXTERNAL TRIGGER STATISTICS
+    # edit : 2026-10-19
+    def cmd_trig_stats(self, **kwargs):
+        if self.myTrigger is None:
+            print(' Trigger has not been started.')
+            return
+        self.myTrigger.PrintStats()
+        if 'filename' in kwargs:
+            if self.myTrigger.SaveLog(kwargs['filename']) == 1:
+                print(' trigger log saved in ' + kwargs['filename'])
+
+    # ROLLING STATISTICS OF TIMED CHANNELS
+    # edit : 2026-10-19
+    def cmd_td_stats(self, **kwargs):
+        self.myMultiTimedData.PrintStats()
+
+    # edit : 2026-10-19
+    # desc : Statistics text for the TIME D tab.
+    def cmd_gui_timed_stats(self, **kwargs):
+        return self.myMultiTimedData.GetStatsText()
+
+    # SET THE NUMBER OF TIMED CHANNELS (1...9)
+    # edit : 2026-10-19
+    def cmd_gui_timed_ch_count(self, **kwargs):
+        self.NewTimedData(int(kwargs['count']))
+
+    # edit : 2024-3-17
+    # NOT READY! Consider copying all wavelengths as one array instead of one by one.        
+    def cmd_gui_timed_add_wavelength(self, **kwargs):
+        self.myMultiTimedData.AddChWavelength(kwargs['index'], kwargs['wavelength'])
+
+    # edit 2024-2-11
+    # desc: Reset time series of channels and clear the graph.
+    def cmd_gui_one_reset(self, **kwargs):
+        #self.myTimedData.CloseTimedGraph()
+        #self.myTimedData.ClearTimedData()
+        self.myMultiTimedData.CloseTimedGraph()
+        self.myMultiTimedData.ClearTimedData()
+
+    # CHANGE SOURCE (LED) INTENSITY VIA GUI
+    # edit : 2026-10-19
+    # desc : Save the new LED value in to the settings file, then send it to the instrument.
+    def cmd_gui_int(self, **kwargs):
+        print(' Change LED intensity')
+        if not self.InstrumentReady():
+            return
+        if 'led_intensity' in kwargs:
+            LED_int = kwargs['led_intensity']
+
+            # save to file
+            fop.update_settings_file("measurement", "hw_source_intensity", LED_int)
+
+            # send to instrument
+            try:
+                new_LED_int = self.myInstrument.setSourceIntensity(LED_int)
+                # old firmware does not return the set value, -1 instead
+                if new_LED_int == -1:
+                    print(f" LED intensity set : {LED_int}")
+                # new firmware does return the set value
+                elif new_LED_int == LED_int:         
+                    print(f" LED intensity set : {new_LED_int}")
+                # unexpected value 
+                else:
+                    print(f" ERROR in reading back the new LED intensity value : {new_LED_int}!")
+
+            except ValueError:
+                print(" Error : Incorrect LED intensity value!")
         else:
-            print('Unknown command!')
+            print(" Error : No new LED instensity value defined!")
 
-    # edit : 2024-3-15
-    # desc : Interrupt handler for timer of the continuous measurement. 
+    # CHANGE SOURCE INTENSITY
+    # ver 29.4.2022
+    def cmd_int(self, **kwargs):
+        print("Change source intensity")
+        if self.connected is True:
+            LED_int = input(" Give intensity (0...31): ")
+            try:
+                self.myInstrument.setSourceIntensity(LED_int)
+            except ValueError:
+                print(" Incorrect intensity value!")
+        else:
+            print(" No connection to hardware. ")   
+
+    # AUTOMATIC EXPOSURE
+    # edit : 2026-10-19
+    # desc : Integration time and LED intensity for the peak at the target level (mini_exposure).
+    #        The result is saved as the measurement settings and for the sample type.
+    #        From the GUI it runs on a worker thread, the window stays responsive during the acquisitions.
+    #        Headless scripts and server clients wait for the result (CallWait).
+    def cmd_ae(self, **kwargs):
+        if not self.InstrumentReady():
+            return None
+        sample = kwargs.get('sample', '')
+        if kwargs.get('refresh') == 1:
+            self.myExposure.Forget(sample)
+        try:
+            itime = self.integration_time or int(fop.read_settings_file('measurement', 'hw_integration_time'))
+            led = int(fop.read_settings_file('measurement', 'hw_source_intensity'))
+        except (TypeError, ValueError):
+            itime = int(mini_defaults.DEFAULT_SETTINGS['measurement']['hw_integration_time'])
+            led = int(mini_defaults.DEFAULT_SETTINGS['measurement']['hw_source_intensity'])
+
+        start_time = time.perf_counter()
+        result = self.myExposure.Run(self.myInstrument, itime, led, sample, kwargs.get('target'))
+        if result is None:
+            self.integration_time = None
+            return None
+        print(f" Exposure : {result['itime']} ms, LED {result['led']}, peak {result['peak']} at channel {result['channel']},"
+              f" {result['acquisitions']} acquisitions in {time.perf_counter() - start_time:.1f} s")
+
+        self.integration_time = result['itime']
+        fop.update_settings_file("measurement", "hw_integration_time", result['itime'])
+        fop.update_settings_file("measurement", "hw_source_intensity", result['led'])
+        if result['converged'] and sample:
+            self.myExposure.Store(sample, result)
+        if self.gui is not None:
+            self.root.after(0, lambda: self.gui.update_exposure(result['itime'], result['led']))
+        return result
+
+    # edit : 2026-10-19
+    def cmd_ae_list(self, **kwargs):
+        if 'forget' in kwargs:
+            self.myExposure.Forget(kwargs['forget'])
+        self.myExposure.PrintCache()
+
+    # GAIN
+    # ver 7.1.2021
+    #
+    def cmd_g(self, **kwargs):
+        gain = (float)(input("Give gain coefficient"))
+        self.myData.multiply(gain)
+        self.PublishSpectrum(state=mini_shm.STATE_GAIN)
+        self.myData.drawLineSpectrum()
+
+    # DRAW SPECTRUM IN MEMORY
+    # ver 29.5.2022
+    def cmd_ds(self, **kwargs):
+        print(" Draw spectrum in memory")
+        if(len(self.myData.data) > 1):
+            self.myData.drawLineSpectrum()
+        else:
+            print(" No spectrum in memory!")
+
+    # DRAW AVERAGE IN MEMORY
+    # ver 29.5.2022
+    def cmd_da(self, **kwargs):
+        print(" Draw average in memory")
+        if(len(self.myData.average) > 1):
+            self.myData.drawLineAverage()
+        else:
+            print(" No average in memory!")
+
+    # CLEAR ABSOLUTE GRAPH
+    # edit : 2023-8-25
+    def cmd_clg(self, **kwargs):
+        print(" Clearing the absolute graph...")
+        self.myData.ClearLineSpectrum()
+
+    # CLEAR RELATIVE (ABSORPTION) GRAPH AND DATA
+    # edit : 2023-8-27
+    def cmd_clr(self, **kwargs):
+        print(" Clearing the relative (absorption) graph and data...")
+        self.myData.ClearRelAbsSpectrum()
+        #self.myData.init_rel_graph()
+
+    # ASK MEAS SOURCE
+    # Obsolete since 2026-04-06
+    # edit : 2023-9-1
+    def cmd_ask_meas_file(self, **kwargs):
+        print("send to gui : " + self.myData.data_file_name)
+        return self.myData.data_file_name
+
+    # ASK AVE COUNT
+    # edit : 2023-12-27
+    def cmd_ask_ave_count(self, **kwargs):
+        return self.myData.ave_size
+
+    # ASK EXTERN INPUT STATE
+    # edit : 2026-10-19
+    def cmd_gui_input_state(self, **kwargs):
+        if not self.InstrumentReady():
+            return 'ERROR'
+        state = self.myInstrument.AskInputState()
+        if (state == 'W0'):
+            return 'LOW'
+        elif state == 'W1':
+            return 'HIGH'
+        else:
+            return 'ERROR'
+
+    # CHECK IF THE INSTRUMENT CAN BE USED
+    # edit : 2026-10-19
+    def cmd_gui_connected(self, **kwargs):
+        return self.InstrumentReady()
+
+    # CHECK IF MEASUREMENT DATA IN MEMORY
+    # edit : 2026-05-11
+    def cmd_meas_in_memory(self, **kwargs):
+        return self.myData.Meas_in_memory()
+
+    # CHECK IF ABSOPTION DATA IN MEMORY
+    # edit : 2026-05-11
+    def cmd_abs_in_memory(self, **kwargs):
+        return self.myData.Abs_in_memory()
+
+    # QUIT
+    def cmd_q(self, **kwargs):
+        print("Quit")
+        self.myMultiTimedData.CloseJournal()
+        if self.connected is True:
+            self.myInstrument.setSourceIntensity(0) # turn LED off
+        print('Bye!')
+        exit()
+
+    # COMMAND STATISTICS
+    # edit : 2026-10-19
+    def cmd_stats(self, **kwargs):
+        self.commands.PrintStats()
+        if kwargs.get('reset'):
+            self.commands.ResetStats()
+
+    # SAVE GRAPHS
+    # edit : 2026-10-19
+    def cmd_save_graphs(self, **kwargs):
+        folder = kwargs.get('folder', self.settings.get('files', 'my_spectra_folder'))
+        count = get_renderer().SaveAll(folder)
+        print(f' {count} graphs saved in {folder}')
+        return count
+
+    # WAIT, HEADLESS ONLY
+    # edit : 2026-10-19
+    # desc : Server commands can run meanwhile.
+    def cmd_wait(self, **kwargs):
+        self.command_lock.release()
+        try:
+            time.sleep(max(kwargs['seconds'], 0.0))
+        finally:
+            self.command_lock.acquire()
+
+    # START LOCAL SERVER
+    # edit : 2026-10-19
+    def cmd_server_start(self, **kwargs):
+        return self.StartServer(kwargs.get('port'))
+
+    # edit : 2026-10-19
+    def cmd_server_stop(self, **kwargs):
+        if self.myServer is not None:
+            self.myServer.Stop()
+
+    # edit : 2026-10-19
+    def cmd_server_stats(self, **kwargs):
+        if self.myServer is None:
+            print(' Server has not been started.')
+            return
+        self.myServer.PrintStats()
+
+    # START SHARED MEMORY OF THE LATEST SPECTRUM
+    # edit : 2026-10-19
+    def cmd_shm_start(self, **kwargs):
+        return self.StartShm(kwargs.get('name'))
+
+    # edit : 2026-10-19
+    def cmd_shm_stop(self, **kwargs):
+        if self.myShm is not None:
+            self.myShm.Close()
+            self.myShm = None
+            print(' Shared memory closed.')
+
+    # PROFILING
+    # edit : 2026-10-19
+    # desc : Reports are saved in my_spectra_folder if filename is not given.
+    def ReportFileName(self, kwargs, prefix):
+        if 'filename' in kwargs:
+            return kwargs['filename']
+        return self.settings.get('files', 'my_spectra_folder') + datetime.now().strftime(prefix + " %Y-%m-%d %H.%M.%S.log")
+
+    # edit : 2026-10-19
+    # desc : Profiler is imported and created when it is used first time.
+    def GetProfiler(self):
+        if self.myProfiler is None:
+            from mini_profiler import mini_profiler
+            self.myProfiler = mini_profiler()
+        return self.myProfiler
+
+    # edit : 2026-10-19
+    def cmd_prof_start(self, **kwargs):
+        return self.GetProfiler().Start(kwargs.get('mode', 'sample'), kwargs.get('interval', 5.0) / 1000)
+
+    # edit : 2026-10-19
+    def cmd_prof_stop(self, **kwargs):
+        self.GetProfiler().Stop(self.ReportFileName(kwargs, 'profile'), kwargs.get('top', 20))
+
+    # edit : 2026-10-19
+    def cmd_mem_start(self, **kwargs):
+        return self.GetProfiler().MemStart(kwargs.get('frames', 10))
+
+    # edit : 2026-10-19
+    def cmd_mem_snap(self, **kwargs):
+        self.GetProfiler().MemSnapshot(self.ReportFileName(kwargs, 'memory'), kwargs.get('top', 20), kwargs.get('base', 'previous'))
+
+    # edit : 2026-10-19
+    def cmd_mem_stop(self, **kwargs):
+        self.GetProfiler().MemStop()
+
+    # METRICS
+    # edit : 2026-10-19
+    def cmd_metrics(self, **kwargs):
+        text = get_metrics().Render()
+        print(text)
+        return text
+
+    # edit : 2026-10-19
+    def cmd_metrics_start(self, **kwargs):
+        if 'file' not in kwargs and 'port' not in kwargs:
+            print(' ERROR: give file=<filename> or port=<port>!')
+            return False
+        return self.StartMetrics(kwargs.get('file', ''), kwargs.get('port', 0), kwargs.get('interval'))
+
+    # edit : 2026-10-19
+    def cmd_metrics_stop(self, **kwargs):
+        get_metrics().Stop()
+        print(' Metrics export stopped.')
+
+    # edit : 2026-10-19
+    # desc : Interrupt handler for timer of the continuous measurement.
+    #        Called by continuousScheduler at fixed deadlines, on the Tk thread when there is a window.
     def TimerInterruptHandler(self):
         #print('time out!')
 
@@ -823,19 +1817,17 @@ class MainApp:
             print(str(e))
 
         self.myMultiTimedData.DrawTimedGraph()
-        self.myMultiTimedData.PrintLastDataRow()
-        
-
-        if (self.continuousActivated):
-            threading.Timer(self.continuousInterval, self.TimerInterruptHandler).start()
-            return(1, 112)
-        else:
-            print(' Continuous measuring stopped!')  
+        self.myMultiTimedData.PrintLastDataRow()  
 
 
-# edit 2023-10-6
+# edit 2026-10-19
 if __name__ == "__main__":
-    app = MainApp()
+    parser = argparse.ArgumentParser(description='Mini Spec')
+    parser.add_argument('--headless', action='store_true', help='run without the window, commands from --script or stdin')
+    parser.add_argument('--script', help='file of commands for --headless, one command per line')
+    parser.add_argument('--draw', action='store_true', help='draw graphs also in --headless mode (save_graphs saves them)')
+    args = parser.parse_args()
+    app = MainApp(args.headless, args.script, args.draw)
     
 
 
@@ -0,0 +1,328 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_metrics.py
+# edit : 2026-10-19
+# desc : Metrics of the app in the Prometheus text format, so a monitoring system can watch
+#        many stations. Counters and latency summaries are updated by the code doing the work
+#        (mini_instrument, mini_timed_multi_data, mini_renderer, settings file I/O), gauges of
+#        the app state (missed samples, queue depths) are read from callbacks when exported.
+#        Export is either a file written every interval seconds (e.g. for the textfile
+#        collector of node_exporter) or http://127.0.0.1:port/metrics, or both.
+#        Updating a metric takes 1...2 microseconds, nothing is formatted until exported.
+
+import os
+import time
+import threading
+from collections import deque
+
+HOST = '127.0.0.1'          # loopback only, like mini_server
+QUANTILES = (0.5, 0.9, 0.99)
+SUMMARY_WINDOW = 1000       # latest observations used for the quantiles
+RATE_WINDOW = 60            # seconds, per second rates are averages over this
+
+# name -> (type, labels, help), metrics are exported in this order.
+# Counters without labels are exported as 0 before the first event.
+METRICS = {
+    'mini_spec_up_seconds' : ('gauge', (), 'Seconds since the app was started.'),
+    'mini_spec_spectra_total' : ('counter', (), 'Spectra received from the instrument.'),
+    'mini_spec_spectra_per_second' : ('gauge', (), f'Spectra received per second, average of {RATE_WINDOW} s.'),
+    'mini_spec_spectrum_incomplete_total' : ('counter', (), 'Spectra with missing channels.'),
+    'mini_spec_timed_samples_total' : ('counter', (), 'Time Domain channel values added.'),
+    'mini_spec_timed_samples_per_second' : ('gauge', (), f'Time Domain channel values per second, average of {RATE_WINDOW} s.'),
+    'mini_spec_timed_dropped_total' : ('counter', (), 'Time Domain values dropped for an older timestamp.'),
+    'mini_spec_missed_samples' : ('gauge', ('source',), 'Deadlines or triggers missed since the source was started.'),
+    'mini_spec_serial_seconds' : ('summary', ('command',), 'Duration of the serial port commands of the instrument.'),
+    'mini_spec_serial_errors_total' : ('counter', ('command',), 'Serial port commands that failed.'),
+    'mini_spec_render_seconds' : ('summary', ('kind',), 'Time to draw a graph, full redraw or blit of a live frame.'),
+    'mini_spec_queue_depth' : ('gauge', ('queue',), 'Items waiting in a queue.'),
+    'mini_spec_server_dropped' : ('gauge', (), 'Stream messages dropped for slow server clients.'),
+    'mini_spec_settings_reads_total' : ('counter', (), 'Reads of the settings file.'),
+    'mini_spec_settings_writes_total' : ('counter', (), 'Writes of the settings file.'),
+    'mini_spec_exposure_acquisitions' : ('summary', ('source',), 'Acquisitions used by the automatic exposure, cached or searched.'),
+}
+
+# edit : 2026-10-19
+# desc : Label set as a hashable key, sorted by label name.
+def label_key(labels):
+    return tuple(sorted(labels.items()))
+
+# edit : 2026-10-19
+def format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join('%s="%s"' %(name, str(value).replace('\\', '\\\\').replace('"', '\\"')) for name, value in pairs) + '}'
+
+# edit : 2026-10-19
+def format_value(value):
+    if isinstance(value, float):
+        return repr(value) if value == value else 'NaN'
+    return str(value)
+
+
+class mini_metrics_summary:
+
+    # edit : 2026-10-19
+    def __init__(self, window=SUMMARY_WINDOW):
+        self.values = deque(maxlen=window)
+        self.count = 0
+        self.sum = 0.0
+
+    # edit : 2026-10-19
+    def Observe(self, value):
+        self.values.append(value)
+        self.count = self.count + 1
+        self.sum = self.sum + value
+
+    # edit : 2026-10-19
+    # desc : Quantiles of the latest window values, NaN before the first value.
+    def Quantiles(self):
+        values = sorted(self.values)
+        if not values:
+            return [(q, float('nan')) for q in QUANTILES]
+        return [(q, values[min(int(q * len(values)), len(values) - 1)]) for q in QUANTILES]
+
+
+class mini_metrics_rate:
+
+    # edit : 2026-10-19
+    # desc : Counts in one second buckets of time.monotonic().
+    def __init__(self, window=RATE_WINDOW):
+        self.window = window
+        self.buckets = deque()      # [second, count]
+
+    # edit : 2026-10-19
+    def Add(self, count=1):
+        second = int(time.monotonic())
+        if self.buckets and self.buckets[-1][0] == second:
+            self.buckets[-1][1] = self.buckets[-1][1] + count
+        else:
+            self.buckets.append([second, count])
+            while self.buckets[0][0] <= second - self.window:
+                self.buckets.popleft()
+
+    # edit : 2026-10-19
+    # desc : Average per second over the full seconds of the window.
+    def PerSecond(self):
+        now = int(time.monotonic())
+        return sum(count for second, count in self.buckets if now - self.window <= second < now) / self.window
+
+
+class mini_metrics:
+
+    # edit : 2026-10-19
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.start_time = time.monotonic()
+        self.counters = {}          # name -> {label key: value}
+        self.summaries = {}         # name -> {label key: mini_metrics_summary}
+        self.rates = {}             # name of the per second gauge -> mini_metrics_rate
+        self.gauges = {}            # name -> callback returning a value or {label key: value}
+        self.file_name = None
+        self.interval = 15.0
+        self.stop_event = None
+        self.http_server = None
+
+    # edit : 2026-10-19
+    def Inc(self, name, value=1, **labels):
+        key = label_key(labels)
+        with self.lock:
+            values = self.counters.setdefault(name, {})
+            values[key] = values.get(key, 0) + value
+
+    # edit : 2026-10-19
+    # desc : Count events into name_total and their rate into name_per_second.
+    def Mark(self, name, count=1):
+        with self.lock:
+            values = self.counters.setdefault(name + '_total', {})
+            values[()] = values.get((), 0) + count
+            rate = self.rates.get(name + '_per_second')
+            if rate is None:
+                rate = self.rates[name + '_per_second'] = mini_metrics_rate()
+            rate.Add(count)
+
+    # edit : 2026-10-19
+    def Observe(self, name, value, **labels):
+        key = label_key(labels)
+        with self.lock:
+            values = self.summaries.setdefault(name, {})
+            summary = values.get(key)
+            if summary is None:
+                summary = values[key] = mini_metrics_summary()
+            summary.Observe(value)
+
+    # edit : 2026-10-19
+    # desc : callback() returns the value of the gauge or {label key: value}, see label_key.
+    #        It is called when the metrics are exported, a callback that fails is left out.
+    def Gauge(self, name, callback):
+        with self.lock:
+            self.gauges[name] = callback
+
+    # edit : 2026-10-19
+    # desc : All metrics in the Prometheus text format.
+    def Render(self):
+        gauges = {'mini_spec_up_seconds' : {() : round(time.monotonic() - self.start_time, 3)}}
+        for name, callback in list(self.gauges.items()):
+            try:
+                value = callback()
+            except Exception as e:
+                print(f' ERROR in metric {name}: {e}')
+                continue
+            gauges[name] = value if isinstance(value, dict) else {() : value}
+
+        lines = []
+        with self.lock:
+            for name, rate in self.rates.items():
+                gauges[name] = {() : rate.PerSecond()}
+            for name in list(METRICS) + sorted((set(self.counters) | set(self.summaries) | set(gauges)) - set(METRICS)):
+                metric_type, labels, help_text = METRICS.get(name, ('untyped', (), ''))
+                if metric_type == 'summary':
+                    samples = []
+                    for key, summary in self.summaries.get(name, {}).items():
+                        for q, value in summary.Quantiles():
+                            samples.append(f'{name}{format_labels(key, [("quantile", q)])} {format_value(value)}')
+                        samples.append(f'{name}_sum{format_labels(key)} {format_value(summary.sum)}')
+                        samples.append(f'{name}_count{format_labels(key)} {summary.count}')
+                else:
+                    values = self.counters.get(name, gauges.get(name, {}))
+                    if not values and metric_type == 'counter' and not labels:
+                        values = {() : 0}
+                    samples = [f'{name}{format_labels(key)} {format_value(value)}' for key, value in values.items()]
+                if samples:
+                    if help_text:
+                        lines.append(f'# HELP {name} {help_text}')
+                    lines.append(f'# TYPE {name} {metric_type}')
+                    lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+    # edit : 2026-10-19
+    # desc : Write the metrics into the file now. The file is replaced at once, a reader never
+    #        sees a half written file. Returns True if written.
+    def WriteFile(self, file_name):
+        temp_name = file_name + '.tmp'
+        try:
+            with open(temp_name, 'w', encoding='utf-8') as f:
+                f.write(self.Render())
+            os.replace(temp_name, file_name)
+        except OSError as e:
+            print(f' ERROR in writing metrics file {file_name}: {e}')
+            return False
+        return True
+
+    # edit : 2026-10-19
+    # desc : Write the file every interval seconds until StopFile.
+    def StartFile(self, file_name, interval=15.0):
+        self.StopFile()
+        self.file_name = file_name
+        self.interval = max(float(interval), 1.0)
+        if not self.WriteFile(file_name):
+            self.file_name = None
+            return False
+        self.stop_event = threading.Event()
+        threading.Thread(target=self.FileLoop, args=(file_name, self.stop_event), daemon=True).start()
+        print(f' Metrics written into {file_name} every {self.interval:g} s')
+        return True
+
+    # edit : 2026-10-19
+    def FileLoop(self, file_name, stop_event):
+        while not stop_event.wait(self.interval):
+            self.WriteFile(file_name)
+
+    # edit : 2026-10-19
+    def StopFile(self):
+        if self.stop_event is not None:
+            self.stop_event.set()
+            self.stop_event = None
+            self.WriteFile(self.file_name)      # latest values stay in the file
+            self.file_name = None
+
+    # edit : 2026-10-19
+    # desc : Serve the metrics on http://127.0.0.1:port/metrics. Returns True if serving.
+    def StartHttp(self, port):
+        if self.http_server is not None:
+            return True
+        import http.server
+        try:
+            self.http_server = http.server.ThreadingHTTPServer((HOST, int(port)), http_handler())
+        except OSError as e:
+            print(f' ERROR in starting the metrics server on port {port}: {e}')
+            return False
+        self.http_server.daemon_threads = True
+        self.http_server.metrics = self
+        threading.Thread(target=self.http_server.serve_forever, daemon=True).start()
+        print(f' Metrics on http://{HOST}:{self.http_server.server_address[1]}/metrics')
+        return True
+
+    # edit : 2026-10-19
+    def StopHttp(self):
+        if self.http_server is not None:
+            self.http_server.shutdown()
+            self.http_server.server_close()
+            self.http_server = None
+
+    # edit : 2026-10-19
+    def Stop(self):
+        self.StopFile()
+        self.StopHttp()
+
+
+# edit : 2026-10-19
+# desc : Request handler of the metrics server. http.server is slow to import and mini_metrics
+#        is imported by most modules, so it is imported only when the metrics are served.
+def http_handler():
+    import http.server
+
+    class mini_metrics_handler(http.server.BaseHTTPRequestHandler):
+
+        # edit : 2026-10-19
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = self.server.metrics.Render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        # edit : 2026-10-19
+        # desc : No line in the terminal for every scrape.
+        def log_message(self, format, *args):
+            pass
+
+    return mini_metrics_handler
+
+
+# the metrics of the application
+_metrics = mini_metrics()
+
+# edit : 2026-10-19
+def get_metrics():
+    return _metrics
+
+
+# unit test main
+# edit : 2026-10-19
+#
+if __name__ == '__main__':
+    import random
+    import tempfile
+    import urllib.request
+
+    myMetrics = get_metrics()
+    myMetrics.Gauge('mini_spec_queue_depth', lambda: {label_key({'queue': 'trigger'}): random.randint(0, 10)})
+    start = time.perf_counter()
+    for i in range(100000):
+        myMetrics.Mark('mini_spec_timed_samples')
+        myMetrics.Observe('mini_spec_serial_seconds', random.uniform(0.3, 0.4), command='getSpectrum')
+    print(f' Mark + Observe {(time.perf_counter() - start) / 100000 * 1e6:.2f} us')
+    myMetrics.Inc('mini_spec_serial_errors_total', command='GetFirstChannel')
+
+    file_name = os.path.join(tempfile.gettempdir(), 'mini_spec.prom')
+    myMetrics.StartFile(file_name, 1)
+    myMetrics.StartHttp(0)
+    port = myMetrics.http_server.server_address[1]
+    print(urllib.request.urlopen(f'http://{HOST}:{port}/metrics').read().decode('utf-8'))
+    myMetrics.Stop()
+    print(f' {file_name}: {os.path.getsize(file_name)} bytes')
@@ -0,0 +1,271 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_profiler.py
+# edit : 2026-10-19
+# desc : Profiling and memory tracing of the running app, started and stopped from the
+#        terminal without a restart. Two profilers:
+#          'sample'   a thread samples the stacks of all threads (sys._current_frames) every
+#                     interval. Low overhead, sees the Tk loop and the worker threads.
+#          'cprofile' cProfile of the thread that starts it, every call is counted. Commands
+#                     run on the Tk thread, so it sees the GUI and the acquisitions run from it.
+#        Memory: tracemalloc snapshots are compared to the previous or the first snapshot,
+#        allocation sites that grew most are listed with their tracebacks.
+#        Reports are written into text files and the top of them is printed.
+
+import io
+import sys
+import time
+import pstats
+import cProfile
+import linecache
+import threading
+import tracemalloc
+from datetime import datetime
+from collections import Counter
+
+class mini_sampler:
+
+    # edit : 2026-10-19
+    # desc : interval in seconds between the samples.
+    def __init__(self, interval=0.005):
+        self.interval = max(interval, 0.001)
+        self.threads = {}           # thread name -> [samples, Counter of self samples, Counter of total samples]
+        self.sample_count = 0
+        self.stop_event = None
+        self.thread = None
+
+    # edit : 2026-10-19
+    def Start(self):
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.Loop, args=(self.stop_event,), name='mini_sampler', daemon=True)
+        self.thread.start()
+
+    # edit : 2026-10-19
+    def Stop(self):
+        if self.stop_event is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.stop_event = None
+
+    # edit : 2026-10-19
+    # desc : A function is (file, first line, name). Self samples count the function on top of
+    #        the stack, total samples count it anywhere in the stack, once per sample.
+    def Loop(self, stop_event):
+        me = threading.get_ident()
+        names = {}
+        while not stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            if any(ident not in names for ident in frames):
+                names = {x.ident: x.name for x in threading.enumerate()}
+            self.sample_count = self.sample_count + 1
+            for ident, frame in frames.items():
+                if ident == me:
+                    continue
+                entry = self.threads.get(names.get(ident, ident))
+                if entry is None:
+                    entry = self.threads[names.get(ident, ident)] = [0, Counter(), Counter()]
+                entry[0] = entry[0] + 1
+                code = frame.f_code
+                entry[1][(code.co_filename, code.co_firstlineno, code.co_name)] += 1
+                seen = set()
+                while frame is not None:
+                    code = frame.f_code
+                    function = (code.co_filename, code.co_firstlineno, code.co_name)
+                    if function not in seen:
+                        seen.add(function)
+                        entry[2][function] += 1
+                    frame = frame.f_back
+
+    # edit : 2026-10-19
+    # desc : top functions of each thread by self samples.
+    def Report(self, top=20):
+        lines = [f' Sampling profile: {self.sample_count} samples every {self.interval * 1000:.1f} ms']
+        for name, (samples, self_counts, total_counts) in sorted(self.threads.items(), key=lambda x: -x[1][0]):
+            lines.append('')
+            lines.append(f' Thread {name}: {samples} samples')
+            lines.append(f' {"self %":>8}{"total %":>9}  function')
+            for function, count in self_counts.most_common(top):
+                lines.append(f' {count / samples * 100:8.1f}{total_counts[function] / samples * 100:9.1f}  {format_function(function)}')
+        return '\n'.join(lines)
+
+
+class mini_profiler:
+
+    # edit : 2026-10-19
+    def __init__(self):
+        self.mode = None            # 'sample' or 'cprofile' while profiling
+        self.sampler = None
+        self.profile = None
+        self.thread = None          # thread that started cProfile, it must also stop it
+        self.start_time = 0.0
+        self.first_snapshot = None  # tracemalloc snapshots, (snapshot, time)
+        self.previous_snapshot = None
+        self.snapshot_count = 0
+
+    # edit : 2026-10-19
+    # desc : mode is 'sample' or 'cprofile', interval (sec) of the sampling.
+    #        Returns True if the profiler was started.
+    def Start(self, mode='sample', interval=0.005):
+        if self.mode is not None:
+            print(f' Profiler ({self.mode}) is already running!')
+            return False
+        if mode == 'sample':
+            self.sampler = mini_sampler(interval)
+            self.sampler.Start()
+        elif mode == 'cprofile':
+            self.profile = cProfile.Profile()
+            self.thread = threading.get_ident()
+            self.profile.enable()
+        else:
+            print(f' ERROR: unknown profiler mode {mode}, sample or cprofile expected!')
+            return False
+        self.mode = mode
+        self.start_time = time.perf_counter()
+        print(f' Profiler ({mode}) started.')
+        return True
+
+    # edit : 2026-10-19
+    # desc : Stop profiling, write the report of the top functions into file_name and print it.
+    #        Returns the report, None if the profiler is not running.
+    def Stop(self, file_name, top=20):
+        if self.mode is None:
+            print(' Profiler is not running.')
+            return None
+        if self.mode == 'cprofile' and threading.get_ident() != self.thread:
+            print(' ERROR: cProfile must be stopped from the thread that started it!')
+            return None
+
+        elapsed = time.perf_counter() - self.start_time
+        if self.mode == 'sample':
+            self.sampler.Stop()
+            report = self.sampler.Report(top)
+        else:
+            self.profile.disable()
+            stream = io.StringIO()
+            stats = pstats.Stats(self.profile, stream=stream)
+            stats.sort_stats('tottime').print_stats(top)
+            stats.sort_stats('cumulative').print_stats(top)
+            report = stream.getvalue()
+        report = f' Profile of {elapsed:.1f} s, stopped {datetime.now():%Y-%m-%d %H:%M:%S}\n' + report
+        self.mode = None
+        self.sampler = None
+        self.profile = None
+        WriteReport(file_name, report)
+        return report
+
+    # edit : 2026-10-19
+    # desc : Start tracing memory allocations with frames of traceback and take the first snapshot.
+    def MemStart(self, frames=10):
+        if tracemalloc.is_tracing():
+            print(' Memory tracing is already on.')
+            return False
+        tracemalloc.start(max(frames, 1))
+        self.first_snapshot = (take_snapshot(), time.time())
+        self.previous_snapshot = self.first_snapshot
+        self.snapshot_count = 1
+        print(f' Memory tracing started, {frames} frames per allocation.')
+        return True
+
+    # edit : 2026-10-19
+    # desc : Take a snapshot and compare it to the previous one or with base='first' to the first one.
+    #        Report of the top sites by growth is written into file_name. Returns the report.
+    def MemSnapshot(self, file_name, top=20, base='previous'):
+        if not tracemalloc.is_tracing() or self.first_snapshot is None:
+            print(' Memory tracing is not on, start it with mem_start.')
+            return None
+        if base not in ('previous', 'first'):
+            print(f' ERROR: unknown base {base}, previous or first expected!')
+            return None
+        snapshot, snapshot_time = take_snapshot(), time.time()
+        self.snapshot_count = self.snapshot_count + 1
+        base_snapshot, base_time = self.first_snapshot if base == 'first' else self.previous_snapshot
+        self.previous_snapshot = (snapshot, snapshot_time)
+
+        current, peak = tracemalloc.get_traced_memory()
+        differences = snapshot.compare_to(base_snapshot, 'lineno')
+        growth = sum(x.size_diff for x in differences)
+        lines = [f' Memory snapshot {self.snapshot_count} at {datetime.fromtimestamp(snapshot_time):%Y-%m-%d %H:%M:%S}',
+                 f' Traced memory {current / 1e6:.2f} MB, peak {peak / 1e6:.2f} MB',
+                 f' Growth since the {base} snapshot ({(snapshot_time - base_time) / 60:.1f} min ago): {growth / 1e6:+.3f} MB',
+                 '',
+                 f' {"growth kB":>11}{"blocks":>9}{"size kB":>10}  allocation site']
+        for x in differences[:top]:
+            lines.append(f' {x.size_diff / 1e3:+11.1f}{x.count_diff:+9d}{x.size / 1e3:10.1f}  {x.traceback[0]}')
+
+        lines.append('')
+        lines.append(' Tracebacks of the largest growth:')
+        for x in snapshot.compare_to(base_snapshot, 'traceback')[:3]:
+            lines.append(f' {x.size_diff / 1e3:+.1f} kB in {x.count_diff:+d} blocks')
+            lines.extend('    ' + line.strip() for line in x.traceback.format())
+        report = '\n'.join(lines)
+        WriteReport(file_name, report, top + 5)
+        return report
+
+    # edit : 2026-10-19
+    def MemStop(self):
+        tracemalloc.stop()
+        self.first_snapshot = None
+        self.previous_snapshot = None
+        print(' Memory tracing stopped.')
+
+
+# edit : 2026-10-19
+def format_function(function):
+    file_name, line, name = function
+    return f'{name} ({file_name}:{line})'
+
+# edit : 2026-10-19
+# desc : Snapshot without the allocations of tracemalloc itself, the import system and
+#        the source lines read for the tracebacks.
+def take_snapshot():
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, linecache.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+        tracemalloc.Filter(False, '<unknown>')))
+
+# edit : 2026-10-19
+# desc : Write the report into the file and print the first lines of it.
+def WriteReport(file_name, report, print_lines=30):
+    try:
+        with open(file_name, 'w', encoding='utf-8') as f:
+            f.write(report + '\n')
+        print(f' Report saved in {file_name}')
+    except OSError as e:
+        print(f' ERROR in saving report {file_name}: {e}')
+    print('\n'.join(report.split('\n')[:print_lines]))
+
+
+# unit test main
+# edit : 2026-10-19
+#
+if __name__ == '__main__':
+    import os
+    import tempfile
+
+    def busy(seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            sum(i * i for i in range(1000))
+
+    leak = []
+    myProfiler = mini_profiler()
+    folder = tempfile.gettempdir()
+
+    worker = threading.Thread(target=busy, args=(1.0,), name='worker')
+    myProfiler.Start('sample', 0.002)
+    worker.start()
+    busy(0.5)
+    worker.join()
+    myProfiler.Stop(os.path.join(folder, 'mini_profile_sample.log'), 5)
+
+    myProfiler.Start('cprofile')
+    busy(0.3)
+    myProfiler.Stop(os.path.join(folder, 'mini_profile_cprofile.log'), 5)
+
+    myProfiler.MemStart()
+    for i in range(3):
+        leak.extend([0.5] * 10000 for n in range(10))
+        myProfiler.MemSnapshot(os.path.join(folder, 'mini_memory.log'), 5)
+    myProfiler.MemStop()
@@ -0,0 +1,232 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_renderer.py
+# edit : 2026-10-19
+# desc : All graphs are created and redrawn through one renderer. In 'tk' mode every figure is
+#        a FigureCanvasTkAgg in its own tab of the GUI notebook, so there is only the tkinter
+#        event loop. In 'pyplot' mode figures are separate pyplot windows like before.
+#        Redraw requests are collected and done once per tkinter idle cycle: a figure asked
+#        to be redrawn several times during one acquisition is drawn only once.
+#        Figures are identified by their names ("ABSOLUTE GRAPH", "TIME DOMAIN VALUES", ...).
+#        matplotlib is imported when the first figure is created, not at the start of the app.
+#        In 'agg' mode (headless) figures are only in memory and drawing can be turned off.
+
+import os
+import time
+import tkinter
+from tkinter import ttk
+from mini_metrics import get_metrics
+
+plt = None                  # matplotlib.pyplot, None until load_matplotlib
+
+FIGURE_SIZE = (7, 4.5)      # inches, size of a figure in a tab before the window is resized
+
+# edit : 2026-10-19
+# desc : Import matplotlib (about 0.5 s) when it is needed first time.
+def load_matplotlib():
+    global plt, Figure, CloseEvent, FigureCanvasTkAgg, NavigationToolbar2Tk
+    if plt is None:
+        import matplotlib
+        if _renderer.mode == 'agg':
+            matplotlib.use('Agg')
+        import matplotlib.pyplot
+        from matplotlib.figure import Figure
+        from matplotlib.backend_bases import CloseEvent
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        plt = matplotlib.pyplot
+
+
+class mini_renderer:
+
+    # edit : 2026-10-19
+    def __init__(self):
+        self.mode = 'pyplot'
+        self.root = None
+        self.notebook = None
+        self.tabs = {}              # name -> (figure, tab frame) in 'tk' mode
+        self.new_tabs = set()       # figures whose tab has not been shown yet
+        self.pending = set()        # figures waiting for a redraw
+        self.idle_id = None         # after_idle of the redraw
+        self.draw_requests = 0
+        self.draw_count = 0
+        self.drawing = True         # False: draw methods of the data objects return at once
+
+    # edit : 2026-10-19
+    # desc : Draw the figures into tabs of the notebook. Open pyplot figures are closed.
+    def UseTk(self, root, notebook):
+        if plt is not None:
+            plt.close('all')
+        self.mode = 'tk'
+        self.root = root
+        self.notebook = notebook
+
+    # edit : 2026-10-19
+    # desc : Headless: figures with the Agg backend, no windows. They are drawn only if
+    #        drawing is True, then they can be saved with SaveAll.
+    def UseAgg(self, drawing=False):
+        self.mode = 'agg'
+        self.drawing = drawing
+        if plt is not None:
+            plt.close('all')
+            plt.switch_backend('Agg')
+
+    # edit : 2026-10-19
+    # desc : Figure of the given name, created if it does not exist. New figures are empty.
+    def Figure(self, name):
+        load_matplotlib()
+        if self.mode != 'tk':
+            plt.ion()
+            return plt.figure(name)
+        if name in self.tabs:
+            return self.tabs[name][0]
+
+        frame = ttk.Frame(self.notebook)
+        figure = Figure(figsize=FIGURE_SIZE)
+        canvas = FigureCanvasTkAgg(figure, master=frame)
+        toolbar_frame = ttk.Frame(frame)
+        toolbar_frame.pack(side=tkinter.BOTTOM, fill=tkinter.X)
+        toolbar = NavigationToolbar2Tk(canvas, toolbar_frame, pack_toolbar=False)
+        toolbar.pack(side=tkinter.LEFT)
+        button_close = ttk.Button(toolbar_frame, text='CLOSE', command=lambda: self.Close(name))
+        button_close.pack(side=tkinter.RIGHT, padx=5)
+        canvas.get_tk_widget().pack(side=tkinter.TOP, fill=tkinter.BOTH, expand=1)
+        self.notebook.add(frame, text=' ' + name + ' ')
+        self.tabs[name] = (figure, frame)
+        self.new_tabs.add(figure)
+        return figure
+
+    # edit : 2026-10-19
+    def Exists(self, name):
+        if plt is None:
+            return False
+        if self.mode != 'tk':
+            return plt.fignum_exists(name)
+        return name in self.tabs
+
+    # edit : 2026-10-19
+    # desc : True if the figure object is still shown.
+    def IsOpen(self, figure):
+        if figure is None or plt is None:
+            return False
+        if self.mode != 'tk':
+            return plt.fignum_exists(figure.number)
+        return any(x[0] is figure for x in self.tabs.values())
+
+    # edit : 2026-10-19
+    # desc : Close a figure given by name or object. close_event is sent like when a pyplot window is closed.
+    def Close(self, figure):
+        if plt is None:
+            return
+        if self.mode != 'tk':
+            if isinstance(figure, str):
+                if plt.fignum_exists(figure):
+                    plt.close(figure)
+            elif self.IsOpen(figure):
+                plt.close(figure)
+            return
+
+        for name, (tab_figure, frame) in list(self.tabs.items()):
+            if name == figure or tab_figure is figure:
+                del self.tabs[name]
+                self.pending.discard(tab_figure)
+                self.new_tabs.discard(tab_figure)
+                CloseEvent('close_event', tab_figure.canvas)._process()
+                self.notebook.forget(frame)
+                frame.destroy()
+
+    # edit : 2026-10-19
+    def CloseAll(self):
+        if plt is None:
+            return
+        if self.mode != 'tk':
+            plt.close('all')
+        for name in list(self.tabs):
+            self.Close(name)
+
+    # edit : 2026-10-19
+    # desc : Show the figure: pyplot window is opened, a new tab is selected. Tab is not
+    #        selected again later, so the user can stay on the other tabs while it is updated.
+    def Show(self, figure):
+        if self.mode == 'agg':
+            return
+        if self.mode != 'tk':
+            plt.show(block=False)
+            return
+        if figure not in self.new_tabs:
+            return
+        self.new_tabs.discard(figure)
+        for tab_figure, frame in self.tabs.values():
+            if tab_figure is figure:
+                self.notebook.select(frame)
+
+    # edit : 2026-10-19
+    # desc : pyplot mode: wait until the figure windows are closed.
+    def ShowBlocking(self):
+        if self.mode == 'pyplot' and plt is not None:
+            plt.show(block=True)
+
+    # edit : 2026-10-19
+    # desc : Ask for a full redraw of the figure. Redraw is done when tkinter is idle,
+    #        all requests before that are drawn once.
+    def Draw(self, figure):
+        self.draw_requests = self.draw_requests + 1
+        if self.mode == 'agg':
+            return
+        if self.mode != 'tk':
+            figure.canvas.draw_idle()
+            return
+        self.pending.add(figure)
+        if self.idle_id is None:
+            self.idle_id = self.root.after_idle(self.DrawPending)
+
+    # edit : 2026-10-19
+    def DrawPending(self):
+        self.idle_id = None
+        pending = self.pending
+        self.pending = set()
+        for figure in pending:
+            if self.IsOpen(figure):
+                start = time.perf_counter()
+                figure.canvas.draw()
+                get_metrics().Observe('mini_spec_render_seconds', time.perf_counter() - start, kind='full')
+                self.draw_count = self.draw_count + 1
+
+    # edit : 2026-10-19
+    # desc : Let a pyplot window handle its events. In 'tk' mode the main loop does it.
+    def FlushEvents(self, figure):
+        if self.mode == 'pyplot':
+            figure.canvas.flush_events()
+
+    # edit : 2026-10-19
+    # desc : Save the open figures as png files named by the figures. Returns the number of saved files.
+    def SaveAll(self, folder):
+        if plt is None:
+            return 0
+        if self.mode != 'tk':
+            figures = [(name, plt.figure(name)) for name in plt.get_figlabels()]
+        else:
+            figures = [(name, x[0]) for name, x in self.tabs.items()]
+        count = 0
+        for name, figure in figures:
+            file_name = os.path.join(folder, name.replace(' ', '_').lower() + '.png')
+            try:
+                figure.savefig(file_name)
+                count = count + 1
+            except OSError as e:
+                print(f' ERROR in saving graph {file_name}: {e}')
+        return count
+
+    # edit : 2026-10-19
+    def PrintStats(self):
+        if self.mode != 'tk':
+            print(f' Renderer ({self.mode}): {self.draw_requests} redraw requests')
+        else:
+            print(f' Renderer (tk): {self.draw_requests} redraw requests, {self.draw_count} redraws')
+
+
+# the renderer of the application
+_renderer = mini_renderer()
+
+# edit : 2026-10-19
+def get_renderer():
+    return _renderer
@@ -0,0 +1,208 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_rolling_stats.py
+# edit : 2026-10-19
+# desc : Rolling statistics of one channel over a window of the latest samples.
+#        Window is either a number of samples ('100') or a time span in seconds ('60s').
+#        Mean, standard deviation and slope (least squares, value per second) are kept as
+#        running sums, min and max with monotonic queues, so adding a sample is O(1)
+#        (amortised). Sums are computed again from the window after every window length
+#        of removed samples, so rounding errors of the float sums do not accumulate.
+
+import math
+from bisect import bisect_left
+from collections import deque
+
+# edit : 2026-10-19
+# desc : Parse a window text, returns (sample count, seconds). The unused one is 0.
+#        Returns None if the text is not a valid window.
+def parse_window(text):
+    text = str(text).strip().lower()
+    try:
+        if text.endswith('s'):
+            seconds = float(text[:-1])
+            return (0, seconds) if seconds > 0 else None
+        count = int(text)
+        return (count, 0.0) if count > 1 else None
+    except ValueError:
+        return None
+
+# edit : 2026-10-19
+# desc : Parse a comma separated list of windows, invalid ones are left out with an error message.
+def parse_windows(text):
+    windows = []
+    for part in str(text).split(','):
+        if not part.strip():
+            continue
+        if parse_window(part) is None:
+            print(f' ERROR: incorrect statistics window "{part.strip()}", use a sample count > 1 or seconds like 60s!')
+        else:
+            windows.append(part.strip())
+    return windows
+
+
+class mini_rolling_stats:
+
+    # edit : 2026-10-19
+    # desc : window as in parse_window, 100 samples if it is not valid.
+    def __init__(self, window='100'):
+        parsed = parse_window(window)
+        if parsed is None:
+            print(f' ERROR: incorrect statistics window "{window}", 100 samples used!')
+            window = '100'
+            parsed = parse_window(window)
+        self.window = str(window).strip()
+        self.max_count, self.max_seconds = parsed
+        self.Reset()
+
+    # edit : 2026-10-19
+    def Reset(self):
+        self.times = deque()
+        self.values = deque()
+        self.min_queue = deque()    # (sample number, value), values increasing
+        self.max_queue = deque()    # (sample number, value), values decreasing
+        self.added = 0              # samples added since Reset, number of the next sample
+        self.removed = 0            # samples removed since the latest ResyncSums
+        self.t0 = None              # sums use times relative to t0 to keep them small
+        self.sum_y = 0
+        self.sum_yy = 0
+        self.sum_t = 0.0
+        self.sum_tt = 0.0
+        self.sum_ty = 0.0
+
+    # edit : 2026-10-19
+    # desc : Add a sample measured at time t (sec). Times must not decrease.
+    def Add(self, t, value):
+        if self.t0 is None:
+            self.t0 = t
+        self.times.append(t)
+        self.values.append(value)
+        self.AddSums(t - self.t0, value)
+
+        while self.min_queue and self.min_queue[-1][1] >= value:
+            self.min_queue.pop()
+        self.min_queue.append((self.added, value))
+        while self.max_queue and self.max_queue[-1][1] <= value:
+            self.max_queue.pop()
+        self.max_queue.append((self.added, value))
+        self.added = self.added + 1
+
+        # samples outside the window
+        while len(self.times) > 1 and ((self.max_count > 0 and len(self.times) > self.max_count)
+                                       or (self.max_seconds > 0 and t - self.times[0] > self.max_seconds)):
+            self.RemoveOldest()
+
+        if self.removed >= max(len(self.times), 1000):
+            self.ResyncSums()
+
+    # edit : 2026-10-19
+    # desc : Replace the value of the latest sample, for a reading measured again at the same time.
+    #        Values dropped from the min and max queues may be needed again, the queues are
+    #        built again from the window. Replacing is rare, so O(window) is fine here.
+    def ReplaceLatest(self, value):
+        if not self.values:
+            return
+        t = self.times[-1] - self.t0
+        old = self.values[-1]
+        self.values[-1] = value
+        self.sum_y = self.sum_y + value - old
+        self.sum_yy = self.sum_yy + value * value - old * old
+        self.sum_ty = self.sum_ty + t * (value - old)
+
+        self.min_queue.clear()
+        self.max_queue.clear()
+        for number, value in enumerate(self.values, self.added - len(self.values)):
+            while self.min_queue and self.min_queue[-1][1] >= value:
+                self.min_queue.pop()
+            self.min_queue.append((number, value))
+            while self.max_queue and self.max_queue[-1][1] <= value:
+                self.max_queue.pop()
+            self.max_queue.append((number, value))
+
+    # edit : 2026-10-19
+    def AddSums(self, t, value):
+        self.sum_y = self.sum_y + value
+        self.sum_yy = self.sum_yy + value * value
+        self.sum_t = self.sum_t + t
+        self.sum_tt = self.sum_tt + t * t
+        self.sum_ty = self.sum_ty + t * value
+
+    # edit : 2026-10-19
+    def RemoveOldest(self):
+        number = self.added - len(self.times)
+        t = self.times.popleft() - self.t0
+        value = self.values.popleft()
+        self.sum_y = self.sum_y - value
+        self.sum_yy = self.sum_yy - value * value
+        self.sum_t = self.sum_t - t
+        self.sum_tt = self.sum_tt - t * t
+        self.sum_ty = self.sum_ty - t * value
+        if self.min_queue[0][0] == number:
+            self.min_queue.popleft()
+        if self.max_queue[0][0] == number:
+            self.max_queue.popleft()
+        self.removed = self.removed + 1
+
+    # edit : 2026-10-19
+    # desc : Compute the sums again from the samples in the window, times relative to the oldest one.
+    def ResyncSums(self):
+        self.t0 = self.times[0]
+        self.sum_y = 0
+        self.sum_yy = 0
+        self.sum_t = 0.0
+        self.sum_tt = 0.0
+        self.sum_ty = 0.0
+        for t, value in zip(self.times, self.values):
+            self.AddSums(t - self.t0, value)
+        self.removed = 0
+
+    # edit : 2026-10-19
+    # desc : Fill the window from whole series (loaded data). Only the samples that fit
+    #        into the window are added. times must be increasing.
+    def Fill(self, times, values):
+        self.Reset()
+        first = 0
+        if self.max_count > 0:
+            first = max(len(times) - self.max_count, 0)
+        if self.max_seconds > 0 and len(times) > 0:
+            first = max(first, bisect_left(times, times[-1] - self.max_seconds))
+        for i in range(first, len(times)):
+            self.Add(times[i], values[i])
+
+    # edit : 2026-10-19
+    # desc : Returns (count, mean, std, min, max, slope) of the window, None if it is empty.
+    #        std and slope are 0 with only one sample.
+    def Get(self):
+        n = len(self.values)
+        if n == 0:
+            return None
+        mean = self.sum_y / n
+        std = 0.0
+        slope = 0.0
+        if n > 1:
+            std = math.sqrt(max(self.sum_yy - self.sum_y * mean, 0) / (n - 1))
+            denominator = n * self.sum_tt - self.sum_t * self.sum_t
+            if denominator > 0:
+                slope = (n * self.sum_ty - self.sum_t * self.sum_y) / denominator
+        return (n, mean, std, self.min_queue[0][1], self.max_queue[0][1], slope)
+
+
+# unit test main
+# edit : 2026-10-19
+#
+if __name__ == '__main__':
+    import random
+    import statistics
+
+    for window in ('100', '30s'):
+        myStats = mini_rolling_stats(window)
+        samples = []
+        for i in range(5000):
+            t = i * 0.5
+            value = int(1000 + 0.2 * t + random.gauss(0, 5))
+            myStats.Add(t, value)
+            samples.append((t, value))
+        count, mean, std, low, high, slope = myStats.Get()
+        tail = [y for t, y in samples[-count:]]
+        print(f' {window:>4} : n {count}, mean {mean:.2f} ({statistics.mean(tail):.2f}), std {std:.2f}'
+              f' ({statistics.stdev(tail):.2f}), min {low} ({min(tail)}), max {high} ({max(tail)}), slope {slope:.3f}/s')
@@ -0,0 +1,172 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_scheduler.py
+# edit : 2026-10-19
+# desc : Fixed rate scheduler for continuous measurement. Readings are due at absolute
+#        deadlines start + n * interval on time.monotonic(), so the time used by the reading
+#        itself (serial latency, drawing) does not add up as drift. If a reading takes longer
+#        than the interval, the passed deadlines are skipped and counted as missed.
+#        Lateness of each reading from its deadline is collected as jitter statistics.
+#        Timer is either tkinter after() (StartTk) or a thread (StartThread).
+
+import math
+import time
+import threading
+
+class mini_scheduler:
+
+    # edit : 2026-10-19
+    # desc : interval in seconds, max_count 0 = run until stopped
+    def __init__(self, interval, max_count=0):
+        self.interval = max(float(interval), 0.001)
+        self.max_count = max_count
+        self.start_time = 0.0
+        self.next_slot = 0              # number of the next deadline
+        self.running = False
+        self.root = None                # tkinter root when started with StartTk
+        self.after_id = None
+        self.stop_event = threading.Event()
+        self.on_stop = None             # called when max_count readings are done
+
+        # statistics
+        self.count = 0                  # readings done
+        self.missed = 0                 # deadlines skipped
+        self.jitter_mean = 0.0          # lateness from the deadline (sec)
+        self.jitter_m2 = 0.0            # sum of squared differences from the mean (Welford)
+        self.jitter_max = 0.0
+
+    # edit : 2026-10-19
+    # desc : First reading is due immediately.
+    def Reset(self):
+        self.start_time = time.monotonic()
+        self.next_slot = 0
+        self.count = 0
+        self.missed = 0
+        self.jitter_mean = 0.0
+        self.jitter_m2 = 0.0
+        self.jitter_max = 0.0
+
+    # edit : 2026-10-19
+    def Deadline(self, slot):
+        return self.start_time + slot * self.interval
+
+    # edit : 2026-10-19
+    # desc : Seconds until the next deadline, 0 if it has passed.
+    def NextDelay(self):
+        return max(self.Deadline(self.next_slot) - time.monotonic(), 0.0)
+
+    # edit : 2026-10-19
+    # desc : Check if a reading is due now. Deadlines passed already by a full interval are skipped.
+    #        Returns True and records the jitter if the reading should be done.
+    def Due(self):
+        now = time.monotonic()
+        late = now - self.Deadline(self.next_slot)
+        if late < 0:
+            return False
+
+        skipped = math.floor(late / self.interval)
+        if skipped > 0:
+            self.missed = self.missed + skipped
+            self.next_slot = self.next_slot + skipped
+            late = now - self.Deadline(self.next_slot)
+            print(f' WARNING: {skipped} continuous reading(s) missed, reading takes longer than the interval!')
+        self.next_slot = self.next_slot + 1
+
+        self.count = self.count + 1
+        delta = late - self.jitter_mean
+        self.jitter_mean = self.jitter_mean + delta / self.count
+        self.jitter_m2 = self.jitter_m2 + delta * (late - self.jitter_mean)
+        self.jitter_max = max(self.jitter_max, late)
+        return True
+
+    # edit : 2026-10-19
+    def Done(self):
+        return self.max_count > 0 and self.count >= self.max_count
+
+    # edit : 2026-10-19
+    # desc : Run callback on the tkinter thread at every deadline.
+    def StartTk(self, root, callback, on_stop=None):
+        self.Stop()
+        self.Reset()
+        self.root = root
+        self.on_stop = on_stop
+        self.running = True
+        self.after_id = root.after(0, self.TkTimeOut, callback)
+
+    # edit : 2026-10-19
+    def TkTimeOut(self, callback):
+        self.after_id = None
+        if not self.running:
+            return
+        if self.Due():
+            callback()
+            if self.Done():
+                self.Finish()
+                return
+        if self.running:
+            # after() has 1 ms resolution, round up so the timer does not fire before the deadline
+            self.after_id = self.root.after(math.ceil(self.NextDelay() * 1000), self.TkTimeOut, callback)
+
+    # edit : 2026-10-19
+    # desc : Run callback on a separate thread at every deadline.
+    def StartThread(self, callback, on_stop=None):
+        self.Stop()
+        self.Reset()
+        self.on_stop = on_stop
+        self.stop_event = threading.Event()
+        self.running = True
+        threading.Thread(target=self.ThreadLoop, args=(callback, self.stop_event), daemon=True).start()
+
+    # edit : 2026-10-19
+    def ThreadLoop(self, callback, stop_event):
+        while not stop_event.wait(self.NextDelay()):
+            if self.Due():
+                callback()
+                if self.Done():
+                    self.Finish()
+                    return
+
+    # edit : 2026-10-19
+    # desc : max_count readings done.
+    def Finish(self):
+        self.running = False
+        self.PrintStats()
+        if self.on_stop is not None:
+            self.on_stop()
+
+    # edit : 2026-10-19
+    def Stop(self):
+        if not self.running:
+            return
+        self.running = False
+        self.stop_event.set()
+        if self.root is not None and self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        self.PrintStats()
+
+    # edit : 2026-10-19
+    # desc : Returns (readings, missed deadlines, mean jitter, jitter std, max jitter), jitter in seconds.
+    def GetStats(self):
+        std = math.sqrt(self.jitter_m2 / (self.count - 1)) if self.count > 1 else 0.0
+        return self.count, self.missed, self.jitter_mean, std, self.jitter_max
+
+    # edit : 2026-10-19
+    def PrintStats(self):
+        count, missed, mean, std, jitter_max = self.GetStats()
+        print(f' Continuous: {count} readings, {missed} missed, jitter mean {mean * 1000:.1f} ms,'
+              f' std {std * 1000:.1f} ms, max {jitter_max * 1000:.1f} ms')
+
+
+# unit test main
+# edit : 2026-10-19
+#
+if __name__ == '__main__':
+
+    def reading():
+        time.sleep(0.03)    # serial latency of one reading
+
+    myScheduler = mini_scheduler(0.1, 50)
+    myScheduler.StartThread(reading)
+    time.sleep(6)
+    myScheduler.Stop()
@@ -0,0 +1,296 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_server.py
+# edit : 2026-10-19
+# desc : Local server for other processes. Listens on a loopback TCP port (works also on
+#        Windows, where Python has no Unix domain sockets). Messages are JSON lines (UTF-8).
+#        Client to server:
+#          {"id": 1, "command": "r", "args": {"filename": "x.txt"}}   -> {"id": 1, "result": ...}
+#          {"id": 2, "subscribe": ["spectrum", "timed"]}             -> {"id": 2, "result": [...]}
+#          {"id": 3, "unsubscribe": ["timed"]}
+#          A line not starting with { is a terminal command like 'ld filename=x.txt'.
+#        Server to subscribers:
+#          {"topic": "spectrum", "seq": n, "time": t, "file": ..., "wavelengths": [...], "intensities": [...]}
+#          {"topic": "timed", "seq": n, "row": [ch1, ..., chN, time], "wavelengths": [...]}
+#        Each client has its own writer thread and a bounded queue of stream messages. When a
+#        client reads slower than data comes, its oldest messages are dropped and counted, so
+#        a slow client does not slow down the measurement or the other clients. Gaps are seen
+#        from seq. Replies to commands are never dropped.
+
+import json
+import socket
+import threading
+from collections import deque
+
+HOST = '127.0.0.1'          # loopback only, the server is not reachable from other computers
+TOPICS = ('spectrum', 'timed')
+
+class mini_server_client:
+
+    # edit : 2026-10-19
+    def __init__(self, server, connection, address, queue_size):
+        self.server = server
+        self.connection = connection
+        self.address = address
+        self.topics = set()
+        self.replies = deque()                      # encoded replies, never dropped
+        self.stream = deque(maxlen=queue_size)      # encoded stream messages, oldest dropped when full
+        self.condition = threading.Condition()
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+
+    # edit : 2026-10-19
+    def Start(self):
+        threading.Thread(target=self.ReadLoop, daemon=True).start()
+        threading.Thread(target=self.WriteLoop, daemon=True).start()
+
+    # edit : 2026-10-19
+    # desc : Queue an encoded message. Returns False if a stream message had to be dropped.
+    def Push(self, data, is_reply=False):
+        with self.condition:
+            if self.closed:
+                return True
+            dropped = False
+            if is_reply:
+                self.replies.append(data)
+            else:
+                if len(self.stream) == self.stream.maxlen:
+                    self.dropped = self.dropped + 1
+                    dropped = True
+                self.stream.append(data)
+            self.condition.notify()
+        return not dropped
+
+    # edit : 2026-10-19
+    # desc : Writer thread, replies first.
+    def WriteLoop(self):
+        while True:
+            with self.condition:
+                while not self.closed and not self.replies and not self.stream:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                data = self.replies.popleft() if self.replies else self.stream.popleft()
+            try:
+                self.connection.sendall(data)
+                self.sent = self.sent + 1
+            except OSError:
+                self.Close()
+                return
+
+    # edit : 2026-10-19
+    # desc : Reader thread, one request per line.
+    def ReadLoop(self):
+        try:
+            for line in self.connection.makefile('rb'):
+                line = line.strip()
+                if line:
+                    self.Push(self.server.Encode(self.Handle(line)), True)
+        except (OSError, ValueError):
+            pass
+        self.Close()
+
+    # edit : 2026-10-19
+    # desc : Returns the reply of a request line.
+    def Handle(self, line):
+        if not line.startswith(b'{'):
+            command, kwargs = self.server.parse(line.decode('utf-8', 'replace'))
+            request = {'command': command, 'args': kwargs}
+        else:
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                return {'error': f'incorrect JSON: {e}'}
+            if not isinstance(request, dict):
+                return {'error': 'request must be a JSON object'}
+
+        reply = {'id': request['id']} if 'id' in request else {}
+        if 'subscribe' in request or 'unsubscribe' in request:
+            topics = request.get('subscribe', request.get('unsubscribe'))
+            if isinstance(topics, str):
+                topics = [topics]
+            unknown = [x for x in topics if x not in TOPICS]
+            if unknown:
+                reply['error'] = f'unknown topics {unknown}, topics are {list(TOPICS)}'
+                return reply
+            if 'subscribe' in request:
+                self.topics.update(topics)
+            else:
+                self.topics.difference_update(topics)
+            reply['result'] = sorted(self.topics)
+        elif 'command' in request:
+            args = request.get('args') or {}
+            if not isinstance(args, dict):
+                reply['error'] = 'args must be a JSON object'
+                return reply
+            try:
+                reply['result'] = self.server.call(str(request['command']), args)
+            except Exception as e:
+                reply['error'] = str(e)
+        else:
+            reply['error'] = 'request needs command, subscribe or unsubscribe'
+        return reply
+
+    # edit : 2026-10-19
+    def Close(self):
+        with self.condition:
+            if self.closed:
+                return
+            self.closed = True
+            self.condition.notify()
+        try:
+            self.connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.connection.close()
+        self.server.RemoveClient(self)
+
+
+class mini_server:
+
+    # edit : 2026-10-19
+    # desc : call(command, kwargs) runs a command of the application and returns its result,
+    #        parse(line) splits a terminal command line into (command, kwargs).
+    #        queue_size is the number of stream messages waiting for one client.
+    def __init__(self, call, parse, port=50555, queue_size=100):
+        self.call = call
+        self.parse = parse
+        self.port = int(port)
+        self.queue_size = max(int(queue_size), 1)
+        self.listener = None
+        self.clients = []
+        self.lock = threading.Lock()
+        self.seq = dict.fromkeys(TOPICS, 0)
+        self.published = 0
+        self.dropped = 0
+
+    # edit : 2026-10-19
+    # desc : Returns True if the server is listening.
+    def Start(self):
+        if self.listener is not None:
+            return True
+        try:
+            listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            listener.bind((HOST, self.port))
+            listener.listen()
+        except OSError as e:
+            print(f' ERROR in starting the server on port {self.port}: {e}')
+            return False
+        self.listener = listener
+        self.port = listener.getsockname()[1]       # port 0 = any free port
+        threading.Thread(target=self.AcceptLoop, args=(listener,), daemon=True).start()
+        print(f' Server listening on {HOST}:{self.port}')
+        return True
+
+    # edit : 2026-10-19
+    def Stop(self):
+        if self.listener is None:
+            return
+        self.listener.close()
+        self.listener = None
+        for client in list(self.clients):
+            client.Close()
+        print(' Server stopped.')
+
+    # edit : 2026-10-19
+    def AcceptLoop(self, listener):
+        while True:
+            try:
+                connection, address = listener.accept()
+            except OSError:
+                return          # listener closed
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            client = mini_server_client(self, connection, address, self.queue_size)
+            with self.lock:
+                self.clients.append(client)
+            client.Start()
+
+    # edit : 2026-10-19
+    def RemoveClient(self, client):
+        with self.lock:
+            if client in self.clients:
+                self.clients.remove(client)
+
+    # edit : 2026-10-19
+    # desc : True if a client has subscribed the topic, the message need not be made otherwise.
+    def Subscribed(self, topic):
+        return any(topic in x.topics for x in self.clients)
+
+    # edit : 2026-10-19
+    # desc : One JSON line, values that are not JSON types (tuples are lists) are sent as text.
+    def Encode(self, message):
+        return json.dumps(message, separators=(',', ':'), default=str).encode('utf-8') + b'\n'
+
+    # edit : 2026-10-19
+    # desc : Send a message to the subscribers of the topic. Message is encoded only once
+    #        and only if there is a subscriber. Returns the number of clients it was queued for.
+    def Publish(self, topic, message):
+        with self.lock:
+            clients = [x for x in self.clients if topic in x.topics]
+            self.seq[topic] = self.seq[topic] + 1
+            message['topic'] = topic
+            message['seq'] = self.seq[topic]
+        if not clients:
+            return 0
+        data = self.Encode(message)
+        for client in clients:
+            if not client.Push(data):
+                self.dropped = self.dropped + 1
+        self.published = self.published + 1
+        return len(clients)
+
+    # edit : 2026-10-19
+    def PrintStats(self):
+        if self.listener is None:
+            print(' Server is not running.')
+            return
+        print(f' Server {HOST}:{self.port}: {len(self.clients)} clients, {self.published} messages published,'
+              f' {self.dropped} dropped for slow clients')
+        for client in list(self.clients):
+            print(f'  {client.address[0]}:{client.address[1]} {sorted(client.topics)}: {client.sent} sent,'
+                  f' {client.dropped} dropped, {len(client.stream)} waiting')
+
+
+# unit test main
+# edit : 2026-10-19
+# desc : A fast and a slow subscriber of 2000 spectra.
+#
+if __name__ == '__main__':
+    import time
+
+    myServer = mini_server(lambda command, kwargs: [command, kwargs], lambda line: (line.split()[0], {}), 0, 50)
+    myServer.Start()
+
+    def subscriber(delay, results):
+        connection = socket.create_connection((HOST, myServer.port))
+        connection.sendall(b'{"id": 1, "subscribe": ["spectrum"]}\nr\n')
+        received = []
+        for line in connection.makefile('rb'):
+            message = json.loads(line)
+            if message.get('topic') == 'spectrum':
+                received.append(message['seq'])
+                time.sleep(delay)
+                if message['seq'] == 2000:
+                    break
+            else:
+                print(' reply:', message)
+        results.append(received)
+
+    results = []
+    threads = [threading.Thread(target=subscriber, args=(delay, results)) for delay in (0, 0.01)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.5)
+    spectrum = {'time': 0.0, 'file': '', 'wavelengths': list(range(320, 880, 2)), 'intensities': [1000] * 280}
+    start = time.perf_counter()
+    for i in range(2000):
+        myServer.Publish('spectrum', dict(spectrum))
+        time.sleep(0.0005)
+    print(f' published 2000 spectra in {time.perf_counter() - start:.2f} s')
+    for thread in threads:
+        thread.join()
+    for received in results:
+        print(f' client received {len(received)} spectra, {2000 - len(received)} dropped')
+    myServer.PrintStats()
+    myServer.Stop()
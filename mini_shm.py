@@ -0,0 +1,192 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_shm.py
+# edit : 2026-10-19
+# desc : Latest spectrum in a shared memory block for other processes on the same computer.
+#        Readers do not touch the serial port, the GUI thread or a socket, reading the block
+#        takes microseconds. Block is written with a seqlock: the sequence counter is odd while
+#        the spectrum is being written and even when it is complete, so a reader that saw the
+#        same even counter before and after reading has a consistent spectrum.
+#        Layout (little endian):
+#          0  magic 'MSP1'      4  capacity (uint32)     8  seq (uint64, seqlock counter)
+#          16 count (uint32)    20 state (uint32)        24 timestamp (float64, time.time())
+#          64 wavelengths (float64 * capacity), then intensities (float64 * capacity)
+#        Spectrum number is seq // 2. state tells how the spectrum has been processed (STATE_*).
+#        numpy readers can use the arrays without a copy:
+#          np.frombuffer(reader.shm.buf, np.float64, count, intensity_offset(capacity))
+
+import os
+import time
+import struct
+from array import array
+
+MAGIC = b'MSP1'
+HEADER_SIZE = 64
+MAX_CHANNELS = 1024
+
+# processing state bits, 0 = measured spectrum as such
+STATE_LOADED = 1            # loaded from a file
+STATE_BACKGROUND = 2        # background removed ('b')
+STATE_DC = 4                # dc removed ('d')
+STATE_FILTERED = 8          # low-pass filtered ('f')
+STATE_INT_CORRECTED = 16    # intensity correction ('n')
+STATE_GAIN = 32             # multiplied by a gain ('g')
+
+# edit : 2026-10-19
+def wavelength_offset(capacity):
+    return HEADER_SIZE
+
+# edit : 2026-10-19
+def intensity_offset(capacity):
+    return HEADER_SIZE + 8 * capacity
+
+
+class mini_shm:
+
+    # edit : 2026-10-19
+    # desc : Create the block. A block left over from a crashed app is replaced.
+    def __init__(self, name, capacity=MAX_CHANNELS):
+        self.name = name
+        self.capacity = int(capacity)
+        size = HEADER_SIZE + 16 * self.capacity
+        from multiprocessing import shared_memory   # slow to import, only when the block is started
+        try:
+            self.shm = shared_memory.SharedMemory(name, create=True, size=size)
+        except FileExistsError:
+            old = shared_memory.SharedMemory(name)
+            old.close()
+            old.unlink()
+            self.shm = shared_memory.SharedMemory(name, create=True, size=size)
+        buf = self.shm.buf
+        self.wavelengths = buf[wavelength_offset(self.capacity):intensity_offset(self.capacity)].cast('d')
+        self.intensities = buf[intensity_offset(self.capacity):size].cast('d')
+        self.seq = 0
+        struct.pack_into('<4sIQIId', buf, 0, MAGIC, self.capacity, self.seq, 0, 0, 0.0)
+
+    # edit : 2026-10-19
+    # desc : Write a spectrum [[wavelength, intensity], ...]. Channels over the capacity are left out.
+    def Publish(self, data, timestamp, state=0):
+        count = min(len(data), self.capacity)
+        self.seq = self.seq + 1                     # odd: writing
+        struct.pack_into('<Q', self.shm.buf, 8, self.seq)
+        self.wavelengths[:count] = array('d', [x[0] for x in data[:count]])
+        self.intensities[:count] = array('d', [x[1] for x in data[:count]])
+        struct.pack_into('<IId', self.shm.buf, 16, count, state, timestamp)
+        self.seq = self.seq + 1                     # even: complete
+        struct.pack_into('<Q', self.shm.buf, 8, self.seq)
+
+    # edit : 2026-10-19
+    # desc : Remove the block, readers that have it open can still read the last spectrum.
+    def Close(self):
+        self.wavelengths.release()
+        self.intensities.release()
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class mini_shm_reader:
+
+    # edit : 2026-10-19
+    # desc : Open the block of a running app. Raises FileNotFoundError if it does not exist.
+    def __init__(self, name):
+        from multiprocessing import shared_memory
+        try:
+            self.shm = shared_memory.SharedMemory(name, track=False)
+        except TypeError:
+            # Python < 3.13 would remove the block when this reader exits
+            self.shm = shared_memory.SharedMemory(name)
+            if os.name == 'posix':
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(self.shm._name, 'shared_memory')
+        magic, self.capacity = struct.unpack_from('<4sI', self.shm.buf, 0)
+        if magic != MAGIC:
+            self.shm.close()
+            raise ValueError(f'{name} is not a spectrum block')
+        buf = self.shm.buf
+        self.wavelengths = buf[wavelength_offset(self.capacity):intensity_offset(self.capacity)].cast('d')
+        self.intensities = buf[intensity_offset(self.capacity):intensity_offset(self.capacity) + 8 * self.capacity].cast('d')
+
+    # edit : 2026-10-19
+    # desc : Wait until no spectrum is being written, returns the sequence counter.
+    #        Data read after Begin is consistent if Valid(counter) is True after reading.
+    def Begin(self):
+        while True:
+            seq = struct.unpack_from('<Q', self.shm.buf, 8)[0]
+            if seq % 2 == 0:
+                return seq
+            time.sleep(0)
+
+    # edit : 2026-10-19
+    def Valid(self, seq):
+        return struct.unpack_from('<Q', self.shm.buf, 8)[0] == seq
+
+    # edit : 2026-10-19
+    # desc : Copy of the latest spectrum: (spectrum number, timestamp, state, wavelengths, intensities).
+    #        Spectrum number is 0 before the first spectrum.
+    def Read(self):
+        while True:
+            seq = self.Begin()
+            count, state, timestamp = struct.unpack_from('<IId', self.shm.buf, 16)
+            wavelengths = self.wavelengths[:count].tolist()
+            intensities = self.intensities[:count].tolist()
+            if self.Valid(seq):
+                return seq // 2, timestamp, state, wavelengths, intensities
+
+    # edit : 2026-10-19
+    # desc : Spectrum number of the latest complete spectrum, to poll for new ones.
+    def Latest(self):
+        return self.Begin() // 2
+
+    # edit : 2026-10-19
+    def Close(self):
+        self.wavelengths.release()
+        self.intensities.release()
+        self.shm.close()
+
+
+# unit test main
+# edit : 2026-10-19
+# desc : Writer in this process publishes 1000 spectra/s, reader runs in another process.
+#        All intensities of spectrum n are n, so a torn read would be seen.
+#
+if __name__ == '__main__':
+    import sys
+    import subprocess
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'reader':
+        myReader = mini_shm_reader('mini_spec_test')
+        reads = 0
+        torn = 0
+        latest = 0
+        times = []
+        end = time.perf_counter() + 2.0
+        while time.perf_counter() < end:
+            start = time.perf_counter()
+            number, timestamp, state, wavelengths, intensities = myReader.Read()
+            times.append(time.perf_counter() - start)
+            if intensities and (min(intensities) != max(intensities) or number < latest):
+                torn = torn + 1
+            latest = number
+        myReader.Close()
+        times.sort()
+        print(f' reader: {len(times)} reads, median {times[len(times) // 2] * 1e6:.1f} us,'
+              f' 99 % {times[len(times) * 99 // 100] * 1e6:.1f} us, {torn} inconsistent, latest spectrum {latest}')
+    else:
+        myShm = mini_shm('mini_spec_test', 288)
+        reader = subprocess.Popen([sys.executable, __file__, 'reader'])
+        count = 0
+        publish_time = 0.0
+        end = time.perf_counter() + 2.5
+        while time.perf_counter() < end:
+            count = count + 1
+            data = [[320 + 2 * i, count] for i in range(288)]
+            start = time.perf_counter()
+            myShm.Publish(data, time.time())
+            publish_time = publish_time + time.perf_counter() - start
+            time.sleep(0.001)
+        reader.wait()
+        print(f' writer: {count} spectra, Publish {publish_time / count * 1e6:.1f} us')
+        myShm.Close()
@@ -0,0 +1,236 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_spectrogram.py
+# edit : 2026-10-19
+# desc : Full spectrum time series. Every measured spectrum is one row of a time x wavelength
+#        matrix, rows are stored one after another in one flat array. Arrays are allocated with
+#        spare capacity like in mini_timed_multi_data, so adding a spectrum does not move the old
+#        ones. Trace of any wavelength or band can be taken afterwards, no need to choose the
+#        wavelengths before the measurement. Waterfall view shows the matrix as an image,
+#        on update only the image data is replaced.
+#        numpy (installed with matplotlib) is imported only for drawing.
+
+import time
+from array import array
+import mini_file_operations as fop
+from mini_renderer import get_renderer
+
+INITIAL_CAPACITY = 256          # spectra allocated for a new measurement
+WATERFALL_NAME = 'SPECTROGRAM'
+TRACE_NAME = 'SPECTROGRAM TRACE'
+
+class mini_spectrogram:
+
+    # edit : 2026-10-19
+    # desc : Waterfall is redrawn at most max_fps times per second.
+    def __init__(self, max_fps=2):
+        self.wavelengths = []           # wavelength of each column
+        self.channel_count = 0
+        self.values = array('i')        # intensities, row_count rows of channel_count values
+        self.time_data = array('d')     # time of each row (sec), first row is 0
+        self.capacity = 0               # rows allocated
+        self.row_count = 0
+        self.startTime = 0              # time.time() of the first row
+        self.int_min = None             # intensity range for the colour scale
+        self.int_max = None
+
+        self.min_interval = 1.0 / max_fps
+        self.last_draw = 0.0
+        self.figure = None
+        self.image = None
+
+    # edit : 2026-10-19
+    def ClearSpectrogram(self):
+        self.wavelengths = []
+        self.channel_count = 0
+        self.values = array('i')
+        self.time_data = array('d')
+        self.capacity = 0
+        self.row_count = 0
+        self.startTime = 0
+        self.int_min = None
+        self.int_max = None
+
+    # edit : 2026-10-19
+    # desc : Move the rows into new arrays of the given capacity. Old arrays are not changed.
+    def ResizeRows(self, capacity):
+        used = self.row_count * self.channel_count
+        new_values = array('i', bytes(self.values.itemsize * capacity * self.channel_count))
+        new_values[:used] = self.values[:used]
+        new_times = array('d', bytes(self.time_data.itemsize * capacity))
+        new_times[:self.row_count] = self.time_data[:self.row_count]
+        self.values = new_values
+        self.time_data = new_times
+        self.capacity = capacity
+
+    # edit : 2026-10-19
+    # desc : Add a spectrum [[wavelength, intensity], ...] measured at time.time() 'timestamp'.
+    #        Wavelengths are taken from the first spectrum. Returns the row count, -1 if the
+    #        spectrum does not match the earlier ones.
+    def AddSpectrum(self, data, timestamp):
+        if self.row_count == 0:
+            self.ClearSpectrogram()
+            self.wavelengths = [x[0] for x in data]
+            self.channel_count = len(data)
+            self.startTime = timestamp
+            self.ResizeRows(INITIAL_CAPACITY)
+        elif len(data) != self.channel_count:
+            print(f' ERROR: spectrum has {len(data)} channels, spectrogram has {self.channel_count}!')
+            return -1
+
+        if self.row_count == self.capacity:
+            self.ResizeRows(2 * self.capacity)
+
+        intensities = array('i', [int(x[1]) for x in data])
+        start = self.row_count * self.channel_count
+        self.values[start:start + self.channel_count] = intensities
+        self.time_data[self.row_count] = round(timestamp - self.startTime, 3)
+        self.row_count = self.row_count + 1
+        self.UpdateRange(intensities)
+        return self.row_count
+
+    # edit : 2026-10-19
+    def UpdateRange(self, intensities):
+        if len(intensities) == 0:
+            return
+        low = min(intensities)
+        high = max(intensities)
+        self.int_min = low if self.int_min is None else min(self.int_min, low)
+        self.int_max = high if self.int_max is None else max(self.int_max, high)
+
+    # edit : 2026-10-19
+    # desc : Column index of the wavelength closest to the given one.
+    def GetChannelIndex(self, wavelength):
+        return min(range(self.channel_count), key=lambda i: abs(self.wavelengths[i] - wavelength))
+
+    # edit : 2026-10-19
+    # desc : View to the times of the rows, values are not copied.
+    def GetTimeView(self):
+        return memoryview(self.time_data)[:self.row_count]
+
+    # edit : 2026-10-19
+    # desc : Intensities of one column index in all rows. Strided view, values are not copied.
+    def GetColumnView(self, ch_i):
+        return memoryview(self.values)[ch_i:self.row_count * self.channel_count:self.channel_count]
+
+    # edit : 2026-10-19
+    # desc : Intensities of the wavelength closest to the given one in all rows.
+    def GetTrace(self, wavelength):
+        return self.GetColumnView(self.GetChannelIndex(wavelength))
+
+    # edit : 2026-10-19
+    # desc : Mean intensity of the band wl_from...wl_to in all rows.
+    def GetBandTrace(self, wl_from, wl_to):
+        indexes = [i for i in range(self.channel_count) if wl_from <= self.wavelengths[i] <= wl_to]
+        if len(indexes) == 0:
+            indexes = [self.GetChannelIndex((wl_from + wl_to) / 2)]
+        columns = [self.GetColumnView(i) for i in indexes]
+        return [sum(x) / len(indexes) for x in zip(*columns)]
+
+    # edit : 2026-10-19
+    # desc : Spectrum of one row as [[wavelength, intensity], ...].
+    def GetSpectrum(self, row):
+        start = row * self.channel_count
+        return list(map(list, zip(self.wavelengths, self.values[start:start + self.channel_count])))
+
+    # edit : 2026-10-19
+    # desc : Save into a text or compressed (.msz) file.
+    def SaveSpectrogram(self, file_name, comment=''):
+        columns = [self.GetColumnView(i) for i in range(self.channel_count)]
+        return fop.write_spectrogram_file(self.GetTimeView(), self.wavelengths, columns, file_name, comment)
+
+    # edit : 2026-10-19
+    # desc : Load a saved spectrogram, replaces the one in memory. Returns the row count or -1.
+    def LoadSpectrogram(self, file_name):
+        loaded = fop.read_spectrogram_file(file_name)
+        if loaded == -1:
+            return -1
+        times, wavelengths, columns = loaded
+        try:
+            values = array('i')
+            for row in zip(*columns):
+                values.extend(row)
+        except (TypeError, OverflowError):
+            print(f' ERROR: {file_name} has intensities that are not integers!')
+            return -1
+
+        self.ClearSpectrogram()
+        self.wavelengths = wavelengths
+        self.channel_count = len(wavelengths)
+        self.values = values
+        self.time_data = array('d', times)
+        self.capacity = len(times)
+        self.row_count = len(times)
+        self.UpdateRange(values)
+        return self.row_count
+
+    # edit : 2026-10-19
+    # desc : Draw the rows as an image, time upwards and wavelength to the right. Figure and
+    #        image are created once, later only the image data is replaced. Rows are taken
+    #        directly from the array. When there are more rows than pixels, every n:th row is shown.
+    def DrawWaterfall(self, force=False):
+        if self.row_count == 0 or not get_renderer().drawing:
+            return
+        if not force and time.monotonic() - self.last_draw < self.min_interval:
+            return
+        self.last_draw = time.monotonic()
+
+        import numpy as np
+        matrix = np.frombuffer(self.values, dtype=np.int32, count=self.row_count * self.channel_count)
+        matrix = matrix.reshape(self.row_count, self.channel_count)
+        extent = (self.wavelengths[0], self.wavelengths[-1], 0.0, max(self.time_data[self.row_count - 1], 1e-3))
+
+        renderer = get_renderer()
+        if not renderer.IsOpen(self.figure):
+            self.figure = renderer.Figure(WATERFALL_NAME)
+            self.figure.clear()
+            axes = self.figure.add_subplot()
+            self.image = axes.imshow(matrix, aspect='auto', origin='lower', interpolation='nearest', extent=extent)
+            self.figure.colorbar(self.image, ax=axes, label='intensity [bit]')
+            axes.set_xlabel('wavelength [nm]')
+            axes.set_ylabel('Time [s]')
+            renderer.Show(self.figure)
+
+        step = self.row_count // max(int(self.image.axes.bbox.height), 100) + 1
+        self.image.set_data(matrix[::step])
+        self.image.set_extent(extent)
+        self.image.set_clim(self.int_min, max(self.int_max, self.int_min + 1))
+        renderer.Draw(self.figure)
+        renderer.FlushEvents(self.figure)
+
+    # edit : 2026-10-19
+    def CloseWaterfall(self):
+        get_renderer().Close(self.figure)
+        self.figure = None
+        self.image = None
+
+    # edit : 2026-10-19
+    # desc : Draw a trace into the trace figure. label is shown in the legend.
+    def DrawTrace(self, trace, label):
+        if not get_renderer().drawing:
+            return
+        import numpy as np
+        renderer = get_renderer()
+        figure = renderer.Figure(TRACE_NAME)
+        axes = figure.gca()
+        axes.plot(np.asarray(self.GetTimeView()), np.asarray(trace), label=label)
+        axes.grid(True)
+        axes.set_xlabel('Time [s]')
+        axes.set_ylabel('Intensity [bit]')
+        axes.legend(loc='upper left')
+        renderer.Show(figure)
+        renderer.Draw(figure)
+
+
+# unit test main
+# edit : 2026-10-19
+#
+if __name__ == '__main__':
+    import random
+
+    mySpectrogram = mini_spectrogram()
+    wavelengths = [int(310.6 + ch * 2.69 - ch**2 * 0.0012 + 0.5) for ch in range(1, 289)]
+    start_time = time.time()
+    for n in range(1000):
+        mySpectrogram.AddSpectrum([[w, random.randint(0, 1023)] for w in wavelengths], start_time + n)
+    print(f' {mySpectrogram.row_count} spectra, trace at 555 nm: {list(mySpectrogram.GetTrace(555))[:5]}...')
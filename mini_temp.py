@@ -4,6 +4,8 @@
 # ver : 3.6.2022
 # desc : Temperature measurement of blacbody spectrum.
 
+from itertools import islice
+
 # func: find_maximum_l
 # ver: 15.10.2019
 # desc: Find wavelength corresponding maximum intensity of a black body spectrum.
@@ -36,8 +38,6 @@ def get_bb_temp(data):
 #       Data is 2dim array containing both pos and int value.
 #
 def lowpass_filter(data):
-        filt = [0.10, 0.80, 0.10]
-        filt_data = []
         try:
                 int_data = [x[1] for x in data]
         except TypeError:
@@ -45,15 +45,21 @@ def lowpass_filter(data):
                 return data # return data unchanged
                 
         if(len(data) > 3):
-                filt_data.append(int_data[0])               # first item unchanged
-                for i in range(1,len(int_data)-1):
-                        sum = filt[0]*int_data[i-1] + filt[1]*int_data[i] + filt[2]*int_data[i+1]
-                        filt_data.append(sum)
-                filt_data.append(int_data[len(int_data)-1]) # last item unchanged
-
-        for i in range(0, len(filt_data)):
-                data[i][1] = filt_data[i]
+                for row, value in zip(data, lowpass_values(int_data)):
+                        row[1] = value
                 
         return data
 
+# edit : 2026-10-19
+# desc: Same filter for a list of intensities. Returns a new list, values are not changed.
+#
+def lowpass_values(values):
+        filt = [0.10, 0.80, 0.10]
+        if(len(values) <= 3):
+                return list(values)
+        filt_data = [values[0]]                     # first item unchanged
+        filt_data.extend([filt[0]*a + filt[1]*b + filt[2]*c for a, b, c in zip(values, islice(values, 1, None), islice(values, 2, None))])
+        filt_data.append(values[-1])                # last item unchanged
+        return filt_data
+
 
@@ -0,0 +1,268 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_timed_file.py
+# edit : 2026-10-19
+# desc : Random access to large Time Domain files. Byte offset and timestamp of every data row
+#        are collected into an index, which is cached next to the file ('<file name>.idx').
+#        With the index a time range or a decimated overview is read from the memory mapped
+#        file without parsing the rest of it. Index of a growing journal file is extended
+#        with the new rows only.
+
+import os
+import mmap
+import math
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+
+INDEX_MAGIC = b'MSIDX1'
+# magic, source size, source mtime_ns, ch count, data start offset, indexed end offset, monotonic, row count
+INDEX_HEADER = struct.Struct('<6sqqqqqqq')
+
+class mini_timed_file:
+
+    # edit : 2026-10-19
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self.index_name = file_name + '.idx'
+        self.ch_count = 0               # number of channels, columns before the time column
+        self.comment = ''
+        self.data_start = 0             # offset of the first data row
+        self.indexed_end = 0            # offset after the last indexed row
+        self.offsets = array('q')       # offset of each data row
+        self.times = array('d')         # timestamp of each data row
+        self.monotonic = True           # timestamps are increasing, binary search can be used
+
+    # edit : 2026-10-19
+    # desc : Number of indexed data rows.
+    def RowCount(self):
+        return len(self.offsets)
+
+    # edit : 2026-10-19
+    # desc : Open the file using the cached index, index is built or extended if needed.
+    #        Returns True if the file is a Time Domain file.
+    def Open(self):
+        try:
+            stat = os.stat(self.file_name)
+        except OSError:
+            print(f' ERROR: file {self.file_name} not found!')
+            return False
+
+        cached = self.LoadIndex()
+        if cached is not None and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return True
+
+        # journal files only grow, index the new rows only
+        if cached is not None and cached[0] < stat.st_size and self.CheckLastRow():
+            ok = self.BuildIndex(self.indexed_end)
+        else:
+            ok = self.BuildIndex()
+        if ok:
+            self.SaveIndex(stat.st_size, stat.st_mtime_ns)
+        return ok
+
+    # edit : 2026-10-19
+    # desc : Collect offsets and timestamps of the data rows, starting from offset 'start'
+    #        or from the header if start is None. Only complete lines are indexed.
+    def BuildIndex(self, start=None):
+        with open(self.file_name, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return False
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+
+                if start is None:
+                    header = find_header(mm)
+                    if header == -1:
+                        return False
+                    # first line is the comment like in parse_data_text, there can be more lines before the header
+                    self.comment = mm[:mm.find(b'\n')].decode('utf-8', 'replace').strip() if header > 0 else ''
+                    labels_start = mm.find(b'\n', header) + 1
+                    labels_end = mm.find(b'\n', labels_start)
+                    if labels_start == 0 or labels_end == -1:
+                        return False
+                    self.ch_count = len(mm[labels_start:labels_end].split()) - 1
+                    self.data_start = labels_end + 1
+                    self.offsets = array('q')
+                    self.times = array('d')
+                    self.monotonic = True
+                    start = self.data_start
+
+                end = mm.find(b'[end]', start)
+                if end == -1:
+                    end = len(mm)
+                lines = mm[start:end].split(b'\n')
+
+        column_count = self.ch_count + 1
+        pos = start
+        last_time = self.times[-1] if len(self.times) > 0 else -math.inf
+        for line in lines[:-1]:     # last item is not terminated by a line change
+            parts = line.split()
+            if len(parts) == column_count:
+                try:
+                    t = float(parts[-1])
+                    self.offsets.append(pos)
+                    self.times.append(t)
+                    if t < last_time:
+                        self.monotonic = False
+                    last_time = t
+                except ValueError:
+                    print(f' ERROR in indexing row at offset {pos} of {self.file_name}')
+            pos = pos + len(line) + 1
+        self.indexed_end = pos
+        return True
+
+    # edit : 2026-10-19
+    # desc : Check that the last indexed row is still the same, the file has only grown.
+    def CheckLastRow(self):
+        if len(self.offsets) == 0:
+            return False
+        try:
+            rows = self.ReadRows(len(self.offsets) - 1, len(self.offsets))
+            return len(rows) == 1 and rows[0][-1] == self.times[-1]
+        except (OSError, ValueError):
+            return False
+
+    # edit : 2026-10-19
+    # desc : Read the cached index. Returns (source size, source mtime_ns) or None.
+    def LoadIndex(self):
+        try:
+            with open(self.index_name, 'rb') as f:
+                header = f.read(INDEX_HEADER.size)
+                magic, size, mtime, ch_count, data_start, indexed_end, monotonic, row_count = INDEX_HEADER.unpack(header)
+                if magic != INDEX_MAGIC:
+                    return None
+                offsets = array('q')
+                times = array('d')
+                offsets.fromfile(f, row_count)
+                times.fromfile(f, row_count)
+                self.comment = f.read().decode('utf-8', 'replace')
+        except (OSError, EOFError, struct.error):
+            return None
+
+        self.ch_count = ch_count
+        self.data_start = data_start
+        self.indexed_end = indexed_end
+        self.offsets = offsets
+        self.times = times
+        self.monotonic = bool(monotonic)
+        return (size, mtime)
+
+    # edit : 2026-10-19
+    # desc : Write the index next to the data file. Failing is not an error, the index is
+    #        then built again the next time.
+    def SaveIndex(self, size, mtime):
+        temp_name = self.index_name + '.tmp'
+        try:
+            with open(temp_name, 'wb') as f:
+                f.write(INDEX_HEADER.pack(INDEX_MAGIC, size, mtime, self.ch_count, self.data_start,
+                                          self.indexed_end, int(self.monotonic), len(self.offsets)))
+                self.offsets.tofile(f)
+                self.times.tofile(f)
+                f.write(self.comment.encode('utf-8'))
+            os.replace(temp_name, self.index_name)
+        except OSError as e:
+            print(f' Index of {self.file_name} not saved: {e}')
+
+    # edit : 2026-10-19
+    # desc : Read rows first...last-1 (row numbers, not offsets) as [ch1, ..., chN, time] lists.
+    def ReadRows(self, first, last):
+        first = max(first, 0)
+        last = min(last, len(self.offsets))
+        if first >= last:
+            return []
+        if last < len(self.offsets):
+            end = self.offsets[last]
+        else:
+            end = self.indexed_end
+        with open(self.file_name, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                block = mm[self.offsets[first]:end]
+        return self.ParseRows(block)
+
+    # edit : 2026-10-19
+    # desc : Rows with timestamp t_start <= t <= t_end.
+    def GetRows(self, t_start, t_end):
+        if self.monotonic:
+            return self.ReadRows(bisect_left(self.times, t_start), bisect_right(self.times, t_end))
+        else:
+            rows = self.ReadRows(0, len(self.offsets))
+            return [row for row in rows if t_start <= row[-1] <= t_end]
+
+    # edit : 2026-10-19
+    # desc : Every n:th row so that at most max_rows rows are returned. First and last rows are included.
+    def GetOverview(self, max_rows=10000):
+        row_count = len(self.offsets)
+        if row_count <= max_rows:
+            return self.ReadRows(0, row_count)
+
+        step = math.ceil(row_count / max_rows)
+        indexes = list(range(0, row_count, step))
+        if indexes[-1] != row_count - 1:
+            indexes[-1] = row_count - 1
+        with open(self.file_name, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                block = b''.join(mm[self.offsets[i]:self.RowEnd(i)] for i in indexes)
+        return self.ParseRows(block)
+
+    # edit : 2026-10-19
+    # desc : Offset after row i.
+    def RowEnd(self, i):
+        if i + 1 < len(self.offsets):
+            return self.offsets[i + 1]
+        return self.indexed_end
+
+    # edit : 2026-10-19
+    # desc : Convert a block of data lines into rows. Channel values are int, time is float.
+    #        Lines with a wrong number of values are skipped.
+    def ParseRows(self, block):
+        column_count = self.ch_count + 1
+        tokens = block.split()
+        if len(tokens) % column_count != 0:
+            tokens = []
+            for line in block.split(b'\n'):
+                parts = line.split()
+                if len(parts) == column_count:
+                    tokens.extend(parts)
+        columns = []
+        for i in range(self.ch_count):
+            try:
+                columns.append(list(map(int, tokens[i::column_count])))
+            except ValueError:
+                columns.append(list(map(float, tokens[i::column_count])))
+        columns.append(list(map(float, tokens[self.ch_count::column_count])))
+        return list(map(list, zip(*columns)))
+
+
+# edit : 2026-10-19
+# desc : Offset of the '[Time Domain Values]' line, -1 if not found. The whole file is searched,
+#        any number of comment lines can be before the header. Text on a line of its own only.
+def find_header(mm):
+    header = mm.find(b'[Time Domain Values]')
+    while header != -1:
+        line_start = mm.rfind(b'\n', 0, header) + 1
+        line_end = mm.find(b'\n', header)
+        if line_end == -1:
+            line_end = len(mm)
+        if mm[line_start:line_end].strip() == b'[Time Domain Values]':
+            return line_start
+        header = mm.find(b'[Time Domain Values]', line_end)
+    return -1
+
+
+# unit test main
+# edit : 2026-10-19
+#
+if __name__ == '__main__':
+    import sys
+    import time
+
+    if len(sys.argv) < 2:
+        print(' Usage: python mini_timed_file.py <Time Domain file> [t_start t_end]')
+    else:
+        start_time = time.perf_counter()
+        myFile = mini_timed_file(sys.argv[1])
+        if myFile.Open():
+            print(f' {myFile.RowCount()} rows, {myFile.ch_count} channels, opened in {(time.perf_counter() - start_time) * 1000:.1f} ms')
+            if len(sys.argv) > 3:
+                rows = myFile.GetRows(float(sys.argv[2]), float(sys.argv[3]))
+                print(f' {len(rows)} rows between {sys.argv[2]} s and {sys.argv[3]} s')
@@ -1,18 +1,38 @@
 # Copyright (c) 2026 Coded Devices Oy
-# edit : 2026-04-12
+# edit : 2026-10-19
 # desc : Class for timeseries of multiple channel values.
+#        Values are stored by column: one typed array per channel and one for the timestamps.
+#        Arrays are allocated with spare capacity and replaced by bigger ones when full,
+#        so adding a row does not move the old rows and views to the columns stay valid.
+#        In ring mode only the last max_rows rows are kept in memory, older rows are in the journal.
+#        Rolling statistics of each channel are updated with every added value.
+import os
 import time
-import matplotlib.pyplot as plt
-import copy
+from array import array
+import mini_file_operations as fop
+from mini_journal import new_journal
+from mini_renderer import get_renderer
+from mini_metrics import get_metrics
+from mini_rolling_stats import mini_rolling_stats
+
+INITIAL_CAPACITY = 1024     # rows allocated for a new measurement
 
 class mini_timed_multi_data:
 
-    # edit : 2024-3-28
-    def __init__(self, channel_count=3):
-        self.timed_data = []    # 2D array for all channel values and timestamps, 
-                                # all values in a row are from the same spectrum --> same timestamp
-                                # note ch_i is not the actual channel number (of the corresponding wavelength) but an index
-                                # latest value (highest timestamp) will be added to the end of the array
+    # edit : 2026-10-19
+    # desc : If journal_folder is given, rows are also written into a journal file in that folder
+    #        while measuring. Journal is flushed to disk at least every flush_interval seconds.
+    #        max_rows > 0 sets the ring mode, it needs the journal.
+    #        stats_windows are the windows of the rolling statistics, see mini_rolling_stats.
+    def __init__(self, channel_count=3, journal_folder=None, flush_interval=5.0, max_rows=0, stats_windows=('100',)):
+        # Columns of the rows in memory, all values in a row are from the same spectrum --> same timestamp.
+        # note ch_i is not the actual channel number (of the corresponding wavelength) but an index
+        # latest value (highest timestamp) is in index row_count-1, values after it are unused capacity
+        self.ch_data = []               # array('q') for each channel ('d' if loaded values are not integers)
+        self.time_data = array('d')     # timestamps (sec)
+        self.capacity = 0               # allocated length of the arrays
+        self.row_count = 0              # number of rows in memory
+        self.first_row = 0              # row number of the first row in memory, > 0 only in ring mode
 
         self.ChWavelength = [0] * channel_count  # array of wavelengths in order of corresponding channel index
         
@@ -23,9 +43,90 @@ class mini_timed_multi_data:
             print(' ERROR, incorrect number of timed channels! Now set to 3.')
             self.ch_count = 3
                                         # affects the data array size
-        self.ts_count = 0               # number of time stamps in memory, increase after adding a new timestamp (row)
+        self.ts_count = 0               # number of time stamps measured, increase after adding a new timestamp (row)
         self.startTime = 0              # timestamp value of the first datarow
 
+        self.journal_folder = journal_folder    # None if journal is not used
+        self.flush_interval = flush_interval
+        self.journal = None                     # mini_journal of the running measurement
+        self.journal_count = 0                  # number of rows already written into the journal
+
+        if max_rows > 0 and journal_folder is None:
+            print(' Time Domain ring mode needs the journal, all rows are kept in memory.')
+            max_rows = 0
+        self.max_rows = max_rows                # 0 = all rows in memory
+
+        self.live_view = None           # mini_live_view, created with the first graph (loads matplotlib)
+        self.row_listener = None        # row_listener(row) is called with every complete row
+        self.listener_count = 0         # number of rows already given to row_listener
+        self.decimation = 'minmax'
+
+        # mini_rolling_stats of each window for each channel
+        self.stats = [[mini_rolling_stats(w) for w in stats_windows] for i in range(self.ch_count)]
+
+        self.ResizeColumns(INITIAL_CAPACITY)
+
+    # edit : 2026-10-19
+    # desc : Move the rows in memory into new arrays of the given capacity. The first 'drop'
+    #        rows are left out. Old arrays are not changed, so earlier views remain readable.
+    def ResizeColumns(self, capacity, drop=0):
+        keep = self.row_count - drop
+        columns = []
+        for column in self.ch_data or [array('q')] * self.ch_count:
+            new_column = array(column.typecode, bytes(column.itemsize * capacity))
+            new_column[:keep] = column[drop:self.row_count]
+            columns.append(new_column)
+        self.ch_data = columns
+        new_column = array('d', bytes(self.time_data.itemsize * capacity))
+        new_column[:keep] = self.time_data[drop:self.row_count]
+        self.time_data = new_column
+        self.capacity = capacity
+        self.row_count = keep
+        self.first_row = self.first_row + drop
+
+    # edit : 2026-10-19
+    # desc : Add a new row with zero values. When the arrays are full, capacity is doubled or
+    #        in ring mode the rows already in the journal are dropped down to max_rows rows.
+    def AppendRow(self, timestamp):
+        if self.row_count == self.capacity:
+            drop = 0
+            if self.max_rows > 0 and self.journal is not None:
+                drop = min(self.row_count - self.max_rows, self.journal_count - self.first_row)
+            if drop > 0:
+                self.ResizeColumns(self.capacity, drop)
+            elif self.max_rows > 0 and self.capacity < 2 * self.max_rows:
+                self.ResizeColumns(2 * self.max_rows)
+            else:
+                self.ResizeColumns(max(2 * self.capacity, INITIAL_CAPACITY))
+
+        for column in self.ch_data:
+            column[self.row_count] = 0
+        self.time_data[self.row_count] = timestamp
+        self.row_count = self.row_count + 1
+        self.ts_count = self.ts_count + 1
+
+    # edit : 2026-10-19
+    # desc : Views to the values of a channel and to the timestamps of the rows in memory.
+    #        Values are not copied. Views do not grow when rows are added.
+    def GetChannelView(self, ch_i):
+        return memoryview(self.ch_data[ch_i])[:self.row_count]
+
+    def GetTimeView(self):
+        return memoryview(self.time_data)[:self.row_count]
+
+    # edit : 2026-10-19
+    # desc : Row i of the memory as [ch1, ..., chN, time].
+    def GetRow(self, i):
+        return [column[i] for column in self.ch_data] + [self.time_data[i]]
+
+    # edit : 2026-10-19
+    # desc : Rows first...last-1 of the memory as [ch1, ..., chN, time] lists, all rows as default.
+    def GetRows(self, first=0, last=None):
+        if last is None:
+            last = self.row_count
+        columns = [column[first:last] for column in self.ch_data] + [self.time_data[first:last]]
+        return list(map(list, zip(*columns)))
+
     # edit : 2024-3-20
     # desc : Set the wavelength of a channel.
     def AddChWavelength(self, ch_index, ch_wavelength):
@@ -45,9 +146,9 @@ class mini_timed_multi_data:
         print('nm')
 
 
-    # edit : 2024-3-10
+    # edit : 2026-10-19
     # desc : Add one channel value with a timestamp to the array that contains all timed values and timestamps.
-    #        
+    #        A value of the channel at the same timestamp replaces the previous one, also in the statistics.
     def AddDataPoint(self, ch_i, ch_value, ch_timestamp):
 
         # time_stamp will have three decimals
@@ -55,75 +156,174 @@ class mini_timed_multi_data:
         ch_timestamp = round(ch_timestamp, 3)
         
         # not the first row
-        if self.ts_count > 0:
+        if self.row_count > 0:
            
             # existing timestamp in the last row is older than one to be added
-            if (self.timed_data[self.ts_count-1][self.ch_count] < ch_timestamp):
-                new_row = [0] * (self.ch_count + 1)
-                new_row[ch_i] = int(ch_value)
-                new_row[self.ch_count] = ch_timestamp # last value of the row is timestamp
-                self.timed_data.append(new_row)
-                self.ts_count = self.ts_count + 1
+            if (self.time_data[self.row_count-1] < ch_timestamp):
+                self.AppendRow(ch_timestamp)
+                self.ch_data[ch_i][self.row_count-1] = int(ch_value)
                 
             # timestamp in the last row is same as one to be added
-            elif (self.timed_data[self.ts_count-1][self.ch_count] == ch_timestamp):
-                self.timed_data[self.ts_count-1][ch_i] = int(ch_value)
+            elif (self.time_data[self.row_count-1] == ch_timestamp):
+                self.ch_data[ch_i][self.row_count-1] = int(ch_value)
                 
             else:
                 print(' ERROR in adding timed multi data in method AddDataPpoint')
+                ch_timestamp = None
+                get_metrics().Inc('mini_spec_timed_dropped_total')
         
         # is first row, save timestamp offset
         else:
             self.startTime = ch_timestamp
             ch_timestamp = ch_timestamp - self.startTime
-            new_row = [0] * (self.ch_count + 1)
-            new_row[ch_i] = int(ch_value)
-            new_row[self.ch_count] = ch_timestamp # last value of the row is timestamp
-            self.timed_data.append(new_row)
-            self.ts_count = self.ts_count + 1
+            self.AppendRow(ch_timestamp)
+            self.ch_data[ch_i][self.row_count-1] = int(ch_value)
+
+        if ch_timestamp is not None:
+            get_metrics().Mark('mini_spec_timed_samples')
+            row_time = self.time_data[self.row_count-1]
+            for stats in self.stats[ch_i]:
+                if stats.times and stats.times[-1] == row_time:
+                    stats.ReplaceLatest(int(ch_value))
+                else:
+                    stats.Add(row_time, int(ch_value))
+
+        # row is complete when its last channel has been added or a newer row has been started
+        self.UpdateJournal(ch_i == self.ch_count - 1)
+        if self.row_listener is not None:
+            self.NotifyRows(ch_i == self.ch_count - 1)
+
+    # edit : 2026-10-19
+    # desc : Give the complete rows to row_listener as [ch1, ..., chN, time].
+    def NotifyRows(self, last_row_complete=False):
+        complete_count = self.first_row + self.row_count - (0 if last_row_complete else 1)
+        self.listener_count = max(self.listener_count, self.first_row)
+        while self.listener_count < complete_count:
+            self.row_listener(self.GetRow(self.listener_count - self.first_row))
+            self.listener_count = self.listener_count + 1
+
+    # edit : 2026-10-19
+    # desc : Write complete rows into the journal. Journal is started with the first row.
+    def UpdateJournal(self, last_row_complete=False):
+        if self.journal_folder is None:
+            return
+
+        if self.journal is None:
+            try:
+                fop.create_spectra_folder(self.journal_folder)
+                self.journal = new_journal(self.journal_folder, self.ch_count, self.flush_interval)
+                file_name = self.journal.file_name
+                self.journal_count = self.first_row
+                print(f' Time Domain journal : {file_name}')
+            except OSError as e:
+                print(f' ERROR in starting the journal, journal not used! {e}')
+                self.journal_folder = None
+                return
+
+        if last_row_complete:
+            complete_count = self.first_row + self.row_count
+        else:
+            complete_count = self.first_row + self.row_count - 1
+
+        while self.journal_count < complete_count:
+            self.journal.AddRow(self.GetRow(self.journal_count - self.first_row))
+            self.journal_count = self.journal_count + 1
+
+    # edit : 2026-10-19
+    # desc : Write the buffered journal rows to disk, now or only when the flush interval has passed.
+    def FlushJournal(self, if_due=False):
+        if self.journal is not None:
+            if if_due:
+                self.journal.FlushIfDue()
+            else:
+                self.journal.Flush()
+
+    # edit : 2026-10-19
+    # desc : Flush and close the journal of the current measurement. Journal file remains on the disk.
+    def CloseJournal(self):
+        if self.journal is not None:
+            self.journal.Close()
+            self.journal = None
+            self.journal_count = 0
+
+    # edit : 2026-10-19
+    # desc : Save all rows into a Time Domain file. If the rows are in a journal, the journal is copied
+    #        into the file and only the rows not yet in the journal are written from memory.
+    def SaveTimedFile(self, file_name, comment=''):
+        if self.journal is not None:
+            return self.journal.Finalise(file_name, comment, self.GetRows(self.journal_count - self.first_row))
+        else:
+            return fop.WriteTimedFile(self.GetRows(), file_name, comment)
 
-            
     # edit : 2024-3-28 
     def PrintLastDataRow(self):
         try:
-            if self.ts_count > 0:
+            if self.row_count > 0:
                 if self.ts_count == 1:
                     print(' Intensities & time stamp (sec):')
-                print(' # ' + str(self.ts_count) + ' : ' + str(self.timed_data[self.ts_count - 1]))
+                print(' # ' + str(self.ts_count) + ' : ' + str(self.GetRow(self.row_count - 1)))
         except:
             print(' ERROR in printing the last row of the timed array!')
 
-    # edit : 2024-2-11
+    # edit : 2026-10-19
+    # desc : Rolling statistics as text, one line for each channel and window.
+    def GetStatsText(self):
+        lines = []
+        for i in range(self.ch_count):
+            try:
+                float(self.ChWavelength[i])
+                name = str(self.ChWavelength[i]) + ' nm'
+            except ValueError:
+                name = str(self.ChWavelength[i])
+            for stats in self.stats[i]:
+                values = stats.Get()
+                if values is None:
+                    lines.append(f'{name:>7} [{stats.window:>5}]  -')
+                    continue
+                count, mean, std, low, high, slope = values
+                lines.append(f'{name:>7} [{stats.window:>5}]  n {count:5}  mean {mean:9.2f}  std {std:8.2f}'
+                             f'  min {low:7g}  max {high:7g}  slope {slope:9.4f} /s')
+        return '\n'.join(lines)
+
+    # edit : 2026-10-19
+    def PrintStats(self):
+        print(' Rolling statistics:')
+        for line in self.GetStatsText().split('\n'):
+            print(' ' + line)
+
+    # edit : 2026-10-19
     # desc : clear & reset timed data array
     def ClearTimedData(self):
-        self.timed_data = []
+        self.CloseJournal()
+        self.ch_data = []
+        self.time_data = array('d')
+        self.row_count = 0
+        self.first_row = 0
         self.ts_count = 0
         self.startTime = 0
-
-    # edit : 2026-04-12
+        self.listener_count = 0
+        self.ResizeColumns(INITIAL_CAPACITY)
+        if self.live_view is not None:
+            self.live_view.ResetData()
+        for channel_stats in self.stats:
+            for stats in channel_stats:
+                stats.Reset()
+
+    # edit : 2026-10-19
     # desc : Input parameter b defines if the graph blocks the progress of the program.
-    # todo : Check if there is any benefit of using interactive mode plt.ion() 
+    #        Graph is created once, later calls only give the new data to the live view,
+    #        which redraws it at a limited frame rate.
     def DrawTimedGraph(self, b=False):
 
         if self.ts_count == 1:
             self.PrintWavelengths()
+        if not get_renderer().drawing:
+            return
 
-        plot_styles = ['-*b', '-og', '-xr', '-+y', '-#m']
-
-        plt.figure("TIME DOMAIN VALUES")
-        plt.ion() # added 2025-2-16
-        plt.grid(True)
-        plt.xlabel("Time [s]")
-        plt.ylabel("Intensity [bit]")
+        plot_styles = ['-*b', '-og', '-xr', '-+y', '-pm', '-^c', '-sk', '-vb', '-dg']
 
         legends = []
-        
-        time_data = [x[self.ch_count] for x in self.timed_data] #ch_count is same as the index of time_stamp value
         for i in range(self.ch_count):
-            ch_data = [x[i] for x in self.timed_data]
-            time_data = [x[self.ch_count] for x in self.timed_data]
-            plt.plot(time_data, ch_data, plot_styles[i])
-
             # is real wavelength info available for legend
             try:
                 float(self.ChWavelength[i])
@@ -131,48 +331,88 @@ class mini_timed_multi_data:
             except ValueError:
                 legends.append(self.ChWavelength[i])
 
-        plt.legend(legends)   
-        plt.show(block=b)
-
-    # edit : 2025-2-16
+        live_view = self.GetLiveView()
+        if not live_view.IsOpen() or len(live_view.lines) != self.ch_count:
+            live_view.Open(legends, plot_styles)
+        elif legends != live_view.labels:
+            live_view.SetLabels(legends)
+
+        live_view.Update(self.GetTimeView(), [self.GetChannelView(i) for i in range(self.ch_count)], b)
+        if b:
+            get_renderer().ShowBlocking()
+
+    # edit : 2026-10-19
+    # desc : Live view of the graph, created when the graph is drawn first time.
+    def GetLiveView(self):
+        if self.live_view is None:
+            from mini_live_view import mini_live_view     # numpy, loaded only when needed
+            self.live_view = mini_live_view('TIME DOMAIN VALUES', 'Time [s]', 'Intensity [bit]')
+            self.live_view.SetDecimation(self.decimation)
+        return self.live_view
+
+    # edit : 2026-10-19
+    # desc : 'minmax', 'lttb' or 'off', see mini_live_view.
+    def SetDecimation(self, decimation):
+        self.decimation = decimation
+        if self.live_view is not None:
+            self.live_view.SetDecimation(decimation)
+
+    # edit : 2026-10-19
     def CloseTimedGraph(self):
-        if plt.fignum_exists('TIME DOMAIN VALUES'):
-            plt.close('TIME DOMAIN VALUES')
+        if self.live_view is not None:
+            self.live_view.Close()
+        get_renderer().Close('TIME DOMAIN VALUES')
 
 
     # edit : 2024-2-9
     # desc : return the timestamp of the last row of the data array.
     def GetLatestTimestamp(self):
-        row_index = len(self.timed_data) - 1
-        ts_index = self.ch_count
-        return self.timed_data[row_index][ts_index] 
-        
+        return self.time_data[self.row_count - 1]
+
 
     # edit : 2024-2-9
     # desc : Subtract the timestamp of first data row from the following rows
     def SubtractStartTime(self, time):
-        if len(self.timed_data) > 0:
-            start_time = self.timed_data[0][self.ch_count]
+        if self.row_count > 0:
+            start_time = self.time_data[0]
             return time-start_time
         else:
             print(' ERROR in calling SubtractStartTime method!')
             return time
 
-    # edit : 2026-04-12
-    # desc : Import loaded data and handle related data properly
-    # NOTE : This version adds same number of channels as in start of the instance.
+    # edit : 2026-10-19
+    # desc : Import loaded rows [ch1, ..., chN, time] into the columns.
+    #        Channels with non-integer values are stored as floats.
+    # NOTE : Rows must have the same number of channels as this instance.
     #        This version can not add correct channel wavelengths. They were not saved during this edit.
     def ImportLoadData(self, load_data):
+        self.CloseJournal()
         try:
-            self.timed_data = copy.deepcopy(load_data)
-            self.ChWavelength = [0] * self.ch_count
-            self.ChWavelength[0] = 'Ch1' # dummy
-            self.ChWavelength[1] = 'Ch2'
-            self.ChWavelength[2] = 'Ch3'
-            self.ts_count = len(self.timed_data)
-            self.startTime = float(self.timed_data[0][3])
-        except TypeError:
+            columns = list(zip(*load_data))
+            ch_data = []
+            for i in range(self.ch_count):
+                try:
+                    ch_data.append(array('q', columns[i]))
+                except TypeError:
+                    ch_data.append(array('d', columns[i]))
+            time_data = array('d', columns[self.ch_count])
+        except (TypeError, IndexError):
             print(f' ERROR in importing Time Domain data from file!')
+            return
+
+        self.ch_data = ch_data
+        self.time_data = time_data
+        self.capacity = len(time_data)
+        self.row_count = len(time_data)
+        self.first_row = 0
+        self.ChWavelength = ['Ch%i' %(i+1) for i in range(self.ch_count)] # dummy
+        self.ts_count = self.row_count
+        self.startTime = time_data[0]
+        if self.live_view is not None:
+            self.live_view.ResetData()
+        for i in range(self.ch_count):
+            for stats in self.stats[i]:
+                stats.Fill(time_data, ch_data[i])
 
 # unit test
 # edit: 2024-2-9
@@ -191,7 +431,7 @@ if __name__ == '__main__':
         value = int(input('Give a value, 0 to end!'))
         channel_i = int(input('Give a channel index!'))
 
-    print(myTimed.timed_data)
+    print(myTimed.GetRows())
     print(myTimed.ch_count)
     print(myTimed.ts_count)
 
@@ -0,0 +1,204 @@
+# Copyright (c) 2026 Coded Devices Oy
+
+# file : mini_trigger.py
+# edit : 2026-10-19
+# desc : External trigger from the input pin (RA2) of the instrument. A poller thread asks the
+#        pin state ('W') every poll_interval seconds and puts a trigger into a queue on the
+#        selected edge. Each trigger is timestamped when the edge is seen. Acquisitions are
+#        run on the tkinter thread one trigger at a time, so triggers coming faster than the
+#        acquisitions wait in the queue. Triggers that do not fit into the queue are counted
+#        as missed. Latency from the trigger to the start of its acquisition is logged.
+#        The port is shared: the poller waits while an acquisition holds the port lock.
+#        Pulses shorter than the poll interval (plus one 'W' round trip) can not be seen.
+
+import time
+import queue
+import threading
+
+EDGES = ('rising', 'falling', 'both')
+
+class mini_trigger:
+
+    # edit : 2026-10-19
+    # desc : instrument is the mini_instrument, poll_interval in seconds.
+    def __init__(self, instrument, poll_interval=0.01, edge='rising', queue_size=10):
+        self.instrument = instrument
+        self.poll_interval = max(float(poll_interval), 0.0)
+        if edge not in EDGES:
+            print(f' ERROR: unknown trigger edge {edge}, rising used!')
+            edge = 'rising'
+        self.edge = edge
+        self.queue = queue.Queue(max(int(queue_size), 1))
+        self.stop_event = threading.Event()
+        self.running = False
+        self.root = None
+        self.acquire = None
+        self.Reset()
+
+    # edit : 2026-10-19
+    def Reset(self):
+        self.level = None           # latest pin level 0/1, None before the first poll
+        self.trigger_count = 0      # edges seen
+        self.missed = 0             # edges not queued, queue was full
+        self.poll_count = 0
+        self.poll_errors = 0
+        self.queue_max = 0          # highest number of triggers waiting
+        self.log = []               # (trigger number, trigger time.time(), latency, acquisition time) in sec
+
+    # edit : 2026-10-19
+    # desc : Start polling. acquire(trigger_time) is called on the tkinter thread for each trigger,
+    #        trigger_time is time.time() when the edge was seen.
+    def Start(self, root, acquire):
+        self.Stop()
+        if not self.instrument.myPort.is_open:
+            print(' ERROR: No connection to the instrument, trigger not started!')
+            return False
+        self.Reset()
+        self.queue = queue.Queue(self.queue.maxsize)
+        self.root = root
+        self.acquire = acquire
+        self.stop_event = threading.Event()
+        self.running = True
+        threading.Thread(target=self.PollLoop, args=(self.stop_event,), daemon=True).start()
+        print(f' Trigger started: {self.edge} edge, poll interval {self.poll_interval * 1000:.0f} ms')
+        return True
+
+    # edit : 2026-10-19
+    def Stop(self):
+        if not self.running:
+            return
+        self.running = False
+        self.stop_event.set()
+        self.PrintStats()
+
+    # edit : 2026-10-19
+    # desc : Pin level 0 or 1, None if the answer was not understood.
+    def ReadLevel(self):
+        state = self.instrument.AskInputState(wait=0)
+        if state == 'W0':
+            return 0
+        elif state == 'W1':
+            return 1
+        return None
+
+    # edit : 2026-10-19
+    # desc : Poller thread.
+    def PollLoop(self, stop_event):
+        while not stop_event.is_set():
+            level = self.ReadLevel()
+            self.poll_count = self.poll_count + 1
+            if level is None:
+                self.poll_errors = self.poll_errors + 1
+            else:
+                if self.IsEdge(self.level, level):
+                    self.Trigger(time.time(), time.monotonic())
+                self.level = level
+            stop_event.wait(self.poll_interval)
+
+    # edit : 2026-10-19
+    def IsEdge(self, old, new):
+        if old is None or old == new:
+            return False
+        if self.edge == 'rising':
+            return new == 1
+        elif self.edge == 'falling':
+            return new == 0
+        return True
+
+    # edit : 2026-10-19
+    # desc : Queue a trigger and ask the tkinter thread to handle it.
+    def Trigger(self, trigger_time, trigger_monotonic):
+        self.trigger_count = self.trigger_count + 1
+        try:
+            self.queue.put_nowait((self.trigger_count, trigger_time, trigger_monotonic))
+        except queue.Full:
+            self.missed = self.missed + 1
+            print(f' WARNING: trigger {self.trigger_count} missed, {self.queue.maxsize} triggers waiting!')
+            return
+        self.queue_max = max(self.queue_max, self.queue.qsize())
+        self.root.after(0, self.ProcessTrigger)
+
+    # edit : 2026-10-19
+    # desc : Run the acquisition of the oldest trigger, on the tkinter thread.
+    #        Port is kept locked over the whole acquisition.
+    def ProcessTrigger(self):
+        try:
+            number, trigger_time, trigger_monotonic = self.queue.get_nowait()
+        except queue.Empty:
+            return
+        if not self.running:
+            return
+        with self.instrument.port_lock:
+            start = time.monotonic()
+            try:
+                self.acquire(trigger_time)
+            except Exception as e:
+                print(f' ERROR in triggered acquisition {number}: {e}')
+            end = time.monotonic()
+        self.log.append((number, trigger_time, start - trigger_monotonic, end - start))
+
+    # edit : 2026-10-19
+    # desc : Returns (triggers, missed, queue max, latency mean, latency max, acquisition mean) in seconds.
+    def GetStats(self):
+        done = len(self.log)
+        latency_mean = sum(x[2] for x in self.log) / done if done else 0.0
+        latency_max = max((x[2] for x in self.log), default=0.0)
+        acquisition_mean = sum(x[3] for x in self.log) / done if done else 0.0
+        return self.trigger_count, self.missed, self.queue_max, latency_mean, latency_max, acquisition_mean
+
+    # edit : 2026-10-19
+    def PrintStats(self):
+        count, missed, queue_max, latency_mean, latency_max, acquisition_mean = self.GetStats()
+        print(f' Trigger: {count} triggers, {len(self.log)} acquired, {missed} missed, {queue_max} max waiting,'
+              f' {self.poll_count} polls ({self.poll_errors} errors)')
+        print(f' Trigger: latency mean {latency_mean * 1000:.1f} ms, max {latency_max * 1000:.1f} ms,'
+              f' acquisition mean {acquisition_mean * 1000:.1f} ms')
+
+    # edit : 2026-10-19
+    # desc : Save the trigger log as a tab separated text file. Returns 1 if successful.
+    def SaveLog(self, file_name):
+        try:
+            with open(file_name, 'w') as f:
+                f.write('Trigger\tTrigger time\tLatency [ms]\tAcquisition [ms]\n')
+                for number, trigger_time, latency, duration in self.log:
+                    f.write(f'{number}\t{trigger_time:.3f}\t{latency * 1000:.1f}\t{duration * 1000:.1f}\n')
+            return 1
+        except OSError as e:
+            print(f' ERROR in writing {file_name}: {e}')
+            return -1
+
+
+# unit test main
+# edit : 2026-10-19
+# desc : Simulated instrument, pin toggles every 50 ms, acquisition takes 30...120 ms.
+#
+if __name__ == '__main__':
+    import random
+
+    class simulated_instrument:
+        port_lock = threading.RLock()
+        class myPort:
+            is_open = True
+        def AskInputState(self, wait=0.1):
+            with self.port_lock:
+                time.sleep(0.002)           # serial round trip
+                return 'W1' if int(time.monotonic() / 0.05) % 2 else 'W0'
+
+    class simulated_root:
+        def __init__(self):
+            self.calls = queue.Queue()
+        def after(self, ms, callback):
+            self.calls.put(callback)
+        def run(self, seconds):
+            end = time.monotonic() + seconds
+            while time.monotonic() < end:
+                try:
+                    self.calls.get(timeout=0.01)()
+                except queue.Empty:
+                    pass
+
+    myRoot = simulated_root()
+    myTrigger = mini_trigger(simulated_instrument(), 0.005, 'rising', 5)
+    myTrigger.Start(myRoot, lambda t: time.sleep(random.uniform(0.03, 0.12)))
+    myRoot.run(3)
+    myTrigger.Stop()